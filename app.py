@@ -1,10 +1,33 @@
 import streamlit as st
-import pandas as pd
-import re
-import urllib.parse
+import csv
+import io
 import os
+import uuid
+from functools import partial
 from datetime import datetime
-from fpdf import FPDF
+
+from primestate.analytics import get_lead_stats
+from primestate.archive import CLOSED_DAYS, STALE_DAYS, get_archive
+from primestate.batch import lor_filename
+from primestate.claimants import get_claimant_index
+from primestate.company import CO
+from primestate.enrich import get_enricher
+from primestate.geo import NEARBY_MILES, get_canvass_index
+from primestate.instrument import Run, metrics, timed
+from primestate.jobs import get_job_runner
+from primestate.links import COUNTY_TAX_URLS, DEFAULT_TAX, clean_name, get_search_links
+from primestate.normalize import address_key, county_key, normalize_street
+from primestate.outreach import lead_messages
+from primestate.pdf import create_lor_pdf, pdf_cache
+from primestate.store import COLUMNS, DB_FILE, PIPELINE, SORTABLE, get_lead_cache, get_store, save_to_database
+from primestate.tasks import archive_leads, bulk_update, export_excel, export_lors, export_outreach, import_feed
+from primestate.work_queue import get_queue_index, get_work_queue
+
+# Per-rerun timing: each section below ends with run.lap(); a run cut short by
+# st.rerun()/st.stop() is closed at the start of the next one.
+if st.session_state.get("perf_run") is not None:
+    st.session_state.perf_run.finish()
+run = st.session_state.perf_run = Run("rerun", profile=st.session_state.get("profile_reruns", False))
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 1. PAGE CONFIG
@@ -15,20 +38,23 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="expanded",
 )
+run.lap("page_config")
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 🔒 SECURITY: PASSWORD PROTECTION
 # ═══════════════════════════════════════════════════════════════════════════════
 # Change this password to whatever you want your dad to type:
 ACCESS_CODE = "primestate2026" 
+ADMIN_CODE = "primestate-admin"   # same access, plus the ⏱ Performance panel
 
 def check_password():
     """Returns `True` if the user had the correct password."""
     
     def password_entered():
         """Checks whether a password entered by the user is correct."""
-        if st.session_state["password"] == ACCESS_CODE:
+        if st.session_state["password"] in (ACCESS_CODE, ADMIN_CODE):
             st.session_state["password_correct"] = True
+            st.session_state["is_admin"] = st.session_state["password"] == ADMIN_CODE
             del st.session_state["password"]  # Don't store password
         else:
             st.session_state["password_correct"] = False
@@ -58,24 +84,12 @@ def check_password():
 
 if not check_password():
     st.stop()  # STOPS the app here if password is wrong.
+run.lap("password")
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 2. COMPANY CONSTANTS  (single source of truth for branding)
 # ═══════════════════════════════════════════════════════════════════════════════
-CO = {
-    "name": "PrimeState Public Adjusters, Inc.",
-    "short": "PrimeState Adjusters",
-    "president": "Carlos A. Jimenez",
-    "title": "President",
-    "nj_address": "9060 Palisade Ave Unit C-003, North Bergen, NJ 07047",
-    "nj_phone": "(201) 305-1006",
-    "toll_free": "1-800-211-0434",
-    "email": "info@primestateadjusters.com",
-    "web": "primestateadjusters.com",
-    "logo_url": "https://e1w.61f.myftpupload.com/wp-content/uploads/2024/03/prime-state-logo-quality-png-.png",
-    "tagline": "No Recovery, No Fee.",
-    "license_nj": "Licensed by the State of New Jersey Dept. of Banking & Insurance",
-}
+# `CO` is defined in primestate/company.py so the PDF renderer can import it without Streamlit.
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 3. BRAND STYLING
@@ -197,220 +211,174 @@ section.main > div.block-container {{
 }}
 </style>
 """, unsafe_allow_html=True)
+run.lap("css")
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 4. DATABASE MANAGEMENT
 # ═══════════════════════════════════════════════════════════════════════════════
-DB_FILE = "Primestate_Leads_Database.xlsx"
-COLUMNS = [
-    "Lead ID", "Date", "County", "Address", "Case Number",
-    "Type", "Homeowner", "Phone", "Email", "Status", "Notes",
-]
-
-
-@st.cache_data(ttl=30)
-def load_database():
-    if os.path.exists(DB_FILE):
-        return pd.read_excel(DB_FILE)
-    return pd.DataFrame(columns=COLUMNS)
-
-
-def save_to_database(record):
-    load_database.clear()
-    df = load_database()
-    if not df.empty and record["Lead ID"] in df["Lead ID"].values:
-        idx = df[df["Lead ID"] == record["Lead ID"]].index[0]
-        for k, v in record.items():
-            df.at[idx, k] = v
-    else:
-        df = pd.concat([df, pd.DataFrame([record])], ignore_index=True)
-    df.to_excel(DB_FILE, index=False)
-    load_database.clear()
+# The store, cache, queue and dedupe index are process-wide singletons from
+# the core package (primestate.store / work_queue / dedupe).  Imports, bulk
+# updates and exports run as background jobs (primestate.jobs / tasks).
+
+
+def county_status_csv(lead_stats):
+    summary = lead_stats.summary()
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(["County"] + PIPELINE + ["Other", "Total"])
+    for county, by_status in sorted(summary["county_status"].items()):
+        row = [by_status.get(s, 0) for s in PIPELINE]
+        total = sum(by_status.values())
+        writer.writerow([county] + row + [total - sum(row), total])
+    return buf.getvalue()
+
+
+def file_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def submit_job(kind, fn, *args, label):
+    """Hand work to the background runner and rerun so the Jobs panel shows it."""
+    get_job_runner().submit(kind, fn, *args, owner=st.session_state.adjuster, label=label)
+    st.rerun()
+
+
+def performance_panel():
+    """Admin-only: last rerun's breakdown, rolling p50/p95, cache counters, profiling."""
+    last = st.session_state.get("perf_last")
+    if last:
+        st.caption(f"LAST RERUN — {last['total'] * 1000:,.0f} ms")
+        st.dataframe(
+            [{"Section": name, "ms": round(sec * 1000, 1), "Calls": calls} for name, sec, calls in last["rows"]],
+            hide_index=True, use_container_width=True,
+        )
+    st.caption("ROLLING (last 200 samples)")
+    st.dataframe(
+        [{"Name": name, "n": n, "p50 ms": round(p50 * 1000, 1), "p95 ms": round(p95 * 1000, 1)}
+         for name, (n, p50, p95, _) in sorted(metrics.percentiles().items())],
+        hide_index=True, use_container_width=True, height=220,
+    )
+    st.caption("CACHES")
+    counters = metrics.counters()
+    counters["pdf_cache.hit"], counters["pdf_cache.miss"] = pdf_cache.hits, pdf_cache.misses
+    for fn in (address_key, county_key, normalize_street):
+        info = fn.cache_info()
+        counters[f"{fn.__name__}.hit"], counters[f"{fn.__name__}.miss"] = info.hits, info.misses
+    st.dataframe(
+        [{"Counter": name, "Value": n} for name, n in sorted(counters.items())],
+        hide_index=True, use_container_width=True,
+    )
+    st.checkbox("Profile slow reruns", key="profile_reruns",
+                help="Runs cProfile on every rerun and saves the stats of slow ones to profiles/.")
+    st.number_input("Slow rerun threshold (ms)", min_value=0, step=100, value=1000, key="profile_threshold_ms")
+    if last and last.get("profile"):
+        st.caption(f"Last profile: `{last['profile']}`")
+    if st.button("Reset metrics", use_container_width=True):
+        metrics.reset()
+        st.session_state.pop("perf_last", None)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 5. PDF — LETTER OF REPRESENTATION (branded)
 # ═══════════════════════════════════════════════════════════════════════════════
-class LOR_PDF(FPDF):
-    def header(self):
-        self.set_font("Arial", "B", 14)
-        self.cell(0, 8, CO["name"].upper(), 0, 1, "C")
-        self.set_font("Arial", "", 9)
-        self.cell(0, 5, "Public Insurance Adjusters", 0, 1, "C")
-        self.cell(0, 4, CO["nj_address"], 0, 1, "C")
-        self.cell(0, 4, f'Tel: {CO["nj_phone"]}  |  Toll-Free: {CO["toll_free"]}  |  {CO["email"]}', 0, 1, "C")
-        self.cell(0, 4, CO["web"], 0, 1, "C")
-        # gold accent line
-        self.set_draw_color(201, 168, 76)
-        self.set_line_width(0.6)
-        self.line(15, self.get_y() + 3, 195, self.get_y() + 3)
-        self.ln(8)
-
-    def footer(self):
-        self.set_y(-20)
-        self.set_draw_color(201, 168, 76)
-        self.set_line_width(0.3)
-        self.line(15, self.get_y(), 195, self.get_y())
-        self.ln(3)
-        self.set_font("Arial", "I", 7)
-        self.set_text_color(100, 116, 139)
-        self.cell(0, 4, CO["license_nj"], 0, 1, "C")
-        self.cell(0, 4, f'{CO["tagline"]}  |  Page {self.page_no()}', 0, 0, "C")
-
-
-def create_lor_pdf(owner_name, address, case_num, loss_date):
-    pdf = LOR_PDF()
-    pdf.add_page()
-    pdf.set_text_color(30, 41, 59)
-    pdf.set_font("Arial", size=11)
-
-    # Date
-    pdf.cell(0, 8, f"Date: {datetime.today().strftime('%B %d, %Y')}", 0, 1)
-    pdf.ln(4)
-
-    # RE block
-    pdf.set_font("Arial", "B", 11)
-    pdf.cell(0, 6, "RE: Letter of Representation", 0, 1)
-    pdf.set_font("Arial", size=11)
-    pdf.cell(0, 5, f"Insured / Claimant: {owner_name}", 0, 1)
-    pdf.cell(0, 5, f"Property Address: {address}", 0, 1)
-    pdf.cell(0, 5, f"Date of Loss: {loss_date}", 0, 1)
-    pdf.cell(0, 5, f"Claim / Case No.: {case_num}", 0, 1)
-    pdf.ln(8)
-
-    # Salutation
-    pdf.multi_cell(0, 6, "To Whom It May Concern:")
-    pdf.ln(4)
-
-    # Body
-    body = (
-        f"Please be advised that {owner_name} has retained {CO['name']} "
-        "to represent them in the adjustment of their insurance claim for "
-        f"loss and damage sustained at the above-referenced property on {loss_date}.\n\n"
-        "We respectfully request that all future correspondence, telephone calls, "
-        "and communications regarding this claim be directed to our office at the "
-        "address listed above. We ask that you refrain from contacting the insured "
-        "directly regarding any matters pertaining to this claim.\n\n"
-        "Please acknowledge receipt of this letter at your earliest convenience "
-        "and provide the claim number assigned to this matter.\n\n"
-        "We look forward to working toward a fair and prompt resolution. "
-        "Thank you for your anticipated cooperation."
-    )
-    pdf.multi_cell(0, 6, body)
-    pdf.ln(12)
-
-    # Signature block
-    pdf.cell(0, 6, "Respectfully,", 0, 1)
-    pdf.ln(16)
-    pdf.set_font("Arial", "B", 11)
-    pdf.cell(0, 5, CO["name"], 0, 1)
-    pdf.set_font("Arial", "", 10)
-    pdf.cell(0, 5, f'{CO["president"]}, {CO["title"]}', 0, 1)
-    pdf.cell(0, 5, f'Tel: {CO["nj_phone"]}  |  {CO["email"]}', 0, 1)
-    pdf.ln(18)
-
-    # Client signature line
-    pdf.set_draw_color(30, 41, 59)
-    pdf.set_line_width(0.4)
-    pdf.cell(85, 0, "", "T")
-    pdf.ln(3)
-    pdf.set_font("Arial", "", 9)
-    pdf.cell(0, 5, f"Authorized Signature - {owner_name}", 0, 1)
-
-    return pdf.output(dest="S").encode("latin-1")
+# Rendering and the per-process PDF cache live in primestate/pdf.py.
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 6. LOGIC HELPERS
 # ═══════════════════════════════════════════════════════════════════════════════
-COUNTY_TAX_URLS = {
-    "essex":    "https://www.taxdatahub.com/6229fbf0ce4aef911f9de7bc/Essex%20County",
-    "camden":   "https://www.taxdatahub.com/60d088c3d3501df3b0e45ddb/camden-county",
-    "mercer":   "https://pip.mercercounty.org/mapsearch",
-    "ocean":    "https://tax.co.ocean.nj.us/frmTaxBoardTaxListSearch",
-    "monmouth":"https://tax1.co.monmouth.nj.us/cgi-bin/prc6.cgi?menu=index&ms_user=monm&passwd=data&mode=11",
-    "morris":   "https://mcweb1.co.morris.nj.us/MCTaxBoard/SearchTaxRecords.aspx",
-}
-DEFAULT_TAX = "https://taxrecords-nj.com/pub/cgi/prc6.cgi?menu=index&ms_user=ctb00"
-
-
-def get_county_tax_url(county):
-    c = str(county).strip().lower()
-    return next((url for key, url in COUNTY_TAX_URLS.items() if key in c), DEFAULT_TAX)
-
-
-def clean_name(raw):
-    if "," in raw:
-        parts = raw.split(",", 1)
-        name = f"{parts[1].strip()} {parts[0].strip()}"
-    else:
-        name = raw.strip()
-    # Tax records often return ALL CAPS — convert to proper title case
-    return name.title()
-
-
-def get_search_links(name, address, city, state, is_commercial):
-    clean = clean_name(name)
-    s_name, s_city, s_state = (urllib.parse.quote(x) for x in (clean, city, state))
-    if is_commercial:
-        return {
-            "Google Business": f"https://www.google.com/search?q={s_name}+{urllib.parse.quote(address)}+phone",
-            "NJ Entity Search": "https://www.njportal.com/DOR/BusinessNameSearch/Search/BusinessName",
-        }
-    h_name = clean.replace(" ", "-")
-    return {
-        "TruePeopleSearch": f"https://www.truepeoplesearch.com/results?name={s_name}&citystatezip={s_city},+{s_state}",
-        "FastPeopleSearch": f"https://www.fastpeoplesearch.com/name/{s_name}_{s_city}-{s_state}",
-        "ThatsThem": f"https://thatsthem.com/name/{h_name}/{s_state}",
-    }
-
-
-def parse_bulk_text(text):
-    leads, current = [], {}
-    for line in text.split("\n"):
-        line = line.strip()
-        if not line:
-            continue
-        if "|" in line and "NJ" in line:
-            parts = [p.strip() for p in line.split("|")]
-            if len(parts) >= 4:
-                current = {
-                    "state": parts[0], "county": parts[1], "city": parts[2],
-                    "address_part": parts[3],
-                    "full_address": f"{parts[3]}, {parts[2]}, {parts[0]}",
-                    "type": parts[4] if len(parts) > 4 else "Unknown",
-                    "desc": parts[5] if len(parts) > 5 else "",
-                    "case": parts[-1].replace("#", "") if "#" in parts[-1] else "Pending",
-                }
-        elif re.match(r"\d{2}/\d{2}/\d{4}", line) and current:
-            date_str = line.split(" ")[0]
-            current["date"] = date_str
-            lid = f"{date_str} — {current['full_address']} — {current['case']}"
-            leads.append({"id": lid, "data": current})
-            current = {}
-    return leads
+# Tax-record URLs and people-search links live in primestate/links.py.
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 7. SESSION STATE
 # ═══════════════════════════════════════════════════════════════════════════════
-if "queue" not in st.session_state:
-    st.session_state.queue = {}
+# The adjuster name lives in the URL (?adjuster=…) so a page refresh keeps it:
+# otherwise the new session would be locked out of its own leases and jobs.
+if "adjuster" not in st.session_state:
+    st.session_state.adjuster = st.query_params.get("adjuster") or f"adjuster-{uuid.uuid4().hex[:6]}"
+st.query_params["adjuster"] = st.session_state.adjuster
 if "input_key" not in st.session_state:
     st.session_state.input_key = 0
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 8. SIDEBAR
 # ═══════════════════════════════════════════════════════════════════════════════
+# The analytics and tools panels are fragments: their widgets rerun only the
+# panel.  The Adjuster box stays outside, since it decides which leads are offered.
+@st.fragment
+@timed("fragment.sidebar_stats")
+def sidebar_stats():
+    # Pipeline analytics: counters kept current per save, never a full scan
+    with st.expander("📊 Pipeline Analytics"):
+        lead_stats = get_lead_stats()
+        st.caption(f"{lead_stats.total:,} leads, {lead_stats.archived:,} of them archived")
+        for stage, reached, rate in lead_stats.funnel():
+            st.caption(f"**{stage}** — {reached:,} ({rate:.0%} of processed)")
+        dim = st.selectbox("Break down by", ["County", "Type", "Status", "Week"], key="stats_dim")
+        st.dataframe(
+            [{dim: key, "Leads": n} for key, n in lead_stats.breakdown(dim.lower())],
+            hide_index=True, use_container_width=True, height=220,
+        )
+        st.download_button(
+            "⬇ County × Status (CSV)",
+            data=county_status_csv(lead_stats),
+            file_name=f"Primestate_Pipeline_{datetime.now():%Y-%m-%d}.csv",
+            mime="text/csv",
+            use_container_width=True,
+        )
+
+
+@st.fragment
+@timed("fragment.sidebar_tools")
+def sidebar_tools():
+    # Database export (browse it from the dashboard's Database panel)
+    st.caption("DATABASE")
+    if st.button("📤 Export to Excel", use_container_width=True):
+        submit_job("export_excel", export_excel, label="Excel export")   # download under Jobs
+
+    st.markdown("---")
+    # The queue is shared: anyone can hand back their own leads, only an admin
+    # can empty it for everybody, and only after confirming.
+    if st.button("🔄 Release my leads", type="primary", use_container_width=True,
+                 help="Hand back every queued lead reserved under your name and clear the import box."):
+        get_work_queue().release_all(st.session_state.adjuster)
+        st.session_state.claimed_id = None
+        st.session_state.pop("lead_pick", None)
+        st.session_state.input_key += 1
+        st.rerun()   # whole page: the queue feeds Step 1 and Step 2
+    if st.session_state.get("is_admin"):
+        with st.popover("🗑 Clear shared queue", use_container_width=True):
+            queue = get_work_queue()
+            st.warning(f"Removes all {queue.count():,} queued lead(s) for every adjuster, "
+                       f"including {len(queue.leased()):,} open right now.")
+            sure = st.checkbox("I understand", key="confirm_clear_queue")
+            if st.button("Clear queue", disabled=not sure, use_container_width=True):
+                queue.clear()
+                st.session_state.pop("confirm_clear_queue", None)
+                st.session_state.claimed_id = None
+                st.session_state.pop("lead_pick", None)
+                st.session_state.input_key += 1
+                st.rerun()
+
+    if st.session_state.get("is_admin"):
+        with st.expander("⏱ Performance"):
+            performance_panel()
+
+
 with st.sidebar:
     st.image(CO["logo_url"], width=200)
     st.caption(f"**NJ Claims Operations**")
     st.markdown("---")
 
-    db = load_database()
+    leads = get_lead_cache()
+    queue = get_work_queue()
     m1, m2 = st.columns(2)
-    m1.metric("Saved", len(db))
-    m2.metric("Queue", len(st.session_state.queue))
+    m1.metric("Saved", leads.count())
+    m2.metric("Queue", queue.count())
+    st.text_input("👤 Adjuster", key="adjuster", help="Leads you open are reserved under this name.")
+    sidebar_stats()
 
     st.markdown("---")
     st.caption("OFFICE")
@@ -418,20 +386,8 @@ with st.sidebar:
     st.markdown(f"📞 {CO['nj_phone']}")
     st.markdown(f"🌐 {CO['web']}")
     st.markdown("---")
-
-    # Database viewer
-    with st.expander("📂 View Database"):
-        if not db.empty:
-            st.dataframe(db[["Homeowner", "Address", "Status", "Date"]].tail(15), hide_index=True, use_container_width=True)
-        else:
-            st.info("No records yet.")
-
-    st.markdown("---")
-    if st.button("🔄 Reset Queue", type="primary", use_container_width=True):
-        st.session_state.queue = {}
-        st.session_state.input_key += 1
-        st.rerun()
-
+    sidebar_tools()
+run.lap("sidebar")
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 9. MAIN DASHBOARD
@@ -439,41 +395,254 @@ with st.sidebar:
 st.markdown("#### Claims Processing Dashboard")
 st.caption("Import → Research → Generate → Save")
 
+# ── BACKGROUND JOBS ─────────────────────────────────────────────────────────
+# Polls once a second while anything is queued or running, then reruns the
+# page once so the queue, counts and tables pick up what the job wrote.
+JOB_ICONS = {"queued": "🕓", "running": "⏳", "done": "✅", "failed": "❌",
+             "cancelled": "⏹", "interrupted": "⚠️"}
+JOB_FILES = {
+    "export_excel": (DB_FILE, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "export_lors": (f"LORs_{datetime.today():%Y-%m-%d}.zip", "application/zip"),
+    "outreach_csv": (f"Outreach_{datetime.today():%Y-%m-%d}.csv", "text/csv"),
+    "outreach_jsonl": (f"Outreach_{datetime.today():%Y-%m-%d}.jsonl", "application/x-ndjson"),
+    "outreach_eml": (f"Outreach_{datetime.today():%Y-%m-%d}.zip", "application/zip"),
+}
+
+
+def job_summary(job):
+    r = job["result"] or {}
+    if job["status"] == "failed":
+        return job["error"]
+    if job["status"] != "done":
+        return job["message"] or ""
+    if job["kind"] == "import":
+        if not r["added"]:
+            return "No new leads found — check format."
+        return (f"{r['added']:,} lead(s) queued · {r['skipped']:,} already saved · "
+                f"{r['malformed']:,} malformed line(s) of {r['lines']:,}")
+    if job["kind"] == "bulk_update":
+        return f"Updated {r['changed']:,} of {r['leads']:,} lead(s)."
+    if job["kind"] == "export_lors":
+        if not r["letters"] and not r.get("skipped"):
+            return "No leads with an owner name yet."
+        skipped = f" · {r['skipped']:,} skipped (could not render)" if r.get("skipped") else ""
+        return (f"{r['letters']:,} letters in {r['seconds']:.1f}s — "
+                f"{r['per_sec']:,.0f}/s on {r['workers']} core(s){skipped}")
+    if job["kind"] == "export_excel":
+        return f"{r['leads']:,} lead(s)"
+    if job["kind"].startswith("outreach_"):
+        if not r["leads"]:
+            return "No ready leads — an owner plus a phone or email is needed."
+        drafts = f" · {r['files']:,} email draft(s) with LOR" if job["kind"] == "outreach_eml" else ""
+        if r.get("skipped"):
+            drafts += f" ({r['skipped']:,} skipped: letter could not render)"
+        return (f"{r['leads']:,} lead(s){drafts} — templates filled in {r['render_ms']:,.0f} ms "
+                f"({r['per_sec']:,.0f}/s), {r['seconds']:.1f}s in all")
+    if job["kind"] == "archive":
+        return f"{r['archived']:,} lead(s) archived · {r['partitions_compacted']:,} partition(s) compacted"
+    return ""
+
+
+@timed("fragment.jobs")
+def jobs_panel(polling):
+    runner = get_job_runner()
+    jobs = runner.recent(limit=6)
+    if polling and not any(j["status"] in ("queued", "running") for j in jobs):
+        st.rerun()
+    for job in jobs:
+        j1, j2 = st.columns([4, 1])
+        timing = f"waited {job['wait']:.1f}s" + (f" · ran {job['seconds']:.1f}s" if job["started_at"] else "")
+        j1.markdown(f"{JOB_ICONS.get(job['status'], '')} **{job['label']}** — {job['owner']} · {timing}")
+        if job["status"] == "running" and job["total"]:
+            j1.progress(min(job["done"] / job["total"], 1.0), text=job["message"] or None)
+        else:
+            j1.caption(job_summary(job))
+        if job["status"] in ("queued", "running"):
+            if job["owner"] == st.session_state.adjuster and not job["cancel"]:
+                j2.button("Cancel", key=f"cancel_{job['id']}", on_click=runner.cancel, args=(job["id"],))
+        elif job["status"] == "done" and job["kind"] in JOB_FILES and job["file"] and os.path.exists(job["file"]):
+            name, mime = JOB_FILES[job["kind"]]
+            j2.download_button("⬇ Download", data=partial(file_bytes, job["file"]), file_name=name,
+                               mime=mime, key=f"dl_{job['id']}")
+
+
+recent_jobs = get_job_runner().recent(limit=6)
+if recent_jobs:
+    busy = any(j["status"] in ("queued", "running") for j in recent_jobs)
+    with st.expander("⚙️ Background jobs", expanded=busy):
+        st.fragment(jobs_panel, run_every=1 if busy else None)(busy)
+
 # ── STEP 1: IMPORT ──────────────────────────────────────────────────────────
-with st.expander("📥  Step 1 — Import Leads", expanded=not st.session_state.queue):
+with st.expander("📥  Step 1 — Import Leads", expanded=not queue.count()):
     raw_text = st.text_area(
         "Paste pipe-delimited lead data:",
         height=70,
         key=f"raw_{st.session_state.input_key}",
         placeholder="NJ | Essex | Newark | 123 Main St | Fire | Desc | #12345\n01/15/2026 ...",
     )
+    feed_file = st.file_uploader(
+        "…or upload a feed file:", type=["txt", "csv"], key=f"feed_{st.session_state.input_key}"
+    )
+    skip_saved = st.checkbox("Skip leads already saved (same Lead ID or case number)", value=True)
     if st.button("⚡ Process Import", use_container_width=False):
-        if raw_text:
-            new = parse_bulk_text(raw_text)
-            added = 0
-            for l in new:
-                if l["id"] not in st.session_state.queue:
-                    st.session_state.queue[l["id"]] = l["data"]
-                    added += 1
-            if added:
-                st.rerun()
+        if raw_text or feed_file:
+            st.session_state.input_key += 1   # the feed now belongs to the job; clear the inputs
+            submit_job(
+                "import", import_feed, feed_file.getvalue() if feed_file else raw_text, skip_saved,
+                label=f"Import {feed_file.name}" if feed_file else "Import pasted feed",
+            )
+run.lap("import")
+
+# ── BATCH: LETTERS OF REPRESENTATION & OUTREACH ─────────────────────────────
+OUTREACH_FORMATS = {"CSV": "csv", "JSON Lines": "jsonl", "Email drafts (.eml + LOR)": "eml"}
+
+with st.expander("📦  Batch — Letters & Outreach"):
+    st.caption("Renders a letter for every queued or saved lead with an owner name.")
+    if st.button("🖨 Generate all LORs"):
+        submit_job("export_lors", export_lors, label="Letters of Representation")   # download under Jobs
+    st.markdown("---")
+    st.caption("Mail merge: the Step 3 SMS and email for every queued or New/Processed lead "
+               "with an owner and a phone or email.")
+    o1, o2 = st.columns([2, 1])
+    fmt = OUTREACH_FORMATS[o1.selectbox("Format", list(OUTREACH_FORMATS), key="outreach_format",
+                                        label_visibility="collapsed")]
+    if o2.button("📨 Export outreach"):
+        submit_job(f"outreach_{fmt}", export_outreach, fmt, label=f"Outreach ({fmt})")
+run.lap("batch")
+
+# ── DATABASE BROWSER ────────────────────────────────────────────────────────
+# A fragment, so filtering, paging and picking rows rerun only the browser.  Its
+# queries are memoised on the store version: while nothing is saved, the rest of
+# the page's reruns (expander open or not) cost one version lookup here.
+@st.fragment
+@timed("fragment.database")
+def database_browser():
+    with st.expander("🗂  Database"):
+        store = get_store()
+        f1, f2, f3, f4 = st.columns([1, 1, 1.2, 1.6])
+        county = f1.selectbox("County", ["All"] + store.distinct("County"), key="db_county")
+        status = f2.selectbox("Status", ["All"] + store.distinct("Status"), key="db_status")
+        dates = f3.date_input("Loss date", value=(), format="MM/DD/YYYY", key="db_dates")
+        text = f4.text_input("Search owner / address / case", key="db_text")
+        s1, s2, s3 = st.columns([1, 1, 1])
+        sort = s1.selectbox("Sort by", list(SORTABLE), key="db_sort")
+        descending = s2.toggle("Descending", value=True, key="db_desc")
+        page_size = s3.selectbox("Rows per page", [25, 50, 100], index=1, key="db_page_size")
+
+        where = dict(
+            county=None if county == "All" else county,
+            status=None if status == "All" else status,
+            date_from=dates[0] if len(dates) > 0 else None,
+            date_to=dates[1] if len(dates) > 1 else None,
+            text=text,
+        )
+        paging = dict(sort=sort, descending=descending, limit=page_size)
+        page = st.session_state.get("db_page", 1)
+        total, rows = store.query(offset=(page - 1) * page_size, **where, **paging)
+        pages = max(1, -(-total // page_size))
+        if page > pages:   # filters narrowed the result set
+            page = st.session_state.db_page = pages
+            total, rows = store.query(offset=(page - 1) * page_size, **where, **paging)
+
+        selected = []
+        if rows:
+            grid = st.dataframe(
+                [dict(zip(COLUMNS, r)) for r in rows],
+                column_order=["Date", "County", "Homeowner", "Address", "Case Number",
+                              "Type", "Phone", "Email", "Status"],
+                hide_index=True, use_container_width=True,
+                on_select="rerun", selection_mode="multi-row", key="db_grid",
+            )
+            selected = [rows[i][0] for i in grid.selection.rows if i < len(rows)]
+        else:
+            st.info("No matching records.")
+        p1, p2 = st.columns([1, 3])
+        p1.number_input("Page", min_value=1, max_value=pages, step=1, key="db_page")
+        p2.caption(f"{total:,} matching lead(s) — page {page} of {pages}")
+
+        # Bulk update: one transaction for every chosen lead, audited per change
+        st.markdown("**Bulk update**")
+        b1, b2, b3 = st.columns([1.2, 1.6, 1])
+        action = b1.selectbox("Status", ["Advance to next stage"] + PIPELINE, key="bulk_status")
+        note = b2.text_input("Add note (optional)", key="bulk_note")
+        scope = b3.radio("Apply to", [f"Selected ({len(selected)})", f"All matching ({total:,})"], key="bulk_scope")
+        if st.button("✔ Apply to leads"):
+            ids = selected if scope.startswith("Selected") else store.matching_ids(**where)
+            if ids:
+                advance = action == "Advance to next stage"
+                submit_job(
+                    "bulk_update", bulk_update, ids, None if advance else action, advance,
+                    note.strip() or None, label=f"Bulk update of {len(ids):,} lead(s)",
+                )
             else:
-                st.warning("No new leads found — check format.")
+                st.warning("Select rows in the table first.")
+
+        # Archive: closed and long-past leads, moved out to Parquet by month and county
+        st.markdown("**Archive**")
+        archive = get_archive()
+        if st.toggle("Search the archive with these filters", key="db_archive"):
+            found = archive.query(["Date", "County", "Homeowner", "Address", "Case Number", "Type",
+                                   "Phone", "Email", "Status"], **where)
+            info = archive.summary()
+            st.caption(f"{len(found):,} matching archived lead(s) — {info['leads']:,} archived in "
+                       f"{info['partitions']:,} month × county partition(s), {info['bytes'] / 1e6:.1f} MB")
+            if len(found):
+                st.dataframe(found.head(page_size), hide_index=True, use_container_width=True)
+        if st.session_state.get("is_admin") and st.button(
+            "🗄 Archive old leads",
+            help=f"Moves leads Closed and untouched for {CLOSED_DAYS} days, and any lead lost "
+                 f"more than {STALE_DAYS} days ago, out of the working database.",
+        ):
+            submit_job("archive", archive_leads, label="Archive closed & old leads")
+
+
+database_browser()
+run.lap("database")
 
 # ── STEP 2: WORKSPACE ───────────────────────────────────────────────────────
-options = list(st.session_state.queue.keys())
-if options:
-    selected_id = st.selectbox("**Active Lead**", ["Select..."] + options)
-else:
-    st.info("⏳ Import leads above to begin processing.")
-    selected_id = "Select..."
+# The open lead is a fragment, and so is each of its contact / output columns,
+# so an edit reruns only what reads it:
+#   owner name, auto-lookup        → the whole workspace (every column uses the owner)
+#   phone, email, commercial       → contact column (Save reads phone/email on click)
+#   email / SMS text, Save         → output column
+#   search, paging, picking a lead → the lead picker (and the workspace inside it)
+# A save reruns the page, since it changes the counts.
+DUPLICATE_NOTES = {
+    "id": "⚠️ This exact lead is already saved in the database.",
+    "case": "⚠️ A saved lead already has this case number.",
+    "address": "⚠️ This address was saved before (possibly a different loss).",
+}
+
+
+def field_key(lead_id, name):
+    """Session-state key of a workspace input, per lead so switching leads starts clean."""
+    return f"ws_{name}_{lead_id}"
+
+
+def reuse_contact(lead_id, match):
+    """Copy a prior claim's phone / email into the open lead's contact inputs."""
+    for name, column in (("phone", "Phone"), ("email", "Email")):
+        if match[column]:
+            st.session_state[field_key(lead_id, name)] = match[column]
+
 
-if selected_id != "Select...":
-    lead = st.session_state.queue[selected_id]
+@st.fragment
+@timed("fragment.workspace")
+def workspace(lead_id, adjuster):
+    queue = get_work_queue()
+    # Hold a lease on the open lead, renewed every time the workspace reruns.
+    if not queue.claim(lead_id, adjuster):
+        st.session_state.claimed_id = None
+        st.warning(f"🔒 {queue.holder(lead_id) or 'Another adjuster'} just opened this lead.")
+        return
+    st.session_state.claimed_id = lead_id
+    lead = queue.get(lead_id)
+    found = lead.get("enriched", {})
+    for name in ("owner", "phone", "email"):
+        st.session_state.setdefault(field_key(lead_id, name), found.get(name, ""))
 
-    # Progress dots
-    owner_name = ""  # will be set in col1
-    phone = email = ""
+    ckey = lead.get("county_key") or county_key(lead["county"], lead["city"])
+    county_name = ckey.title() or lead["county"].title()
 
     st.markdown("---")
     c1, c2, c3 = st.columns([1, 1, 1.2], gap="medium")
@@ -484,112 +653,249 @@ if selected_id != "Select...":
             '<div class="step-header"><span class="badge">1</span>Find Owner (Tax Record)</div>',
             unsafe_allow_html=True,
         )
+        if lead.get("duplicate"):
+            st.warning(DUPLICATE_NOTES[lead["duplicate"]])
         st.caption("Copy this address →")
         st.code(lead["address_part"])
+        nearby = get_canvass_index().near(lead_id, NEARBY_MILES)
+        if nearby:
+            hint = "" if st.session_state.get("lead_route") else " — 🧭 Canvass route works them in driving order"
+            st.caption(f"📍 {len(nearby)} other queued lead(s) within {NEARBY_MILES:g} mi{hint}")
 
-        tax_url = get_county_tax_url(lead["county"])
+        tax_url = COUNTY_TAX_URLS.get(ckey, DEFAULT_TAX)
         st.markdown(
             f'<a class="tax-btn" href="{tax_url}" target="_blank">'
-            f'🔍 Open {lead["county"].title()} County Tax Site</a>',
+            f'🔍 Open {county_name} County Tax Site</a>',
             unsafe_allow_html=True,
         )
+        enricher = get_enricher()   # None unless lookup providers are configured
+        if enricher is not None and st.button("⚡ Auto-lookup owner & contact"):
+            results, stats = enricher.enrich([lead])
+            found = results[0]
+            if found.get("owner"):
+                queue.update(lead_id, enriched=found, owner=clean_name(found["owner"]))
+            else:
+                queue.update(lead_id, enriched=found)
+            for name in ("owner", "phone", "email"):
+                if found.get(name):
+                    st.session_state[field_key(lead_id, name)] = found[name]
+            if stats.failed:
+                st.session_state.enrich_note = f"Lookup failed: {stats.errors[0]}"
+            elif not found:
+                st.session_state.enrich_note = "No record found — search the tax site by hand."
+            lead = queue.get(lead_id)   # the inputs below are drawn after this, so no rerun needed
+        if st.session_state.get("enrich_note"):
+            st.caption(st.session_state.pop("enrich_note"))
         st.markdown("")
-        owner_name = st.text_input("📝 Owner Name", placeholder="Doe, John")
+        owner_name = st.text_input("📝 Owner Name", key=field_key(lead_id, "owner"), placeholder="Doe, John")
+        if owner_name and lead.get("owner") != clean_name(owner_name):
+            # kept on the queued lead for batch LOR generation and other sessions
+            queue.update(lead_id, owner=clean_name(owner_name))
+
+        # Saved or archived claims by a similar owner or at this address (trigram index)
+        prior = get_claimant_index().search(owner_name, lead["full_address"], exclude=(lead_id,))
+        if prior:
+            with st.expander(f"🔁 {len(prior)} possible repeat claimant(s)", expanded=bool(owner_name)):
+                for i, match in enumerate(prior):
+                    st.caption(
+                        f"**{clean_name(match['Homeowner'] or '—')}** · {match['Address']} · "
+                        f"{str(match['Date'])[:10]} · {match['Status']} — owner "
+                        f"{match['name_score']:.0%}, address {match['address_score']:.0%}"
+                    )
+                    contact = " · ".join(x for x in (match["Phone"], match["Email"]) if x)
+                    if contact:
+                        st.button(f"Use {contact}", key=f"reuse_{i}_{lead_id}",
+                                  on_click=reuse_contact, args=(lead_id, match))
 
-    # ── COL 2: CONTACT SEARCH ──
     with c2:
-        st.markdown(
-            '<div class="step-header"><span class="badge">2</span>Find Contact Info</div>',
-            unsafe_allow_html=True,
-        )
-        if owner_name:
-            clean = clean_name(owner_name)
-            if clean != owner_name:
-                st.caption(f"✅ Formatted: **{clean}**")
+        contact_column(lead_id, lead, owner_name)
+    with c3:
+        output_column(lead_id, lead, county_name, owner_name)
 
-            is_comm = st.checkbox("Commercial property?")
-            links = get_search_links(owner_name, lead["address_part"], lead["city"], lead["state"], is_comm)
 
-            pills_html = " ".join(
-                f'<a class="link-pill" href="{url}" target="_blank">{label}</a>'
-                for label, url in links.items()
-            )
-            st.markdown(pills_html, unsafe_allow_html=True)
-            st.markdown("")
+# ── COL 2: CONTACT SEARCH ──
+@st.fragment
+@timed("fragment.contact")
+def contact_column(lead_id, lead, owner_name):
+    st.markdown(
+        '<div class="step-header"><span class="badge">2</span>Find Contact Info</div>',
+        unsafe_allow_html=True,
+    )
+    if not owner_name:
+        st.info("← Enter owner name first")
+        return
+    clean = clean_name(owner_name)
+    if clean != owner_name:
+        st.caption(f"✅ Formatted: **{clean}**")
+
+    is_comm = st.checkbox("Commercial property?", key=field_key(lead_id, "commercial"))
+    links = get_search_links(owner_name, lead["address_part"], lead["city"], lead["state"], is_comm)
+
+    pills_html = " ".join(
+        f'<a class="link-pill" href="{url}" target="_blank">{label}</a>'
+        for label, url in links.items()
+    )
+    st.markdown(pills_html, unsafe_allow_html=True)
+    st.markdown("")
 
-            phone = st.text_input("📞 Phone")
-            email = st.text_input("📧 Email")
-        else:
-            st.info("← Enter owner name first")
+    st.text_input("📞 Phone", key=field_key(lead_id, "phone"))
+    st.text_input("📧 Email", key=field_key(lead_id, "email"))
 
-    # ── COL 3: GENERATE & SAVE ──
-    with c3:
-        st.markdown(
-            '<div class="step-header"><span class="badge">3</span>Generate & Save</div>',
-            unsafe_allow_html=True,
-        )
-        if owner_name and (phone or email):
-            clean_owner = clean_name(owner_name)
-
-            # Pre-built templates
-            sms = (
-                f"Hello {clean_owner}, this is {CO['short']} reaching out regarding the "
-                f"{lead['type']} loss at {lead['address_part']}. Please call us at "
-                f"{CO['nj_phone']} — Case #{lead['case']}."
-            )
-            email_subj = (
-                f"Letter of Representation — {lead['type']} at "
-                f"{lead['address_part']} (Case #{lead['case']})"
-            )
-            email_body = (
-                f"Dear {clean_owner},\n\n"
-                f"Please find attached our Letter of Representation regarding "
-                f"the loss at your property on {lead['date']}.\n\n"
-                f"Should you have any questions, please do not hesitate to contact "
-                f"our office at {CO['nj_phone']} or reply to this email.\n\n"
-                f"Respectfully,\n"
-                f"{CO['president']}\n"
-                f"{CO['name']}\n"
-                f"{CO['nj_phone']} | {CO['email']}"
-            )
 
-            pdf_bytes = create_lor_pdf(
-                clean_owner, lead["full_address"], lead["case"], lead["date"]
-            )
+# ── COL 3: GENERATE & SAVE ──
+@st.fragment
+@timed("fragment.output")
+def output_column(lead_id, lead, county_name, owner_name):
+    st.markdown(
+        '<div class="step-header"><span class="badge">3</span>Generate & Save</div>',
+        unsafe_allow_html=True,
+    )
+    if not owner_name:
+        st.info("Complete Step 1 to unlock outputs.")
+        return
+    clean_owner = clean_name(owner_name)
 
-            tabs = st.tabs(["✉️ Email", "💬 SMS", "📄 LOR PDF"])
-            with tabs[0]:
-                st.text_input("Subject", email_subj, disabled=True)
-                st.text_area("Body", email_body, height=140)
-            with tabs[1]:
-                st.text_area("Message", sms, height=80)
-            with tabs[2]:
-                st.download_button(
-                    label="⬇ Download Letter of Representation",
-                    data=pdf_bytes,
-                    file_name=f"LOR_{lead['case']}_{clean_owner.replace(' ','_')}.pdf",
-                    mime="application/pdf",
-                    use_container_width=True,
-                )
+    # Same compiled templates as the batch outreach export
+    msg = lead_messages({**lead, "owner": clean_owner})
 
-            st.markdown("")
-            if st.button("💾 SAVE TO DATABASE", type="primary", use_container_width=True):
-                record = {
-                    "Lead ID": selected_id,
-                    "Date": lead["date"],
-                    "County": lead["county"],
-                    "Address": lead["full_address"],
-                    "Case Number": lead["case"],
-                    "Type": lead["type"],
-                    "Homeowner": clean_owner,
-                    "Phone": phone,
-                    "Email": email,
-                    "Status": "Processed",
-                    "Notes": lead["desc"],
-                }
-                save_to_database(record)
-                del st.session_state.queue[selected_id]
-                st.success(f"✅ {clean_owner} saved — lead removed from queue.")
-                st.rerun()
+    pdf_bytes = create_lor_pdf(
+        clean_owner, lead["full_address"], lead["case"], lead["date"]
+    )
+
+    tabs = st.tabs(["✉️ Email", "💬 SMS", "📄 LOR PDF"])
+    with tabs[0]:
+        st.text_input("Subject", msg["email_subject"], disabled=True)
+        st.text_area("Body", msg["email_body"], height=140)
+    with tabs[1]:
+        st.text_area("Message", msg["sms"], height=80)
+    with tabs[2]:
+        st.download_button(
+            label="⬇ Download Letter of Representation",
+            data=pdf_bytes,
+            file_name=lor_filename(lead["case"], clean_owner),
+            mime="application/pdf",
+            use_container_width=True,
+        )
+
+    st.markdown("")
+    if st.button("💾 SAVE TO DATABASE", type="primary", use_container_width=True):
+        phone = st.session_state.get(field_key(lead_id, "phone"), "")
+        email = st.session_state.get(field_key(lead_id, "email"), "")
+        if not (phone or email):
+            st.warning("Add a phone number or email (Step 2) before saving.")
+            return
+        record = {
+            "Lead ID": lead_id,
+            "Date": lead["date"],
+            "County": county_name,
+            "Address": lead["full_address"],
+            "Case Number": lead["case"],
+            "Type": lead["type"],
+            "Homeowner": clean_owner,
+            "Phone": phone,
+            "Email": email,
+            "Status": "Processed",
+            "Notes": lead["desc"],
+        }
+        save_to_database(record)
+        get_work_queue().remove(lead_id)
+        st.session_state.claimed_id = None
+        st.success(f"✅ {clean_owner} saved — lead removed from queue.")
+        st.rerun()   # whole page: counts, analytics and the lead list change
+
+
+# ── LEAD PICKER ──
+# Searches the in-memory queue index and sends the browser one page of it.
+PAGE_SIZE = 25
+NO_LEAD = "Select..."
+
+
+def _first_page():
+    st.session_state.lead_page = 0
+
+
+def _turn_page(step):
+    st.session_state.lead_page = st.session_state.get("lead_page", 0) + step
+
+
+def picker_matches(adjuster):
+    """Queued leads matching the search (not reserved by someone else), in feed
+    order or, with the route toggle on, nearest-neighbour canvass order."""
+    matches = get_queue_index().search(st.session_state.get("lead_query", ""), user=adjuster)
+    if st.session_state.get("lead_route"):
+        matches = get_canvass_index().route(matches)
+    return matches
+
+
+def _step_lead(step, adjuster):
+    """Open the next (or previous) match after the current lead, wrapping round."""
+    matches = picker_matches(adjuster)
+    if not matches:
+        return
+    active = st.session_state.get("lead_pick")
+    pos = matches.index(active) + step if active in matches else (0 if step > 0 else -1)
+    pos %= len(matches)
+    st.session_state.lead_pick = matches[pos]
+    st.session_state.lead_page = pos // PAGE_SIZE
+
+
+@st.fragment
+@timed("fragment.lead_picker")
+def lead_picker(adjuster):
+    queue = get_work_queue()
+    if not queue.count():
+        st.info("⏳ Import leads above to begin processing.")
+        return
+    f1, f2 = st.columns([4, 1], vertical_alignment="bottom")
+    query = f1.text_input(
+        "🔎 Find a lead", key="lead_query", on_change=_first_page,
+        placeholder="County, town, street, case # or loss date (01/15)",
+    )
+    route = f2.toggle("🧭 Canvass route", key="lead_route", on_change=_first_page,
+                      help="Order the matches as a driving route: each lead is followed by the "
+                           "nearest one left (town centres; by street and house number within a town).")
+    matches = picker_matches(adjuster)
+    pages = max(1, -(-len(matches) // PAGE_SIZE))
+    page = st.session_state.lead_page = min(max(st.session_state.get("lead_page", 0), 0), pages - 1)
+
+    n1, n2, n3, n4, n5 = st.columns([1.2, 1.2, 0.8, 0.8, 2])
+    n1.button("⬆ Previous lead", shortcut="Alt+Up", on_click=_step_lead, args=(-1, adjuster),
+              disabled=not matches, use_container_width=True)
+    n2.button("⬇ Next lead", shortcut="Alt+Down", on_click=_step_lead, args=(1, adjuster),
+              disabled=not matches, use_container_width=True)
+    n3.button("◀", key="page_prev", on_click=_turn_page, args=(-1,), disabled=page == 0,
+              use_container_width=True)
+    n4.button("▶", key="page_next", on_click=_turn_page, args=(1,), disabled=page >= pages - 1,
+              use_container_width=True)
+    route_note = f" · route ≈ {get_canvass_index().route_miles(matches):,.0f} mi" if route else ""
+    n5.caption(f"{len(matches):,} queued lead(s) — page {page + 1} of {pages}{route_note}")
+
+    options = [NO_LEAD] + matches[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]
+    active = st.session_state.get("lead_pick", NO_LEAD)
+    if active not in options:
+        if active != NO_LEAD and active in queue:
+            options.insert(1, active)            # keep the open lead while paging or searching
         else:
-            st.info("Complete Steps 1 & 2 to unlock outputs.")
\ No newline at end of file
+            st.session_state.lead_pick = NO_LEAD     # saved, or gone from the queue
+    if not matches:
+        st.info(
+            f"No queued lead matches “{query}”." if query
+            else "👥 Every queued lead is currently being worked by another adjuster."
+        )
+    selected_id = st.selectbox("**Active Lead**", options, key="lead_pick")
+
+    # Hand back the lead that was open before; the workspace claims the new one.
+    previous = st.session_state.get("claimed_id")
+    if previous and previous != selected_id:
+        queue.release(previous, adjuster)
+        st.session_state.claimed_id = None
+    if selected_id != NO_LEAD:
+        workspace(selected_id, adjuster)
+
+
+lead_picker(st.session_state.adjuster)
+run.lap("workspace")
+
+# ── PER-RERUN TIMING ────────────────────────────────────────────────────────
+run.finish(dump_over=st.session_state.get("profile_threshold_ms", 1000) / 1000)
+st.session_state.perf_last = {"total": run.total, "rows": run.breakdown(), "profile": run.profile_path}
@@ -0,0 +1,163 @@
+"""Historical lead reads: the Excel workbook vs. the Parquet archive.
+
+Writes ``--leads`` synthetic saved leads (loss dates spread over 2023–2026)
+once as the old ``Primestate_Leads_Database.xlsx`` layout and once as the
+month/county Parquet archive (``primestate.archive``), then answers the same
+questions from each.  Every query runs in a fresh interpreter, best of
+``--runs``, and reports wall time and peak memory: the highest resident set
+size sampled during the query, over the RSS once pandas / pyarrow are imported.
+
+The workbook side does what the dashboard used to: ``pd.read_excel`` (with
+``usecols`` where the question allows) and filter in pandas.
+
+    python benchmarks/bench_archive.py
+    python benchmarks/bench_archive.py --leads 100000 --runs 1
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+from primestate.archive import LeadArchive  # noqa: E402
+from primestate.parser import parse_bulk_text  # noqa: E402
+from primestate.store import COLUMNS  # noqa: E402
+from synthetic import synthetic_leads  # noqa: E402
+
+# name -> (columns, filters) as LeadArchive.query takes them
+QUERIES = {
+    "count all": (None, {}),
+    "Essex 2025, owner+phone": (["Homeowner", "Phone"],
+                                {"county": "Essex", "date_from": "2025-01-01", "date_to": "2025-12-31"}),
+    "one month, all columns": (None, {"date_from": "2024-06-01", "date_to": "2024-06-30"}),
+    "Closed, one county": (["Lead ID", "Homeowner"], {"county": "Bergen", "status": "Closed"}),
+}
+
+_PROBE = """
+import json, os, sys, threading, time
+sys.path.insert(0, {root!r})
+import pandas as pd
+import pyarrow.dataset
+from primestate.archive import LeadArchive, loss_date
+
+def rss():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+peak, done = [rss()], threading.Event()
+def sample():
+    while not done.wait(0.002):
+        peak.append(rss())
+threading.Thread(target=sample, daemon=True).start()
+
+kind, path, columns, usecols, filters, count_only = json.loads(sys.argv[1])
+base = rss()
+t0 = time.perf_counter()
+if kind == "parquet":
+    archive = LeadArchive(path)
+    n = archive.count(**filters) if count_only else len(archive.query(columns, **filters))
+else:
+    df = pd.read_excel(path, usecols=usecols)
+    if filters.get("county"):
+        df = df[df["County"] == filters["county"]]
+    if filters.get("status"):
+        df = df[df["Status"] == filters["status"]]
+    if filters.get("date_from") or filters.get("date_to"):
+        iso = df["Date"].map(loss_date)
+        if filters.get("date_from"):
+            df = df[iso >= filters["date_from"]]
+        if filters.get("date_to"):
+            df = df[iso.loc[df.index] <= filters["date_to"]]
+    n = len(df if columns is None else df[columns])
+dt = time.perf_counter() - t0
+done.set()
+print(json.dumps([dt, (max(peak + [rss()]) - base) / 1e6, n]))
+"""
+
+
+def seed(n_leads, workdir):
+    """Write the workbook and the archive; returns their paths."""
+    import pandas as pd
+
+    rnd = random.Random(n_leads)
+    rows = []
+    for lead in parse_bulk_text(synthetic_leads(n_leads, seed=n_leads)):
+        d = lead["data"]
+        year = rnd.choice([2023, 2024, 2025, 2026])
+        rows.append((
+            lead["id"], f"{rnd.randint(1, 12):02d}/{rnd.randint(1, 28):02d}/{year} 10:00 AM",
+            d["county_key"].title(), d["full_address"], d["case"], d["type"],
+            f"OWNER {len(rows)}", f"201-555-{len(rows) % 10000:04d}", "", rnd.choice(
+                ["Processed", "Contacted", "Signed", "Closed"]), d["desc"],
+        ))
+    xlsx = os.path.join(workdir, "Primestate_Leads_Database.xlsx")
+    t0 = time.perf_counter()
+    pd.DataFrame(rows, columns=COLUMNS).to_excel(xlsx, index=False)
+    print(f"… wrote {len(rows):,} leads to xlsx in {time.perf_counter() - t0:.1f}s "
+          f"({os.path.getsize(xlsx) / 1e6:.1f} MB)", file=sys.stderr, flush=True)
+
+    archive = LeadArchive(os.path.join(workdir, "archive"))
+    t0 = time.perf_counter()
+    for i in range(0, len(rows), 20000):      # as successive archive runs would
+        archive.append(rows[i:i + 20000])
+    archive.compact()
+    info = archive.summary()
+    print(f"… wrote the archive in {time.perf_counter() - t0:.1f}s ({info['partitions']:,} partitions, "
+          f"{info['bytes'] / 1e6:.1f} MB)", file=sys.stderr, flush=True)
+    return xlsx, archive.directory
+
+
+def usecols(columns, filters):
+    """Workbook columns a question needs: the ones asked for plus the ones filtered on."""
+    if columns is None:
+        return None
+    needed = {"county": "County", "status": "Status", "date_from": "Date", "date_to": "Date"}
+    return sorted(set(columns) | {needed[k] for k in filters})
+
+
+def probe(kind, path, columns, filters, count_only, runs):
+    best = None
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(root=ROOT),
+             json.dumps([kind, path, columns, usecols(columns, filters), filters, count_only])],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(out)
+        best = result if best is None or result[0] < best[0] else best
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--leads", type=int, default=20000)
+    ap.add_argument("--runs", type=int, default=3)
+    args = ap.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="primestate-archive-")
+    try:
+        xlsx, archive = seed(args.leads, workdir)
+        print(f"{'query':26s} {'rows':>7s} {'read_excel':>11s} {'MB':>6s} "
+              f"{'parquet':>9s} {'MB':>6s} {'speed-up':>9s}")
+        for name, (columns, filters) in QUERIES.items():
+            count_only = name == "count all"
+            t_x, mb_x, n_x = probe("xlsx", xlsx, columns, filters, count_only, args.runs)
+            t_p, mb_p, n_p = probe("parquet", archive, columns, filters, count_only, args.runs)
+            if n_x != n_p:
+                raise SystemExit(f"{name}: workbook found {n_x:,} rows, archive {n_p:,}")
+            print(f"{name:26s} {n_p:7,} {t_x * 1000:8.0f} ms {mb_x:6.1f} "
+                  f"{t_p * 1000:6.1f} ms {mb_p:6.1f} {t_x / t_p:8.0f}x")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Repeat-claimant lookup: a string-distance scan vs. the trigram index.
+
+Saves ``--leads`` synthetic leads with owner names in tax-record and
+hand-typed spellings, then looks up ``--queries`` owners with one letter
+misspelled (plus, for the index, the lead's address as the workspace does).
+
+* *scan* – ``difflib`` ratio of the cleaned name against every saved owner,
+  which is what a per-keystroke search without an index costs;
+* *index* – :meth:`ClaimantIndex.search`.
+
+"found" is the share of lookups whose top result is the owner that was
+misspelled.  Also reports the one-off build and the cost of patching the
+index for one saved lead.
+
+    python benchmarks/bench_claimants.py
+    python benchmarks/bench_claimants.py --leads 100000 --queries 500
+"""
+import argparse
+import difflib
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from primestate.claimants import ClaimantIndex, name_key  # noqa: E402
+from primestate.links import clean_name  # noqa: E402
+from primestate.parser import parse_bulk_text  # noqa: E402
+from primestate.store import LeadCache, LeadStore  # noqa: E402
+from synthetic import misspell, synthetic_leads, synthetic_owner  # noqa: E402
+
+SCAN_QUERIES = 5      # the scan is slow; a handful is enough for its median
+
+
+def seed(cache, n_leads):
+    rnd = random.Random(n_leads)
+    records = []
+    for lead in parse_bulk_text(synthetic_leads(n_leads, seed=n_leads)):
+        d = lead["data"]
+        records.append({
+            "Lead ID": lead["id"], "Date": d["date"], "County": d["county_key"].title(),
+            "Address": d["full_address"], "Case Number": d["case"], "Type": d["type"],
+            "Homeowner": synthetic_owner(rnd), "Phone": f"201-555-{len(records) % 10000:04d}",
+            "Email": "", "Status": "Processed", "Notes": "",
+        })
+    for i in range(0, len(records), 5000):
+        cache.save(records[i:i + 5000])
+    return records
+
+
+def scan(records, query, limit=5):
+    q = clean_name(query).lower()
+    ranked = sorted(
+        ((difflib.SequenceMatcher(None, q, clean_name(r["Homeowner"]).lower()).ratio(), i)
+         for i, r in enumerate(records)),
+        reverse=True,
+    )
+    return [records[i] for _, i in ranked[:limit]]
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - t0, result
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--leads", type=int, default=20000)
+    ap.add_argument("--queries", type=int, default=200)
+    args = ap.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="primestate-claimants-")
+    try:
+        cache = LeadCache(LeadStore(os.path.join(workdir, "leads.sqlite3")))
+        records = seed(cache, args.leads)
+        build, index = timed(ClaimantIndex, cache)
+
+        rnd = random.Random(0)
+        picks = [rnd.choice(records) for _ in range(args.queries)]
+        typed = [(misspell(r["Homeowner"], rnd), r) for r in picks]
+
+        def found(results, original):
+            return bool(results) and name_key(results[0]["Homeowner"]) == name_key(original["Homeowner"])
+
+        rows = []
+        for label, fn, queries in (
+            ("scan (difflib)", lambda q, r: scan(records, q), typed[:SCAN_QUERIES]),
+            ("index, name", lambda q, r: index.search(q), typed),
+            ("index, name + address", lambda q, r: index.search(q, r["Address"]), typed),
+        ):
+            times, hits = [], 0
+            for query, original in queries:
+                seconds, results = timed(fn, query, original)
+                times.append(seconds)
+                hits += found(results, original)
+            rows.append((label, len(queries), statistics.median(times), max(times), hits / len(queries)))
+
+        updates = []
+        for i in range(50):
+            lead = dict(rnd.choice(records), Homeowner=synthetic_owner(rnd))
+            row = tuple(lead.get(c) for c in cache.store.get(lead["Lead ID"]).keys())
+            seconds, _ = timed(index._apply, [row], [None])
+            updates.append(seconds)
+
+        print(f"{args.leads:,} leads · index built in {build:.2f}s · "
+              f"one saved lead patched in {statistics.median(updates) * 1e6:.0f} µs")
+        print(f"{'lookup':24s} {'n':>5s} {'median':>10s} {'worst':>10s} {'found':>7s}")
+        for label, n, med, worst, rate in rows:
+            print(f"{label:24s} {n:5d} {med * 1000:7.2f} ms {worst * 1000:7.2f} ms {rate:6.0%}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
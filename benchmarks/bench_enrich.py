@@ -0,0 +1,112 @@
+"""Enrichment against a local stub lookup server (runs offline).
+
+The stub answers ``/owner?address=…`` after a fixed latency, fails a share
+of requests with 503 to exercise retries, and 404s addresses it doesn't know.
+The script enriches a synthetic batch twice: the first pass must fetch each
+distinct address once, the second must be served entirely from the cache.
+Exits 1 if either expectation fails.
+
+    python benchmarks/bench_enrich.py
+    python benchmarks/bench_enrich.py --leads 5000 --latency 0.05 --rate 200
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_parse import synthetic_feed  # noqa: E402
+from primestate.enrich import EnrichCache, Enricher, JSONProvider  # noqa: E402
+from primestate.parser import iter_leads  # noqa: E402
+
+
+class StubLookup(BaseHTTPRequestHandler):
+    latency = 0.02
+    fail_rate = 0.05
+    requests = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with StubLookup.lock:
+            StubLookup.requests += 1
+        time.sleep(self.latency)
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        address = query.get("address", [""])[0]
+        if random.random() < self.fail_rate:
+            self._send(503, {"error": "busy"}, {"Retry-After": "0"})
+        elif address.startswith("1"):
+            self._send(404, {"error": "not found"})
+        else:
+            seed = sum(map(ord, address))
+            self._send(200, {"result": {
+                "owner_name": f"OWNER, NUMBER {seed}",
+                "phones": [f"201-555-{seed % 10000:04d}"],
+            }})
+
+    def _send(self, status, doc, headers=None):
+        body = json.dumps(doc).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--leads", type=int, default=2000)
+    ap.add_argument("--latency", type=float, default=0.02, help="stub response time (s)")
+    ap.add_argument("--rate", type=float, default=500, help="provider rate limit (req/s)")
+    ap.add_argument("--concurrency", type=int, default=32)
+    args = ap.parse_args()
+
+    StubLookup.latency = args.latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubLookup)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/owner?address={{address}}&city={{city}}"
+    provider = JSONProvider(
+        "stub", url, {"owner": "result.owner_name", "phone": "result.phones.0"},
+        rate=args.rate, burst=args.concurrency,
+    )
+    leads = [l["data"] for l in iter_leads(synthetic_feed(args.leads * 2))]
+    distinct = len({l["address_key"] for l in leads})
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        enricher = Enricher([provider], EnrichCache(os.path.join(tmp, "enrich.sqlite3")),
+                            concurrency=args.concurrency, backoff=0.01)
+        for label in ("cold", "warm"):
+            before = StubLookup.requests
+            results, stats = enricher.enrich(leads)
+            sent = StubLookup.requests - before
+            found = sum(1 for r in results if r.get("owner"))
+            print(f"{label}: {stats.leads:,} leads ({distinct:,} addresses) in {stats.seconds:6.2f}s  "
+                  f"http={sent:,} retries={stats.retries:,} cached={stats.cached:,} "
+                  f"failed={stats.failed:,} owners={found:,}")
+            if label == "cold":
+                serial = (stats.fetched + stats.retries) * args.latency
+                print(f"      one-at-a-time would take ~{serial:.1f}s; "
+                      f"{stats.fetched / stats.seconds:,.0f} lookups/s")
+                ok &= stats.fetched + stats.failed == distinct
+            else:
+                ok &= sent == 0 and stats.cached == distinct - stats.failed
+    server.shutdown()
+    print("ok" if ok else "FAILED")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
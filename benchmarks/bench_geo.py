@@ -0,0 +1,166 @@
+"""Canvass planning: brute-force pairwise distances vs. the grid index.
+
+Two sets of ``--leads`` points:
+
+* *queue* – synthetic leads queued and geocoded through :class:`CanvassIndex`
+  (town centroids, so many leads share a point);
+* *scattered* – distinct random points across NJ, the worst case for the
+  grid (every lead its own slot), as a street table would give.
+
+For each, times ``--queries`` "within ``--miles``" lookups, single-linkage
+clustering at ``--cluster`` miles and a nearest-neighbour route, against
+numpy brute force over every pair (route and clusters only on the first
+``--brute`` points: they are quadratic).  Results are checked to agree.
+
+    python benchmarks/bench_geo.py
+    python benchmarks/bench_geo.py --leads 100000 --brute 5000
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from primestate.geo import MILES_PER_DEGREE, CanvassIndex, GridIndex, route_miles  # noqa: E402
+from primestate.parser import parse_bulk_text  # noqa: E402
+from primestate.work_queue import WorkQueue  # noqa: E402
+from synthetic import synthetic_leads  # noqa: E402
+
+NJ_BOX = ((38.93, 41.36), (-75.56, -73.89))     # (lat range, lon range)
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - t0, result
+
+
+def brute_miles(lat, lon, lats, lons):
+    """Distances from one point to arrays of points, as :func:`geo.miles` computes them."""
+    dx = (lons - lon) * np.cos(np.radians((lats + lat) / 2))
+    return np.hypot(dx, lats - lat) * MILES_PER_DEGREE
+
+
+def brute_within(pts, i, radius):
+    d = brute_miles(pts[i, 0], pts[i, 1], pts[:, 0], pts[:, 1])
+    return set(np.flatnonzero(d <= radius).tolist())
+
+
+def brute_clusters(pts, radius):
+    """Connected components of the "within radius" graph, a row of distances at a time."""
+    parent = list(range(len(pts)))
+
+    def root(p):
+        while parent[p] != p:
+            parent[p] = parent[parent[p]]
+            p = parent[p]
+        return p
+
+    for i in range(len(pts)):
+        d = brute_miles(pts[i, 0], pts[i, 1], pts[i + 1:, 0], pts[i + 1:, 1])
+        for j in np.flatnonzero(d <= radius) + i + 1:
+            a, b = root(i), root(int(j))
+            if a != b:
+                parent[a] = b
+    groups = {}
+    for i in range(len(pts)):
+        groups.setdefault(root(i), []).append(i)
+    return sorted(groups.values(), key=len, reverse=True)
+
+
+def brute_route(pts):
+    """Nearest-neighbour order from point 0, one argmin over the remaining points per step."""
+    left = np.ones(len(pts), bool)
+    order, i = [], 0
+    for _ in range(len(pts)):
+        order.append(i)
+        left[i] = False
+        if not left.any():
+            break
+        d = brute_miles(pts[i, 0], pts[i, 1], pts[:, 0], pts[:, 1])
+        d[~left] = np.inf
+        i = int(d.argmin())
+    return order
+
+
+def grid_of(pts):
+    grid = GridIndex()
+    for i, (lat, lon) in enumerate(pts):
+        grid.add(i, lat, lon)
+    return grid
+
+
+def queue_points(workdir, n_leads):
+    queue = WorkQueue(os.path.join(workdir, "queue.sqlite3"))
+    queue.add_many(parse_bulk_text(synthetic_leads(n_leads, seed=n_leads)))
+    build, index = timed(lambda: CanvassIndex(queue))
+    seconds, _ = timed(index.refresh)
+    ids = [lid for lid, _ in queue.items() if index.position(lid)]
+    print(f"queue: {len(queue.ids()):,} leads queued · {len(ids):,} placed at "
+          f"{len({index.grid.position(lid) for lid in ids}):,} points · geocoded and indexed "
+          f"in {(build + seconds) * 1000:.0f} ms")
+    return np.array([index.grid.position(lid) for lid in ids])
+
+
+def scattered_points(n):
+    rnd = random.Random(n)
+    (lat0, lat1), (lon0, lon1) = NJ_BOX
+    return np.array([(rnd.uniform(lat0, lat1), rnd.uniform(lon0, lon1)) for _ in range(n)])
+
+
+def compare(label, pts, args):
+    rnd = random.Random(0)
+    build, grid = timed(grid_of, pts)
+    picks = [rnd.randrange(len(pts)) for _ in range(args.queries)]
+    near_grid, got = timed(lambda: [{i for _, i in grid.within(*pts[p], args.miles)} for p in picks])
+    near_brute, want = timed(lambda: [brute_within(pts, p, args.miles) for p in picks])
+    assert got == want, "within: grid and brute force disagree"
+
+    full_clusters, _ = timed(grid.clusters, args.cluster)
+    full_route, _ = timed(grid.route, 0)
+    sub = pts[:args.brute]
+    sub_grid = grid_of(sub)
+    cl_grid, got = timed(sub_grid.clusters, args.cluster)
+    cl_brute, want = timed(brute_clusters, sub, args.cluster)
+    assert sorted(map(sorted, got)) == sorted(map(sorted, want)), "clusters disagree"
+    rt_grid, got = timed(sub_grid.route, 0)
+    rt_brute, want = timed(brute_route, sub)
+    grid_len, brute_len = route_miles([tuple(sub[i]) for i in got]), route_miles([tuple(sub[i]) for i in want])
+
+    n, m, q = len(pts), len(sub), len(picks)
+    print(f"{label}: {n:,} points, grid built in {build * 1000:.0f} ms")
+    print(f"  {'operation':34s} {'brute force':>12s} {'grid':>10s}")
+    print(f"  {f'within {args.miles:g} mi, per lookup':34s} {near_brute / q * 1000:9.2f} ms "
+          f"{near_grid / q * 1000:7.3f} ms")
+    print(f"  {f'clusters at {args.cluster:g} mi, {m:,} points':34s} {cl_brute:10.2f} s {cl_grid:8.2f} s")
+    print(f"  {f'route, {m:,} points':34s} {rt_brute:10.2f} s {rt_grid:8.2f} s"
+          f"   ({brute_len:,.0f} vs {grid_len:,.0f} mi)")
+    print(f"  {f'clusters, all {n:,}':34s} {'':>12s} {full_clusters:8.2f} s")
+    print(f"  {f'route, all {n:,}':34s} {'':>12s} {full_route:8.2f} s")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--leads", type=int, default=50000)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--brute", type=int, default=10000, help="points for the quadratic comparisons")
+    ap.add_argument("--miles", type=float, default=2.0)
+    ap.add_argument("--cluster", type=float, default=1.0)
+    args = ap.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="primestate-geo-")
+    try:
+        compare("queue", queue_points(workdir, args.leads), args)
+        compare("scattered", scattered_points(args.leads), args)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Cold import time of the core package, checked against a budget.
+
+Each module is imported in a fresh interpreter (best of ``--runs``) so the
+numbers include everything it drags in.  Exits 1 if a module is over budget
+or if importing the core pulls in pandas, fpdf, streamlit, httpx or pyarrow.
+
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --runs 10
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# module -> budget in ms (generous for a cold, single-core box)
+BUDGET_MS = {
+    "primestate": 15,
+    "primestate.company": 15,
+    "primestate.instrument": 15,
+    "primestate.normalize": 25,
+    "primestate.parser": 40,
+    "primestate.store": 40,
+    "primestate.work_queue": 40,
+    "primestate.archive": 40,
+    "primestate.dedupe": 40,
+    "primestate.claimants": 40,
+    "primestate.geo": 40,
+    "primestate.links": 40,
+    "primestate.pdf": 40,
+    "primestate.analytics": 40,
+    "primestate.batch": 80,
+    "primestate.outreach": 80,
+    "primestate.enrich": 80,
+    "primestate.jobs": 40,
+    "primestate.tasks": 80,
+    "primestate.cli": 120,
+}
+HEAVY = ("pandas", "fpdf", "streamlit", "httpx", "pyarrow")
+
+_PROBE = """
+import sys, time
+t0 = time.perf_counter()
+import {module}
+dt = time.perf_counter() - t0
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(dt * 1000, ",".join(heavy))
+"""
+
+
+def measure(module, runs):
+    best, heavy = float("inf"), ""
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.split()
+        best = min(best, float(out[0]))
+        heavy = out[1] if len(out) > 1 else ""
+    return best, heavy
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args()
+
+    failed = False
+    for module, budget in BUDGET_MS.items():
+        ms, heavy = measure(module, args.runs)
+        over = ms > budget or heavy
+        failed |= bool(over)
+        note = f"  pulls in {heavy}" if heavy else ""
+        print(f"{module:24s} {ms:7.1f} ms  (budget {budget:3d}){'  OVER' if over else ''}{note}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Mail-merge outreach: per-lead templating vs. the vectorized batch renderer.
+
+Builds ``--leads`` synthetic ready leads (owner, phone, email) and fills the
+SMS, email subject and email body for all of them:
+
+* *per lead* – the three f-strings once per lead, as Step 3 renders them;
+* *compiled, per lead* – :func:`lead_messages`, the compiled templates joined
+  one lead at a time;
+* *vectorized* – building ``CHUNK``-row DataFrames and :func:`render_frame`
+  over them (Arrow string joins).
+
+Then writes them with :func:`write_outreach` as CSV and JSON Lines, and
+``--eml`` of them as ``.eml`` drafts with the letter attached, reporting
+wall time and, in a second untimed run, the peak Python memory the write
+allocated (``tracemalloc``), which stays near one chunk's worth as the
+batch grows.
+
+    python benchmarks/bench_outreach.py
+    python benchmarks/bench_outreach.py --leads 100000 --eml 500
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from primestate.company import CO  # noqa: E402
+from primestate.links import clean_name  # noqa: E402
+from primestate.outreach import CHUNK, LEAD_FIELDS, lead_messages, render_frame, write_outreach  # noqa: E402
+from primestate.parser import parse_bulk_text  # noqa: E402
+from synthetic import synthetic_leads, synthetic_owner  # noqa: E402
+
+
+def ready_leads(n_leads):
+    rnd = random.Random(n_leads)
+    leads = []
+    for lead in parse_bulk_text(synthetic_leads(n_leads, seed=n_leads)):
+        d = lead["data"]
+        owner = clean_name(synthetic_owner(rnd))
+        leads.append((lead["id"], owner, d["type"], d["address_part"], d["case"], d["date"],
+                      d["full_address"], f"201-555-{len(leads) % 10000:04d}",
+                      f"{owner.split()[0].lower()}{len(leads)}@example.com"))
+    return leads
+
+
+def fstrings(lead):
+    """Step 3's original per-rerun f-strings, for comparison."""
+    _, owner, type_, address_part, case, date = lead[:6]
+    return (
+        f"Hello {owner}, this is {CO['short']} reaching out regarding the "
+        f"{type_} loss at {address_part}. Please call us at "
+        f"{CO['nj_phone']} — Case #{case}.",
+        f"Letter of Representation — {type_} at {address_part} (Case #{case})",
+        f"Dear {owner},\n\n"
+        f"Please find attached our Letter of Representation regarding "
+        f"the loss at your property on {date}.\n\n"
+        f"Should you have any questions, please do not hesitate to contact "
+        f"our office at {CO['nj_phone']} or reply to this email.\n\n"
+        f"Respectfully,\n"
+        f"{CO['president']}\n"
+        f"{CO['name']}\n"
+        f"{CO['nj_phone']} | {CO['email']}",
+    )
+
+
+def vectorized(leads):
+    for i in range(0, len(leads), CHUNK):
+        render_frame(pd.DataFrame.from_records(leads[i:i + CHUNK], columns=LEAD_FIELDS))
+
+
+def best(fn, runs=3):
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--leads", type=int, default=10000)
+    ap.add_argument("--eml", type=int, default=200, help="leads written as .eml drafts (letters are slow)")
+    args = ap.parse_args()
+
+    leads = ready_leads(args.leads)
+    n = len(leads)
+    print(f"{n:,} ready leads · {'render':24s} {'total':>9s} {'per 10k':>9s}")
+    for label, fn in (
+        ("per lead (f-strings)", lambda: [fstrings(lead) for lead in leads]),
+        ("compiled, per lead", lambda: [lead_messages(dict(zip(LEAD_FIELDS, lead))) for lead in leads]),
+        ("vectorized", lambda: vectorized(leads)),
+    ):
+        seconds = best(fn)
+        print(f"{'':18s}{label:24s} {seconds * 1000:6.0f} ms {seconds / n * 1e4 * 1000:6.0f} ms")
+
+    workdir = tempfile.mkdtemp(prefix="primestate-outreach-")
+    try:
+        print(f"{'write':18s}{'leads':>8s} {'render':>9s} {'total':>9s} {'peak MB':>8s} {'size MB':>8s}")
+        for fmt, subset in (("csv", leads), ("jsonl", leads), ("eml", leads[:args.eml])):
+            target = os.path.join(workdir, f"outreach.{fmt}")
+            stats = write_outreach(subset, target, fmt)
+            tracemalloc.start()
+            write_outreach(subset, target, fmt)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{fmt:18s}{stats.leads:8,} {stats.render_seconds * 1000:6.0f} ms "
+                  f"{stats.seconds * 1000:6.0f} ms {peak / 1e6:8.1f} {os.path.getsize(target) / 1e6:8.1f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Lines/sec for the streaming and columnar feed parsers.
+
+    python benchmarks/bench_parse.py            # 1,000,000 lines
+    python benchmarks/bench_parse.py --lines 200000
+"""
+import argparse
+import os
+import sys
+import time
+from itertools import islice
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from primestate.parser import ParseStats, iter_frames, iter_leads  # noqa: E402
+from synthetic import iter_feed_lines  # noqa: E402
+
+
+def synthetic_feed(n_lines, seed=0):
+    """``n_lines`` lines of synthetic feed (see ``synthetic.py``)."""
+    return "\n".join(islice(iter_feed_lines(n_lines // 2 + 1, seed), n_lines))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--lines", type=int, default=1_000_000)
+    args = ap.parse_args()
+
+    text = synthetic_feed(args.lines)
+    print(f"feed: {args.lines:,} lines, {len(text) / 1e6:.1f} MB")
+
+    stats = ParseStats()
+    t0 = time.perf_counter()
+    for _ in iter_leads(text, stats):
+        pass
+    dt = time.perf_counter() - t0
+    print(f"iter_leads : {dt:6.2f}s  {args.lines / dt:12,.0f} lines/s  "
+          f"leads={stats.leads:,} malformed={stats.malformed:,}")
+
+    stats = ParseStats()
+    t0 = time.perf_counter()
+    rows = sum(len(f) for f in iter_frames(text, stats=stats))
+    dt = time.perf_counter() - t0
+    print(f"iter_frames: {dt:6.2f}s  {args.lines / dt:12,.0f} lines/s  "
+          f"leads={rows:,} malformed={stats.malformed:,}")
+
+
+if __name__ == "__main__":
+    main()
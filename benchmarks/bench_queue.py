@@ -0,0 +1,73 @@
+"""Lead picker cost: the old full-queue selectbox vs. the indexed, paged picker.
+
+For each queue size, times what one rerun of Step 2 paid to list the queue
+(``WorkQueue.ids`` for the whole queue) against a :class:`QueueIndex` search
+plus one page, and reports the option payload each sends to the browser.
+"per key" replays ``--query`` one keystroke at a time on a fresh index, so
+every term is matched cold.
+
+    python benchmarks/bench_queue.py
+    python benchmarks/bench_queue.py --sizes 1000,50000 --query "essex main"
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from primestate.parser import parse_bulk_text  # noqa: E402
+from primestate.work_queue import QueueIndex, WorkQueue  # noqa: E402
+from synthetic import synthetic_leads  # noqa: E402
+
+PAGE_SIZE = 25
+
+
+def best_of(fn, repeat=5):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", default="1000,10000,50000")
+    ap.add_argument("--query", default="essex 01/1", help="search typed into the picker")
+    args = ap.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="primestate-queue-")
+    try:
+        print(f"{'queue':>8s} {'full list':>10s} {'payload':>9s} {'build':>9s} "
+              f"{'all, p1':>9s} {'per key':>9s} {'payload':>9s}")
+        for size in (int(s) for s in args.sizes.split(",") if s):
+            queue = WorkQueue(os.path.join(workdir, f"queue_{size}.sqlite3"))
+            queue.add_many(parse_bulk_text(synthetic_leads(size, seed=size)))
+            before = best_of(lambda: queue.ids(user="bench"))
+            payload_before = len(json.dumps(["Select..."] + queue.ids(user="bench")))
+
+            index = QueueIndex(queue)
+            t0 = time.perf_counter()
+            index.refresh()
+            build = time.perf_counter() - t0
+            browse = best_of(lambda: index.search("", user="bench")[:PAGE_SIZE])
+            typed = [args.query[:i] for i in range(1, len(args.query) + 1)]
+            t0 = time.perf_counter()
+            for text in typed:
+                index.search(text, user="bench")[:PAGE_SIZE]
+            per_key = (time.perf_counter() - t0) / len(typed)
+            payload_after = len(json.dumps(["Select..."] + index.search("", user="bench")[:PAGE_SIZE]))
+            print(f"{len(index):8,d} {before * 1000:7.2f} ms {payload_before / 1024:6.0f} KB "
+                  f"{build * 1000:6.0f} ms {browse * 1000:6.2f} ms {per_key * 1000:6.2f} ms "
+                  f"{payload_after / 1024:6.1f} KB")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
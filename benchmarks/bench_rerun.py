@@ -0,0 +1,120 @@
+"""Per-interaction latency of the dashboard: full rerun vs. the fragment it touches.
+
+Drives ``app.py`` headlessly with Streamlit's ``AppTest`` against a store of
+``--leads`` saved leads and one queued lead, then repeats each interaction
+(owner name, phone, email body, analytics breakdown) ``--repeat`` times.
+
+``AppTest`` always executes the whole script, so both figures come from the
+app's own instrumentation (``primestate.instrument``) on the same runs:
+
+* *full rerun* – what every keystroke cost before the workspace and sidebar
+  were split into fragments (the whole script);
+* *fragment* – the span of the fragment that owns the widget, which is what
+  a fragment-scoped rerun executes in the browser.
+
+    python benchmarks/bench_rerun.py
+    python benchmarks/bench_rerun.py --leads 100000 --repeat 10
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import warnings
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+from primestate import store  # noqa: E402
+from primestate.parser import parse_bulk_text  # noqa: E402
+from synthetic import synthetic_leads  # noqa: E402
+
+APP = os.path.join(ROOT, "app.py")
+FEED = "NJ | Essex | Newark | 123 Main St | Fire | Structure | #12345\n01/15/2026 10:00 AM"
+
+# (interaction, fragment that owns the widget)
+INTERACTIONS = [
+    ("owner name", "fragment.workspace"),
+    ("phone", "fragment.contact"),
+    ("email body", "fragment.output"),
+    ("analytics breakdown", "fragment.sidebar_stats"),
+]
+
+
+def seed(n_leads):
+    records = []
+    for lead in parse_bulk_text(synthetic_leads(n_leads, seed=n_leads)):
+        d = lead["data"]
+        records.append({
+            "Lead ID": lead["id"], "Date": d["date"], "County": d["county_key"].title(),
+            "Address": d["full_address"], "Case Number": d["case"], "Type": d["type"],
+            "Homeowner": "", "Phone": "", "Email": "", "Status": "Processed", "Notes": d["desc"],
+        })
+    cache = store.get_lead_cache()
+    for i in range(0, len(records), 5000):
+        cache.save(records[i:i + 5000])
+    return len(records)
+
+
+def _label(widgets, text):
+    return next(w for w in widgets if text in w.label)
+
+
+def interact(at, name, i):
+    if name == "owner name":
+        _label(at.text_input, "Owner").input(f"DOE, JOHN {i}")
+    elif name == "phone":
+        _label(at.text_input, "Phone").input(f"201-555-{i:04d}")
+    elif name == "email body":
+        _label(at.text_area, "Body").input(f"Dear owner {i},")
+    else:
+        box = at.selectbox(key="stats_dim")
+        box.select(box.options[i % len(box.options)])
+    at.run()
+    if at.exception:
+        raise SystemExit(f"{name}: {at.exception[0].message}")
+    last = at.session_state["perf_last"]
+    return last["total"], {span: sec for span, sec, _ in last["rows"]}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--leads", type=int, default=10000, help="saved leads in the store")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+    warnings.filterwarnings("ignore")
+
+    from streamlit.testing.v1 import AppTest
+
+    workdir = tempfile.mkdtemp(prefix="primestate-rerun-")
+    cwd = os.getcwd()
+    os.chdir(workdir)            # the app opens its store relative to the cwd
+    try:
+        print(f"… seeding {seed(args.leads):,} saved leads", file=sys.stderr, flush=True)
+        at = AppTest.from_file(APP, default_timeout=120)
+        at.session_state["password_correct"] = True
+        at.run()
+        at.text_area[0].input(FEED).run()
+        next(b for b in at.button if "Process Import" in b.label).click().run()
+        box = _label(at.selectbox, "Active Lead")
+        box.select(box.options[1]).run()
+        interact(at, "owner name", 0)      # unlock the contact and output columns
+
+        print(f"{'interaction':22s} {'full rerun':>12s} {'fragment':>12s} {'speed-up':>9s}")
+        for name, span in INTERACTIONS:
+            full, part = [], []
+            for i in range(1, args.repeat + 1):
+                total, spans = interact(at, name, i)
+                full.append(total)
+                part.append(spans[span])
+            full_ms, part_ms = statistics.median(full) * 1000, statistics.median(part) * 1000
+            print(f"{name:22s} {full_ms:9.1f} ms {part_ms:9.1f} ms {full_ms / part_ms:8.1f}x")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""Hot-path benchmark suite with JSON results and baseline comparison.
+
+Measures the core entry points on synthetic data (see ``synthetic.py``):
+feed parsing and ``save_to_database`` / ``load_database`` at each database
+size, plus ``clean_name``, ``get_search_links`` and ``create_lor_pdf``
+(cache miss and hit).  Every figure is seconds per operation, best of
+``--repeat`` runs (single saves: the best run's median and p95), so lower is
+better throughout.  The whole suite is run ``--rounds`` times, each in a
+fresh process, and each benchmark keeps its best round, so a slow process
+or a slow spell on a shared box does not read as a regression.
+
+    python benchmarks/bench_suite.py                          # compare to baseline.json
+    python benchmarks/bench_suite.py --sizes 1000,10000,1000000 --out results.json
+    python benchmarks/bench_suite.py --save-baseline          # re-record on this machine
+
+Exits 1 when any benchmark is slower than the baseline by more than
+``--tolerance`` and by more than ``--min-delta`` seconds per operation (so
+sub-microsecond jitter is not reported).  ``--normalize`` judges each ratio
+against the suite's median instead, for a box known to be uniformly slower
+than when the baseline was recorded; it cannot catch a slowdown that hits
+everything.  Baselines are per machine: record one on the box the numbers
+are compared on.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+from primestate import store  # noqa: E402
+from primestate.links import clean_name, get_search_links  # noqa: E402
+from primestate.parser import parse_bulk_text  # noqa: E402
+from primestate.pdf import create_lor_pdf  # noqa: E402
+from synthetic import synthetic_leads, synthetic_names  # noqa: E402
+
+BASELINE = os.path.join(HERE, "baseline.json")
+
+
+def best_of(fn, repeat, number=1):
+    """Best seconds per call of ``fn`` over ``repeat`` runs of ``number`` calls."""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - t0) / number)
+    return min(times)
+
+
+def _record(lead, owner=""):
+    d = lead["data"]
+    return {
+        "Lead ID": lead["id"], "Date": d["date"], "County": d["county_key"].title(),
+        "Address": d["full_address"], "Case Number": d["case"], "Type": d["type"],
+        "Homeowner": owner, "Phone": "", "Email": "", "Status": "Processed", "Notes": d["desc"],
+    }
+
+
+def _fresh_handles():
+    store.get_lead_cache.cache_clear()
+    store.get_store.cache_clear()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BENCHMARKS
+# ═══════════════════════════════════════════════════════════════════════════════
+def bench_micro(results, repeat):
+    names = synthetic_names(1000)
+    results["clean_name"] = best_of(lambda: [clean_name(n) for n in names], repeat) / len(names)
+    results["get_search_links"] = best_of(
+        lambda: [get_search_links(n, "12 Main St", "Newark", "NJ", False) for n in names], repeat
+    ) / len(names)
+
+    counter = iter(range(10**9))
+
+    def miss():   # a new owner each call, so never cached
+        create_lor_pdf(f"Owner {next(counter)}", "12 Main St, Newark, NJ", "#1", "01/02/2026")
+
+    create_lor_pdf("Warm Owner", "12 Main St, Newark, NJ", "#1", "01/02/2026")
+    results["create_lor_pdf.miss"] = best_of(miss, repeat, number=20)
+    results["create_lor_pdf.hit"] = best_of(
+        lambda: create_lor_pdf("Warm Owner", "12 Main St, Newark, NJ", "#1", "01/02/2026"),
+        repeat, number=1000,
+    )
+
+
+def bench_size(results, size, repeat, workdir):
+    text = synthetic_leads(size, seed=size)
+    results[f"parse_bulk_text.{size}"] = best_of(lambda: parse_bulk_text(text), repeat) / size
+    leads = parse_bulk_text(text)
+    records = [_record(l) for l in leads]
+
+    path = os.path.join(workdir, f"bench_{size}.sqlite3")
+    _fresh_handles()
+    t0 = time.perf_counter()
+    for i in range(0, len(records), 5000):
+        store.get_lead_cache(path).save(records[i:i + 5000])
+    results[f"save_bulk.{size}"] = (time.perf_counter() - t0) / len(records)
+
+    def cold_load():
+        _fresh_handles()
+        store.load_database(path)
+
+    results[f"load_database.cold.{size}"] = best_of(cold_load, repeat)
+    store.load_database(path)
+    results[f"load_database.warm.{size}"] = best_of(lambda: store.load_database(path), repeat, number=500)
+
+    # one lead at a time, as saved from the workspace: 200 per round, best round
+    medians, p95s = [], []
+    for n in range(repeat):
+        samples = []
+        for lead in parse_bulk_text(synthetic_leads(200, seed=size + 1 + n)):
+            rec = _record(lead, owner="Jane Doe")
+            t0 = time.perf_counter()
+            store.save_to_database(rec, path)
+            samples.append(time.perf_counter() - t0)
+        medians.append(statistics.median(samples))
+        p95s.append(sorted(samples)[int(len(samples) * 0.95) - 1])
+    results[f"save_to_database.{size}"] = min(medians)
+    results[f"save_to_database.p95.{size}"] = min(p95s)
+    store.load_database(path)   # frame rebuilt after the saves
+    _fresh_handles()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# REPORTING
+# ═══════════════════════════════════════════════════════════════════════════════
+def _git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def _fmt(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.0f} ns"
+
+
+def compare(results, baseline, tolerance, min_delta=0.0, normalize=False):
+    """Print current vs baseline; return the names that regressed.
+
+    With ``normalize``, ratios are judged relative to the median ratio of the
+    whole suite (floored at 1), so only benchmarks slower than the rest flag.
+    """
+    regressed = []
+    shared = [name for name in results if baseline.get(name)]
+    box = 1.0
+    if normalize and shared:
+        box = max(1.0, statistics.median(results[n] / baseline[n] for n in shared))
+    print(f"{'benchmark':34s} {'current':>12s} {'baseline':>12s} {'ratio':>7s} {'allowed':>8s}")
+    for name, value in results.items():
+        base = baseline.get(name)
+        if base:
+            ratio, allowed = value / base, box * (1 + tolerance)
+            flag = "  REGRESSED" if ratio > allowed and value - base > min_delta else ""
+            if flag:
+                regressed.append(name)
+            print(f"{name:34s} {_fmt(value):>12s} {_fmt(base):>12s} {ratio:6.2f}x {allowed:6.2f}x{flag}")
+        else:
+            print(f"{name:34s} {_fmt(value):>12s} {'—':>12s}")
+    if normalize and shared:
+        print(f"\nwhole suite ran {box:.2f}x the baseline's times (median ratio, floored at 1)")
+    return regressed
+
+
+def run_round(sizes, repeat):
+    """Every benchmark once (each best of ``repeat``): ``{name: seconds}``."""
+    results = {}
+    bench_micro(results, repeat)
+    workdir = tempfile.mkdtemp(prefix="primestate-bench-")
+    try:
+        for size in sizes:
+            print(f"… {size:,} leads", file=sys.stderr, flush=True)
+            bench_size(results, size, repeat, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", default="1000,10000,100000",
+                    help="comma-separated lead counts (database sizes)")
+    ap.add_argument("--repeat", type=int, default=7)
+    ap.add_argument("--rounds", type=int, default=3,
+                    help="whole-suite passes, each in a fresh process; each benchmark keeps its best")
+    ap.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)   # one pass, JSON to stdout
+    ap.add_argument("--out", help="write results JSON here")
+    ap.add_argument("--baseline", default=BASELINE)
+    ap.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    ap.add_argument("--tolerance", type=float, default=0.3, help="allowed slowdown (0.3 = 30%%)")
+    ap.add_argument("--min-delta", type=float, default=1e-6,
+                    help="slowdowns smaller than this many seconds per operation are noise")
+    ap.add_argument("--normalize", action="store_true",
+                    help="judge each benchmark against the suite's median slowdown (misses uniform regressions)")
+    args = ap.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+
+    if args.worker:
+        json.dump(run_round(sizes, args.repeat), sys.stdout)
+        return
+
+    # Rounds run in separate processes: how fast a process runs a µs-scale
+    # call can differ by half from one process to the next (memory layout),
+    # and no number of repeats inside one process gets out of a slow one.
+    results = {}
+    for n in range(args.rounds):
+        print(f"… round {n + 1}/{args.rounds}", file=sys.stderr, flush=True)
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker",
+             "--sizes", args.sizes, "--repeat", str(args.repeat)],
+            stdout=subprocess.PIPE, text=True, check=True,
+        ).stdout
+        current = json.loads(out)
+        for name, value in current.items():
+            results[name] = min(value, results.get(name, value))
+
+    report = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "git": _git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "sizes": sizes,
+            "repeat": args.repeat,
+            "rounds": args.rounds,
+            "unit": "seconds per operation",
+        },
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"baseline written to {args.baseline}")
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    regressed = compare(results, baseline, args.tolerance, args.min_delta, args.normalize)
+    if regressed:
+        print(f"\n{len(regressed)} regression(s) over {args.tolerance:.0%}: {', '.join(regressed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Reproducible synthetic lead feeds in the exact dispatch-feed format.
+
+Each lead is two lines, as :func:`primestate.parser.parse_bulk_text` expects::
+
+    NJ | Essex | Newark | 123 Main Street | Fire | Structure Fire | #240117
+    01/15/2026 10:42 AM
+
+Counties and towns come from the normalisation tables; street names mix
+suffix spellings, directionals, units and casing the way real feeds do, and
+~1% of records are malformed (truncated header or missing date line).
+
+    python benchmarks/synthetic.py --leads 100000 > feed.txt
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from primestate.normalize import _MUNICIPALITIES, _SHARED_NAMES, NJ_COUNTIES  # noqa: E402
+
+TYPES = ["Fire", "Water", "Wind", "Smoke", "Hail", "Collapse", "Vehicle Into Structure"]
+DESCRIPTIONS = ["Structure", "Structure Fire", "Kitchen Fire", "Burst Pipe", "Roof Damage",
+                "Tree Down", "Basement Flood", "Chimney Fire", ""]
+STREETS = ["Main", "Elm", "Oak", "Maple", "Washington", "Park", "Broad", "Church", "Union",
+           "Highland", "Franklin", "Prospect", "Central", "Spruce", "Ridge", "Grove", "Lake",
+           "Hillside", "Mill", "Cedar", "2nd", "3rd", "Martin Luther King Jr"]
+SUFFIXES = ["St", "Street", "Ave", "Avenue", "Av", "Rd", "Road", "Dr", "Drive", "Ln", "Pl",
+            "Ct", "Blvd", "Ter", "Way", "Pkwy"]
+DIRECTIONS = ["", "", "", "", "N ", "S ", "E ", "W "]
+UNITS = ["", "", "", "", "", "", " Apt 2", " Unit 3B", " #4", " Fl 2"]
+NAMES = ["SMITH, JOHN", "GARCIA, MARIA", "O'BRIEN, PATRICK J", "NGUYEN, THI", "DOE, JANE",
+         "PATEL, RAJESH & PRIYA", "JOHNSON, MARY ELLEN", "VAN DER BERG, PIETER",
+         "ACME HOLDINGS LLC", "williams, robert", "Kowalski Anna"]
+
+FIRST_NAMES = ["John", "Mary", "Patrick", "Maria", "Jane", "Rajesh", "Priya", "Robert", "Anna",
+               "Michael", "Linda", "James", "Susan", "David", "Karen", "Joseph", "Nancy", "Thomas",
+               "Lisa", "Daniel", "Betty", "Carlos", "Rosa", "Wei", "Mei", "Ahmed", "Fatima", "Ivan",
+               "Olga", "Kevin", "Angela", "Luis", "Sofia", "Pieter", "Thi", "Anthony", "Donna"]
+LAST_NAMES = ["Smith", "Garcia", "O'Brien", "Nguyen", "Doe", "Patel", "Johnson", "Williams",
+              "Kowalski", "Van Der Berg", "Brown", "Jones", "Miller", "Davis", "Rodriguez", "Martinez",
+              "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Taylor", "Moore", "Jackson",
+              "Martin", "Lee", "Perez", "Thompson", "White", "Harris", "Sanchez", "Clark", "Ramirez",
+              "Lewis", "Robinson", "Walker", "Young", "Allen", "King", "Wright", "Scott", "Torres",
+              "Hill", "Flores", "Green", "Adams", "Nelson", "Baker", "Hall", "Rivera", "Campbell",
+              "Mitchell", "Carter", "Roberts", "Chen", "Kim", "Shah", "Cohen", "Russo", "Esposito"]
+
+_TOWNS = [(county.title(), town) for names in (_MUNICIPALITIES, _SHARED_NAMES)
+          for county, towns in names.items() for town in towns]
+_COUNTY_NAMES = [c.title() for c in NJ_COUNTIES]
+
+
+def _street(rnd):
+    return (f"{rnd.randint(1, 9999)} {rnd.choice(DIRECTIONS)}{rnd.choice(STREETS)} "
+            f"{rnd.choice(SUFFIXES)}{rnd.choice(UNITS)}")
+
+
+def synthetic_lead(rnd):
+    """One well-formed lead as ``(header_line, date_line)``."""
+    county, town = rnd.choice(_TOWNS) if rnd.random() < 0.9 else (rnd.choice(_COUNTY_NAMES), "Unlisted")
+    if rnd.random() < 0.1:
+        county = county.upper() + " County"
+    header = (f"NJ | {county} | {town} | {_street(rnd)} | {rnd.choice(TYPES)} | "
+              f"{rnd.choice(DESCRIPTIONS)} | #{rnd.randint(10000, 999999)}")
+    date = (f"{rnd.randint(1, 12):02d}/{rnd.randint(1, 28):02d}/2026 "
+            f"{rnd.randint(1, 12)}:{rnd.randint(0, 59):02d} {rnd.choice(['AM', 'PM'])}")
+    return header, date
+
+
+def iter_feed_lines(n_leads, seed=0, malformed=0.01):
+    """Lines for ``n_leads`` records (well-formed or not), deterministic per ``seed``."""
+    rnd = random.Random(seed)
+    for _ in range(n_leads):
+        header, date = synthetic_lead(rnd)
+        roll = rnd.random()
+        if roll < malformed / 2:
+            yield header.rsplit("|", 4)[0].rsplit("|", 1)[0]     # truncated header
+            yield date
+        elif roll < malformed:
+            yield header                                         # date line missing
+        else:
+            yield header
+            yield date
+
+
+def synthetic_leads(n_leads, seed=0, malformed=0.01):
+    """A feed of ``n_leads`` records as one string."""
+    return "\n".join(iter_feed_lines(n_leads, seed, malformed))
+
+
+def synthetic_names(n, seed=0):
+    rnd = random.Random(seed)
+    return [rnd.choice(NAMES) for _ in range(n)]
+
+
+def synthetic_owner(rnd):
+    """An owner name in one of the spellings tax records and adjusters use."""
+    first, last = rnd.choice(FIRST_NAMES), rnd.choice(LAST_NAMES)
+    initial = f" {rnd.choice('ABCDEJKMPRT')}" if rnd.random() < 0.2 else ""
+    style = rnd.random()
+    if style < 0.5:
+        return f"{last}, {first}{initial}".upper()       # tax-record style
+    if style < 0.8:
+        return f"{first}{initial} {last}"
+    return f"{last.lower()}, {first.lower()}"
+
+
+def misspell(name, rnd):
+    """``name`` with one letter dropped, doubled or swapped with its neighbour."""
+    i = rnd.randrange(1, max(2, len(name) - 1))
+    edit = rnd.random()
+    if edit < 0.4:
+        return name[:i] + name[i + 1:]
+    if edit < 0.7:
+        return name[:i] + name[i] + name[i:]
+    return name[:i - 1] + name[i] + name[i - 1] + name[i + 1:]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--leads", type=int, default=1000)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    out = sys.stdout
+    for line in iter_feed_lines(args.leads, args.seed):
+        out.write(line + "\n")
+
+
+if __name__ == "__main__":
+    main()
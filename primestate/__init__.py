@@ -0,0 +1,70 @@
+"""Headless core of the Primestate lead dashboard.
+
+Parsing, de-duplication, the SQLite lead store, the shared work queue and
+LOR rendering live here with no Streamlit dependency, so scripts and worker
+processes can use them directly; ``app.py`` is a thin UI on top.
+
+Importing the package is cheap: submodules load on first attribute access,
+and pandas / fpdf / pyarrow are only imported by the functions that need them
+(``benchmarks/bench_import.py`` holds the import-time budget).
+"""
+import importlib
+
+# public name -> submodule it lives in
+_EXPORTS = {
+    "CO": "company",
+    "parse_bulk_text": "parser",
+    "iter_leads": "parser",
+    "parse_frame": "parser",
+    "ParseStats": "parser",
+    "create_lor_pdf": "pdf",
+    "render_lor_pdf": "pdf",
+    "render_lor_zip": "batch",
+    "lead_messages": "outreach",
+    "write_outreach": "outreach",
+    "LeadStore": "store",
+    "LeadCache": "store",
+    "get_store": "store",
+    "get_lead_cache": "store",
+    "load_database": "store",
+    "save_to_database": "store",
+    "WorkQueue": "work_queue",
+    "get_work_queue": "work_queue",
+    "QueueIndex": "work_queue",
+    "get_queue_index": "work_queue",
+    "LeadArchive": "archive",
+    "get_archive": "archive",
+    "move_to_archive": "archive",
+    "DedupeIndex": "dedupe",
+    "ClaimantIndex": "claimants",
+    "get_claimant_index": "claimants",
+    "geocode": "geo",
+    "CanvassIndex": "geo",
+    "get_canvass_index": "geo",
+    "get_dedupe_index": "dedupe",
+    "LeadStats": "analytics",
+    "get_lead_stats": "analytics",
+    "Enricher": "enrich",
+    "get_enricher": "enrich",
+    "get_enrich_cache": "enrich",
+    "JobRunner": "jobs",
+    "get_job_runner": "jobs",
+    "metrics": "instrument",
+    "timed": "instrument",
+    "Run": "instrument",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,144 @@
+"""Pipeline analytics kept current from the lead cache's change feed.
+
+Counts by county, loss type, status and week of loss (plus county x status)
+are built once from the cached rows and then adjusted per patched row: the
+replaced row's keys are decremented and the new row's incremented.  Reading
+them never touches the table, so the sidebar costs the same at 100 leads or
+1,000,000.
+
+Archived leads count too, so the funnel does not drop after an archive run:
+the archive's totals are read once (one grouped scan of four columns) and a
+lead leaving the store, which only happens when it is archived, keeps its
+counts.
+"""
+import threading
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
+
+from .archive import get_archive
+from .store import COLUMNS, PIPELINE, STORE_FILE, get_lead_cache, per_path
+
+_COUNTY = COLUMNS.index("County")
+_TYPE = COLUMNS.index("Type")
+_STATUS = COLUMNS.index("Status")
+_DATE = COLUMNS.index("Date")
+
+UNKNOWN = "Unknown"
+DIMENSIONS = ("county", "type", "status", "week")
+
+
+@lru_cache(maxsize=4096)
+def loss_week(date):
+    """ISO week (``2026-W03``) of an ``MM/DD/YYYY`` loss date."""
+    try:
+        year, week, _ = datetime.strptime(str(date)[:10], "%m/%d/%Y").isocalendar()
+    except ValueError:
+        return UNKNOWN
+    return f"{year}-W{week:02d}"
+
+
+def _label(value):
+    value = str(value).strip() if value is not None else ""
+    return value or UNKNOWN
+
+
+class LeadStats:
+    """Incrementally maintained aggregates over saved and archived leads."""
+
+    def __init__(self, cache, archive=None):
+        self._lock = threading.Lock()
+        self.total = 0
+        self.archived = 0
+        self.counts = {dim: Counter() for dim in DIMENSIONS}
+        self.county_status = Counter()
+        if archive is not None:
+            columns = ["County", "Type", "Status", "Date"]
+            row = [None] * len(COLUMNS)
+            for values, n in archive.tally(columns).items():
+                for col, value in zip(columns, values):
+                    row[COLUMNS.index(col)] = value
+                self._bump(row, n)
+                self.archived += n
+        cache.subscribe(self._apply)
+        self._cache = cache
+
+    def _keys(self, row):
+        county = _label(row[_COUNTY]).title()
+        status = _label(row[_STATUS])
+        return {
+            "county": county,
+            "type": _label(row[_TYPE]).title(),
+            "status": status,
+            "week": loss_week(row[_DATE]) if row[_DATE] else UNKNOWN,
+        }, (county, status)
+
+    def _bump(self, row, step):
+        keys, pair = self._keys(row)
+        for dim, key in keys.items():
+            counter = self.counts[dim]
+            counter[key] += step
+            if not counter[key]:
+                del counter[key]
+        self.county_status[pair] += step
+        if not self.county_status[pair]:
+            del self.county_status[pair]
+        self.total += step
+
+    def _apply(self, rows, previous):
+        with self._lock:
+            for row, old in zip(rows, previous):
+                if row is None:
+                    # removed from the store = moved to the archive: still counted
+                    self.archived += old is not None
+                    continue
+                if old is not None:
+                    self._bump(old, -1)
+                self._bump(row, 1)
+
+    # ── reads ───────────────────────────────────────────────────────────────
+    def refresh(self):
+        self._cache.refresh()
+
+    def breakdown(self, dim):
+        """``[(key, count), …]`` for one of ``DIMENSIONS``, largest first (weeks by date)."""
+        self.refresh()
+        with self._lock:
+            items = list(self.counts[dim].items())
+        if dim == "week":
+            return sorted(items, key=lambda kv: (kv[0] != UNKNOWN, kv[0]), reverse=True)
+        return sorted(items, key=lambda kv: (-kv[1], kv[0]))
+
+    def funnel(self):
+        """``[(stage, reached, rate), …]`` along ``PIPELINE``.
+
+        ``reached`` counts leads at that stage or any later one; ``rate`` is
+        that as a share of leads that reached Processed.
+        """
+        self.refresh()
+        with self._lock:
+            at = [self.counts["status"].get(stage, 0) for stage in PIPELINE]
+        reached = [sum(at[i:]) for i in range(len(at))]
+        base = reached[0]
+        return [(stage, n, n / base if base else 0.0) for stage, n in zip(PIPELINE, reached)]
+
+    def summary(self):
+        """Everything as plain dicts, e.g. for JSON or a weekly report."""
+        self.refresh()
+        with self._lock:
+            out = {"total": self.total, "archived": self.archived}
+            out.update({dim: dict(self.counts[dim]) for dim in DIMENSIONS})
+            pairs = list(self.county_status.items())
+        by_county = {}
+        for (county, status), n in pairs:
+            by_county.setdefault(county, {})[status] = n
+        out["county_status"] = by_county
+        out["funnel"] = [
+            {"stage": stage, "reached": n, "rate": round(rate, 4)} for stage, n, rate in self.funnel()
+        ]
+        return out
+
+
+@per_path
+def get_lead_stats(path=STORE_FILE):
+    return LeadStats(get_lead_cache(path), get_archive(path))
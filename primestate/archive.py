@@ -0,0 +1,300 @@
+"""Month/county-partitioned Parquet archive for closed and old leads.
+
+The SQLite store is the working set.  :func:`move_to_archive` moves leads that
+were closed a while ago, or whose loss date is long past, into a Hive-style
+tree of Parquet files next to it::
+
+    Primestate_Leads.sqlite3-archive/month=2025-03/county=Essex/part-….parquet
+
+so the store, the process-wide cache and everything subscribed to it stay
+small.  :meth:`LeadArchive.query` picks the month and county directories it
+can touch from their names alone, then hands the filters to pyarrow, which
+skips row groups by their min/max statistics and reads only the columns
+asked for.
+
+Every move adds part files; :meth:`LeadArchive.compact` merges each
+partition's parts into one file sorted by loss date and drops leads that
+were archived twice (keeping the latest copy).  pyarrow is imported on
+first use.
+"""
+import os
+import re
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from urllib.parse import unquote
+
+from .instrument import timed
+from .store import COLUMNS, STORE_FILE, per_path
+
+CLOSED_DAYS = 30     # Closed leads untouched this long are archived
+STALE_DAYS = 365     # any lead whose loss is older than this is archived
+CHUNK = 20000        # leads moved per store transaction
+
+UNKNOWN = "Unknown"
+_DATE, _COUNTY = COLUMNS.index("Date"), COLUMNS.index("County")
+_US_DATE = re.compile(r"(\d\d)/(\d\d)/(\d{4})")
+_ISO_MONTH = re.compile(r"\d{4}-\d\d")
+
+# stored next to COLUMNS in every file; the partition keys live in the path
+EXTRA = ["loss_date", "archived_at"]
+PARTITIONS = ["month", "county"]
+
+
+def loss_date(value):
+    """ISO loss date for a feed ``MM/DD/YYYY`` date (as the store indexes it)."""
+    value = str(value or "")
+    m = _US_DATE.match(value)
+    return f"{m[3]}-{m[1]}-{m[2]}" if m else value
+
+
+def partition(row):
+    """``(month, county)`` partition of a ``COLUMNS`` row."""
+    loss = loss_date(row[_DATE])
+    month = loss[:7] if _ISO_MONTH.match(loss) else UNKNOWN
+    return month, county_key(row[_COUNTY])
+
+
+def county_key(county):
+    return str(county or "").strip().title() or UNKNOWN
+
+
+class LeadArchive:
+    """Read/append/compact handle on one archive directory."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def exists(self):
+        return os.path.isdir(self.directory)
+
+    @staticmethod
+    def _schema(partitions=False):
+        """Arrow schema of a part file (``partitions=True`` adds month and county)."""
+        import pyarrow as pa
+
+        names = COLUMNS + EXTRA + (PARTITIONS if partitions else [])
+        return pa.schema([(c, pa.string()) for c in names])
+
+    @staticmethod
+    def _partitioning():
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        return ds.partitioning(pa.schema([(c, pa.string()) for c in PARTITIONS]), flavor="hive")
+
+    # ── writes ──────────────────────────────────────────────────────────────
+    @timed("archive.append")
+    def append(self, rows):
+        """Write ``COLUMNS`` rows as new part files, one per partition they touch.
+
+        Returns the number of partitions written.
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        rows = sorted(rows, key=lambda r: loss_date(r[_DATE]))
+        if not rows:
+            return 0
+        stamp = datetime.now().isoformat(timespec="seconds")
+        cols = {c: [None if r[i] is None else str(r[i]) for r in rows] for i, c in enumerate(COLUMNS)}
+        cols["loss_date"] = [loss_date(r[_DATE]) or None for r in rows]
+        cols["archived_at"] = [stamp] * len(rows)
+        parts = [partition(r) for r in rows]
+        cols["month"] = [p[0] for p in parts]
+        cols["county"] = [p[1] for p in parts]
+        table = pa.table(cols, schema=self._schema(partitions=True))
+        ds.write_dataset(
+            table, self.directory, format="parquet", partitioning=self._partitioning(),
+            basename_template=f"part-{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+        )
+        return len(set(parts))
+
+    def _partitions(self):
+        """``{partition directory: [part files]}``."""
+        found = {}
+        for root, _, files in os.walk(self.directory):
+            parts = sorted(f for f in files if f.endswith(".parquet"))
+            if parts:
+                found[root] = [os.path.join(root, f) for f in parts]
+        return found
+
+    @timed("archive.compact")
+    def compact(self):
+        """Merge each partition's part files into one; returns ``(partitions, rows_dropped)``.
+
+        The merged file is sorted by loss date, so row-group statistics prune
+        date ranges well, and keeps one copy per Lead ID (the most recently
+        archived).  It is written under a temporary name and renamed before
+        the old parts are deleted, so a crash at worst leaves duplicates that
+        the next compaction removes.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        merged = dropped = 0
+        for directory, files in self._partitions().items():
+            if len(files) < 2:
+                continue
+            table = pa.concat_tables(pq.read_table(f, schema=self._schema()) for f in files)
+            table = table.sort_by("archived_at")
+            latest = {lead_id: i for i, lead_id in enumerate(table["Lead ID"].to_pylist())}
+            table = table.take(sorted(latest.values()))
+            table = table.sort_by([("loss_date", "ascending"), ("Lead ID", "ascending")])
+            dropped += sum(pq.ParquetFile(f).metadata.num_rows for f in files) - table.num_rows
+            tmp = os.path.join(directory, f"_compact-{uuid.uuid4().hex[:8]}.tmp")
+            pq.write_table(table, tmp, compression="zstd")
+            # unique like append's names: a second compaction within the same
+            # second must not replace the part it is about to delete
+            name = f"part-{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}-c.parquet"
+            target = os.path.join(directory, name)
+            os.replace(tmp, target)
+            for f in files:
+                if f != target:
+                    os.remove(f)
+            merged += 1
+        return merged, dropped
+
+    # ── reads ───────────────────────────────────────────────────────────────
+    def _files(self, county=None, date_from=None, date_to=None):
+        """Part files of the partitions a query can touch, found without listing the rest."""
+        low, high = str(date_from or "")[:7], str(date_to or "")[:7]
+        county = county_key(county) if county else None
+        files = []
+        for month in os.scandir(self.directory):
+            value = unquote(month.name.partition("=")[2])
+            if not month.is_dir() or (low and value < low) or (high and value > high):
+                continue
+            for place in os.scandir(month.path):
+                if not place.is_dir() or (county and unquote(place.name.partition("=")[2]) != county):
+                    continue
+                files += [f.path for f in os.scandir(place.path) if f.name.endswith(".parquet")]
+        return files
+
+    def _dataset(self, county=None, date_from=None, date_to=None):
+        import pyarrow.dataset as ds
+
+        return ds.dataset(self._files(county, date_from, date_to), format="parquet",
+                          schema=self._schema(partitions=True), partitioning=self._partitioning(),
+                          partition_base_dir=self.directory)
+
+    def _filter(self, county=None, status=None, date_from=None, date_to=None, text=None):
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+
+        # month/county terms prune directories, the rest prune row groups
+        terms = []
+        if county:
+            terms.append(ds.field("county") == county_key(county))
+        if date_from:
+            terms += [ds.field("month") >= str(date_from)[:7], ds.field("loss_date") >= str(date_from)]
+        if date_to:
+            terms += [ds.field("month") <= str(date_to)[:7], ds.field("loss_date") <= str(date_to)]
+        if status:
+            terms.append(ds.field("Status") == status)
+        text = (text or "").strip()
+        if text:
+            a, b, c = (pc.match_substring(ds.field(col), text, ignore_case=True)
+                       for col in ("Homeowner", "Address", "Case Number"))
+            terms.append(a | b | c)
+        expr = None
+        for term in terms:
+            expr = term if expr is None else expr & term
+        return expr
+
+    @timed("archive.query")
+    def query(self, columns=None, county=None, status=None, date_from=None, date_to=None,
+              text=None):
+        """Archived leads matching the filters as a DataFrame of ``columns`` (default all).
+
+        The filters mean what they do in :meth:`LeadStore.query`: dates are
+        ``datetime.date`` or ISO strings bounding the loss date inclusively,
+        ``text`` is a case-insensitive substring of Homeowner, Address or
+        Case Number::
+
+            archive.query(["Homeowner", "Phone"], county="Essex",
+                          date_from="2025-01-01", date_to="2025-12-31")
+        """
+        import pandas as pd
+
+        columns = list(columns or COLUMNS)
+        if not self.exists():
+            return pd.DataFrame(columns=columns)
+        table = self._dataset(county, date_from, date_to).to_table(
+            columns=columns, filter=self._filter(county, status, date_from, date_to, text)
+        )
+        return table.to_pandas()
+
+    def count(self, county=None, status=None, date_from=None, date_to=None, text=None):
+        """Number of archived leads matching the filters (from file metadata where it can)."""
+        if not self.exists():
+            return 0
+        return self._dataset(county, date_from, date_to).count_rows(
+            filter=self._filter(county, status, date_from, date_to, text)
+        )
+
+    def tally(self, columns):
+        """``{(value, …): leads}`` over every archived lead, grouped by ``columns``."""
+        if not self.exists():
+            return {}
+        table = self._dataset().to_table(columns=columns)
+        grouped = table.group_by(columns).aggregate([([], "count_all")])
+        groups = zip(*(grouped[c].to_pylist() for c in columns))
+        return dict(zip(groups, grouped["count_all"].to_pylist()))
+
+    def keys(self):
+        """``(Lead ID, Case Number, Address)`` of every archived lead, for de-duplication."""
+        if not self.exists():
+            return []
+        table = self._dataset().to_table(columns=["Lead ID", "Case Number", "Address"])
+        return zip(*(table[c].to_pylist() for c in table.column_names))
+
+    def summary(self):
+        """Partitions, part files, rows and bytes on disk."""
+        files = [f for parts in self._partitions().values() for f in parts]
+        if not files:
+            return {"partitions": 0, "files": 0, "leads": 0, "bytes": 0}
+        import pyarrow.parquet as pq
+
+        return {
+            "partitions": len(self._partitions()),
+            "files": len(files),
+            "leads": sum(pq.ParquetFile(f).metadata.num_rows for f in files),
+            "bytes": sum(os.path.getsize(f) for f in files),
+        }
+
+
+def move_to_archive(store, archive, closed_days=CLOSED_DAYS, stale_days=STALE_DAYS,
+                  compact=True, progress=None):
+    """Move Closed-and-idle and long-past leads from ``store`` into ``archive``.
+
+    Each chunk is written to Parquet inside the store transaction that
+    deletes it, so a lead is never in neither place.  ``progress(done,
+    total)`` is called after each chunk.  Returns counts for a report.
+    """
+    today = date.today()
+    ids = store.archivable(
+        closed_before=(today - timedelta(days=closed_days)).isoformat() if closed_days is not None else None,
+        loss_before=(today - timedelta(days=stale_days)).isoformat() if stale_days is not None else None,
+    )
+    moved = partitions = 0
+    for i in range(0, len(ids), CHUNK):
+        if progress:
+            progress(i, len(ids))
+        with store.removing(ids[i:i + CHUNK]) as rows:
+            partitions += archive.append(rows)
+        moved += len(rows)
+    if progress:
+        progress(len(ids), len(ids))
+    result = {"archived": moved, "partitions_written": partitions}
+    if compact:
+        result["partitions_compacted"], result["duplicates_dropped"] = archive.compact()
+    return result
+
+
+@per_path
+def get_archive(path=STORE_FILE):
+    """The archive kept beside the store at ``path``."""
+    return LeadArchive(f"{path}-archive")
@@ -0,0 +1,184 @@
+"""Batch Letter of Representation rendering into a single ZIP.
+
+fpdf layout is pure Python and holds the GIL, so letters are rendered in a
+``ProcessPoolExecutor``.  Leads are shipped to workers in chunks to keep IPC
+overhead low, and results are written into the archive as they complete.
+"""
+import io
+import multiprocessing
+import os
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+
+from .pdf import render_lor_pdf
+
+# Below this many letters the pool's start-up cost outweighs the speed-up.
+INLINE_LIMIT = 24
+
+
+@dataclass
+class BatchStats:
+    letters: int = 0
+    workers: int = 1
+    seconds: float = 0.0
+    skipped: int = 0                              # jobs that failed to render
+    errors: list = field(default_factory=list)    # first few of their errors
+
+    @property
+    def per_sec(self):
+        return self.letters / self.seconds if self.seconds else 0.0
+
+    @property
+    def per_sec_per_core(self):
+        return self.per_sec / self.workers
+
+
+def lor_filename(case_num, owner_name):
+    return f"LOR_{case_num}_{owner_name.replace(' ', '_')}.pdf"
+
+
+def batch_leads(queue, saved):
+    """Collect letter inputs from queued leads and saved records with an owner.
+
+    ``queue`` is anything whose ``items()`` yields ``(lead_id, lead)`` pairs
+    (``owner`` is set once typed in Step 1); ``saved`` is an iterable of
+    ``COLUMNS``-keyed records.  Leads that are both queued and saved are
+    rendered once, from the saved record.
+    """
+    jobs = {}
+    for lid, lead in queue.items():
+        if lead.get("owner"):
+            jobs[lid] = (lead["owner"], lead["full_address"], lead["case"], lead.get("date", ""))
+    for rec in saved:
+        if rec.get("Homeowner"):
+            jobs[rec["Lead ID"]] = (
+                rec["Homeowner"], rec["Address"] or "", rec["Case Number"] or "", rec["Date"] or "",
+            )
+    return list(jobs.values())
+
+
+def _render_chunk(chunk, print_date):
+    return [
+        (lor_filename(case, owner), render_lor_pdf(owner, address, case, loss_date, print_date))
+        for owner, address, case, loss_date in chunk
+    ]
+
+
+def write_lor_zip(jobs, target, workers=None, chunk_size=16, progress=None, render=_render_chunk,
+                  total=None):
+    """Render ``(owner, address, case, loss_date)`` jobs into a ZIP at ``target``.
+
+    ``target`` is a path or writable binary file.  At most a few chunks per
+    worker are in flight, so memory stays flat however many letters there
+    are.  ``progress(done, total)`` is called as chunks complete.  Returns
+    :class:`BatchStats`.
+
+    A letter that fails to render (say, an owner name fpdf cannot encode) is
+    left out of the ZIP and counted in ``skipped`` rather than aborting the
+    batch: a failed chunk is rendered again one job at a time to find it.  If
+    a worker process dies (killed, out of memory), the pool is abandoned and
+    the rest of the chunks are rendered in this process.
+
+    ``render(chunk, print_date)`` turns a chunk of jobs into ``(file name,
+    bytes)`` pairs; pass a module-level function (worker processes import it)
+    to package something other than bare letters, e.g. emails with the
+    letter attached.  With ``total`` given, ``jobs`` may be a generator and
+    is consumed as chunks are handed out rather than listed up front.
+    """
+    if total is None:
+        jobs = list(jobs)
+        total = len(jobs)
+    print_date = datetime.today().strftime("%B %d, %Y")
+    workers = workers or os.cpu_count() or 1
+    if total <= INLINE_LIMIT:
+        workers = 1
+    jobs = iter(jobs)
+    chunks = iter(lambda: list(islice(jobs, chunk_size)), [])
+
+    seen = set()
+    done = 0
+    stats = BatchStats(workers=workers)
+    t0 = time.perf_counter()
+    # PDF streams are already deflated; storing avoids compressing them twice.
+    with zipfile.ZipFile(target, "w", zipfile.ZIP_STORED) as zf:
+
+        def write(results):
+            nonlocal done
+            for name, data in results:
+                (stem, ext), n = os.path.splitext(name), 1
+                while name in seen:
+                    n += 1
+                    name = f"{stem}_{n}{ext}"
+                seen.add(name)
+                zf.writestr(name, data)
+            stats.letters += len(results)
+            done += len(results)
+            if progress:
+                progress(done, total)
+
+        def write_one_by_one(chunk):
+            nonlocal done
+            for job in chunk:
+                try:
+                    results = render([job], print_date)
+                except Exception as exc:
+                    stats.skipped += 1
+                    done += 1
+                    if len(stats.errors) < 20:
+                        stats.errors.append(f"{job[2] or job[0]}: {exc}")
+                    if progress:
+                        progress(done, total)
+                else:
+                    write(results)
+
+        def inline(chunk):
+            try:
+                results = render(chunk, print_date)
+            except Exception:
+                write_one_by_one(chunk)
+            else:
+                write(results)
+
+        def collect(fut, chunk):
+            try:
+                results = fut.result()
+            except BrokenProcessPool:
+                inline(chunk)
+            except Exception:
+                write_one_by_one(chunk)
+            else:
+                write(results)
+
+        if workers > 1:
+            # spawn, not fork: the Streamlit server process is multi-threaded
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+                pending = {}
+                try:
+                    for chunk in chunks:
+                        pending[pool.submit(render, chunk, print_date)] = chunk
+                        if len(pending) >= workers * 4:
+                            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                            for fut in finished:
+                                collect(fut, pending.pop(fut))
+                except BrokenProcessPool:
+                    inline(chunk)       # the chunk that could not be submitted
+                for fut in as_completed(pending):
+                    collect(fut, pending[fut])
+        for chunk in chunks:    # every chunk with one worker; what is left if the pool broke
+            inline(chunk)
+
+    stats.seconds = time.perf_counter() - t0
+    return stats
+
+
+def render_lor_zip(jobs, workers=None, chunk_size=16, progress=None):
+    """In-memory :func:`write_lor_zip`; returns ``(zip_bytes, BatchStats)``."""
+    buf = io.BytesIO()
+    stats = write_lor_zip(jobs, buf, workers=workers, chunk_size=chunk_size, progress=progress)
+    return buf.getvalue(), stats
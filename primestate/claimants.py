@@ -0,0 +1,205 @@
+"""Fuzzy owner-name and address index for spotting repeat claimants.
+
+:class:`ClaimantIndex` keeps trigram postings (pg_trgm style: each word
+padded as ``"  john "``) over the Homeowner of every saved lead, plus the
+archived ones, so ``"DOE, JOHN"``, ``"John Doe"`` and ``"Jon Doe"`` all find
+each other and their phone / email can be reused.  Word order does not
+matter, since a name's trigrams are a set.  Addresses are bucketed by house
+number and only compared within the query's bucket.
+
+The index is built once from the process-wide
+:class:`~primestate.store.LeadCache` and patched from its change feed: a
+save only moves the buckets that changed.  A name lookup walks the postings
+of the query's trigrams alone, counting shared trigrams per distinct name,
+and scores each candidate by Jaccard similarity, so it costs about the same
+whether the database holds a thousand leads or a million.
+"""
+import re
+import threading
+from array import array
+from collections import Counter
+from functools import lru_cache
+
+from .archive import get_archive
+from .normalize import address_key
+from .store import COLUMNS, STORE_FILE, get_lead_cache, per_path
+
+LIMIT = 5
+# Similarity (shared / union of trigrams) a match needs on either field.
+# Addresses must also have the same house number: "12 Main St" and
+# "14 Main St" share most of their trigrams but are different houses.
+MIN_SCORE = {"name": 0.4, "address": 0.6}
+
+_ID, _OWNER, _ADDRESS = (COLUMNS.index(c) for c in ("Lead ID", "Homeowner", "Address"))
+_WORD = re.compile(r"[a-z0-9]+")
+# titles, suffixes and joiners that say nothing about who the owner is
+_NAME_NOISE = {"and", "mr", "mrs", "ms", "dr", "jr", "sr", "ii", "iii", "iv", "etal", "et", "al"}
+
+
+@lru_cache(maxsize=65536)
+def name_key(name):
+    """Owner name as sorted lower-case words: ``"DOE, JOHN J"`` -> ``"doe john"``.
+
+    Initials, titles and suffixes are dropped; ``"O'Brien"`` is one word.
+    """
+    words = _WORD.findall(str(name or "").lower().replace("'", ""))
+    return " ".join(sorted(w for w in words if len(w) > 1 and w not in _NAME_NOISE))
+
+
+@lru_cache(maxsize=65536)
+def trigrams(key):
+    """Trigrams of each word of ``key``, padded two spaces in front and one behind."""
+    grams = set()
+    for word in key.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def _house(key):
+    """House number of an address key (``""`` if it does not start with one)."""
+    first = key.split(" ", 1)[0]
+    return first if first[:1].isdigit() else ""
+
+
+def _similarity(a, b):
+    """Jaccard similarity of two trigram sets."""
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared) if shared else 0.0
+
+
+class ClaimantIndex:
+    """Trigram index over saved and archived leads' owner names and addresses."""
+
+    def __init__(self, cache, archive=None):
+        self._lock = threading.Lock()
+        self._doc = {}                     # Lead ID -> document number
+        self._rows = []                    # document -> latest COLUMNS row
+        self._names = {}                   # owner name key -> documents
+        self._postings = {}                # trigram -> owner name keys
+        self._houses = {}                  # house number -> documents
+        if archive is not None and archive.exists():
+            self._apply(archive.query(COLUMNS).itertuples(index=False, name=None), ())
+        cache.subscribe(self._apply)
+        self._cache = cache
+
+    def _apply(self, rows, previous):
+        with self._lock:
+            for row in rows:
+                if row is not None:    # a removed lead went to the archive: still a prior claim
+                    self._put(row)
+
+    @staticmethod
+    def _move(buckets, doc, old, new):
+        """Move ``doc`` from bucket ``old`` to ``new``; returns (emptied, created)."""
+        emptied = created = False
+        if old is not None:
+            docs = buckets[old]
+            docs.remove(doc)
+            if not docs:
+                del buckets[old]
+                emptied = True
+        docs = buckets.get(new)
+        if docs is None:
+            docs = buckets[new] = array("I")
+            created = True
+        docs.append(doc)
+        return emptied, created
+
+    def _put(self, row):
+        doc = self._doc.get(row[_ID])
+        if doc is None:
+            doc = self._doc[row[_ID]] = len(self._rows)
+            self._rows.append(row)
+            name = house = None
+        else:
+            old = self._rows[doc]
+            self._rows[doc] = row
+            name, house = name_key(old[_OWNER]), _house(address_key(old[_ADDRESS] or ""))
+        new_name, new_house = name_key(row[_OWNER]), _house(address_key(row[_ADDRESS] or ""))
+        if new_name != name:
+            # the trigram postings hold distinct names, so only a first or last
+            # lead with a name touches them
+            emptied, created = self._move(self._names, doc, name, new_name)
+            if emptied:
+                for gram in trigrams(name):
+                    keys = self._postings[gram]
+                    keys.discard(name)
+                    if not keys:
+                        del self._postings[gram]
+            if created:
+                for gram in trigrams(new_name):
+                    self._postings.setdefault(gram, set()).add(new_name)
+        if new_house != house:
+            self._move(self._houses, doc, house, new_house)
+
+    def __len__(self):
+        self._cache.refresh()
+        return len(self._rows)
+
+    def _name_scores(self, key):
+        """``{document: similarity}`` for owner names at or above ``MIN_SCORE``."""
+        grams = trigrams(key)
+        n, least = len(grams), MIN_SCORE["name"]
+        shared = Counter()
+        for gram in grams:
+            keys = self._postings.get(gram)
+            if keys is not None:
+                shared.update(keys)
+        scores = {}
+        for name, s in shared.items():
+            # s / (n + size - s) >= least needs s >= least * n, a cheap first cut
+            if s >= least * n:
+                score = s / (n + len(trigrams(name)) - s)
+                if score >= least:
+                    scores.update(dict.fromkeys(self._names[name], score))
+        return scores
+
+    def _address_score(self, doc, grams, house):
+        key = address_key(self._rows[doc][_ADDRESS] or "")
+        return _similarity(grams, trigrams(key)) if _house(key) == house else 0.0
+
+    def _address_scores(self, key):
+        """``{document: similarity}`` for addresses with the same house number."""
+        grams, house = trigrams(key), _house(key)
+        scores = {doc: self._address_score(doc, grams, house) for doc in self._houses.get(house, ())}
+        return {doc: score for doc, score in scores.items() if score >= MIN_SCORE["address"]}
+
+    def search(self, name="", address="", limit=LIMIT, exclude=()):
+        """Leads whose owner or address resembles ``name`` / ``address``, best first.
+
+        Each result is the lead as a ``COLUMNS``-keyed dict plus
+        ``name_score`` and ``address_score`` (0–1).  A lead needs
+        ``MIN_SCORE`` on at least one field; ranking is by its better score,
+        then the other.  Lead IDs in ``exclude`` are skipped.
+        """
+        self._cache.refresh()
+        name, address = name_key(name), address_key(address or "")
+        with self._lock:
+            by_name = self._name_scores(name) if name else {}
+            by_address = self._address_scores(address) if address else {}
+            skip = {self._doc.get(lead_id) for lead_id in exclude}
+            results = []
+            for doc in by_name.keys() | by_address.keys():
+                if doc in skip:
+                    continue
+                # the field that did not qualify still counts towards the ranking
+                score = {
+                    "name": by_name[doc] if doc in by_name else
+                    _similarity(trigrams(name), trigrams(name_key(self._rows[doc][_OWNER]))),
+                    "address": by_address[doc] if doc in by_address else
+                    self._address_score(doc, trigrams(address), _house(address)) if address else 0.0,
+                }
+                results.append((max(score.values()), min(score.values()), doc, score))
+            results.sort(key=lambda r: (-r[0], -r[1], r[2]))
+            out = []
+            for _, _, doc, score in results[:limit]:
+                record = dict(zip(COLUMNS, self._rows[doc]))
+                record["name_score"], record["address_score"] = score["name"], score["address"]
+                out.append(record)
+        return out
+
+
+@per_path
+def get_claimant_index(path=STORE_FILE):
+    return ClaimantIndex(get_lead_cache(path), get_archive(path))
@@ -0,0 +1,455 @@
+"""Headless entry point for nightly feeds: ``python -m primestate``.
+
+    python -m primestate ingest feed.txt more.txt.gz      # parse → dedupe → save
+    zcat feed.txt.gz | python -m primestate ingest -      # from stdin
+    python -m primestate ingest feed.txt --queue          # hand to adjusters instead
+    python -m primestate ingest feed.txt --enrich lookups.json   # fill owner/contact
+    python -m primestate ingest feed.txt --enrich lookups.json --letters lors.zip   # ... → LORs
+    python -m primestate letters lors.zip --workers 4     # LOR for every owner on file
+    python -m primestate outreach storm.csv               # SMS / email text, ready leads
+    python -m primestate outreach drafts.zip --format eml # .eml drafts with the LOR attached
+    python -m primestate canvass routes.csv --miles 1.5   # per-day clusters in driving order
+    python -m primestate export leads.xlsx
+    python -m primestate archive --vacuum                # closed / old leads -> Parquet
+    python -m primestate history --county Essex --from 2025-01-01 --to 2025-12-31 \
+        --columns Homeowner,Phone --output essex-2025.csv
+    python -m primestate --json stats                     # counts by county/type/status/week
+
+Input is streamed line by line and written in ``--chunk-size`` batches
+straight to the store; saved leads are never loaded, only their
+de-duplication keys (Lead ID, case number, address), so memory is one chunk
+plus those keys however long the feed (with ``--letters``, plus the four
+letter fields of each written lead that has an owner).  Each command ends with per-stage
+counts and timings (``--json`` for machine-readable output).
+"""
+import argparse
+import csv
+import gzip
+import json
+import sys
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+from .archive import CLOSED_DAYS, STALE_DAYS, get_archive, move_to_archive
+from .batch import batch_leads, write_lor_zip
+from .dedupe import DedupeIndex
+from .geo import CLUSTER_MILES, get_canvass_index, miles
+from .links import clean_name
+from .outreach import FORMATS, READY_STATUSES, ready_leads, write_outreach
+from .parser import ParseStats, iter_leads
+from .store import PIPELINE, STORE_FILE, get_lead_cache, get_store
+from .work_queue import get_work_queue
+
+
+class Timings:
+    """Wall time and item counts per pipeline stage."""
+
+    def __init__(self):
+        self.seconds, self.counts = {}, {}
+
+    @contextmanager
+    def stage(self, name, count=0):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0, count)
+
+    def add(self, name, seconds, count=0):
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + count
+
+    def timed(self, name, iterable):
+        """Yield from ``iterable``, charging the time spent producing items to ``name``."""
+        it = iter(iterable)
+        while True:
+            t0 = time.perf_counter()
+            try:
+                item = next(it)
+            except StopIteration:
+                self.add(name, time.perf_counter() - t0)
+                return
+            self.add(name, time.perf_counter() - t0, 1)
+            yield item
+
+    def rows(self):
+        for name, seconds in self.seconds.items():
+            count = self.counts[name]
+            yield name, count, seconds, count / seconds if seconds else 0.0
+
+
+def _open(path):
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, encoding="utf-8", errors="replace")
+
+
+def _lines(paths):
+    for path in paths:
+        f = _open(path)
+        try:
+            yield from f
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+
+def _record(lead, status, note=""):
+    """Database row for a freshly imported (possibly enriched) lead."""
+    d = lead["data"]
+    found = d.get("enriched", {})
+    return {
+        "Lead ID": lead["id"],
+        "Date": d["date"],
+        "County": (d.get("county_key") or d["county"]).title(),
+        "Address": d["full_address"],
+        "Case Number": d["case"],
+        "Type": d["type"],
+        "Homeowner": d.get("owner", ""),
+        "Phone": found.get("phone", ""),
+        "Email": found.get("email", ""),
+        "Status": status,
+        "Notes": "\n".join(x for x in (d["desc"], note) if x),
+    }
+
+
+def _chunks(iterable, size):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# COMMANDS
+# ═══════════════════════════════════════════════════════════════════════════════
+def cmd_ingest(args, timings, log):
+    stats = ParseStats()
+    queue = get_work_queue(args.db) if args.queue else None
+    counts = {"saved": 0, "queued": 0, "skipped": 0, "flagged": 0}
+    # (owner, address, case, loss date) of written leads with an owner, for --letters
+    letters = [] if args.letters else None
+
+    # Keys only: the saved leads themselves are never loaded, and each chunk is
+    # written straight to the store, so memory is the key sets plus one chunk.
+    t0 = time.perf_counter()
+    store = get_store(args.db)
+    index = DedupeIndex(archive=get_archive(args.db), keys=store.keys())
+    timings.add("load saved keys", time.perf_counter() - t0, len(index.ids))
+    parsed = timings.timed("parse", iter_leads(_lines(args.inputs), stats))
+
+    def classified():
+        for lead in parsed:
+            t0 = time.perf_counter()
+            reason = index.match(lead["id"], lead["data"])
+            timings.add("dedupe", time.perf_counter() - t0, 1)
+            # an ID match is the same lead: re-saving would wipe its owner/contact
+            if reason == "id" or (reason == "case" and not args.keep_duplicates):
+                counts["skipped"] += 1
+                continue
+            if reason:
+                counts["flagged"] += 1
+                lead["data"]["duplicate"] = reason
+            index.add(lead["id"], lead["data"])
+            yield lead
+
+    enricher = None
+    if args.enrich:
+        from .enrich import Enricher, get_enrich_cache, load_providers
+
+        enricher = Enricher(load_providers(args.enrich), get_enrich_cache(args.db),
+                            concurrency=args.concurrency)
+        counts["enriched"] = 0
+
+    for chunk in _chunks(classified(), args.chunk_size):
+        if enricher is not None:
+            results, estats = enricher.enrich([l["data"] for l in chunk])
+            timings.add("enrich", estats.seconds, len(chunk))
+            for lead, found in zip(chunk, results):
+                if found:
+                    lead["data"]["enriched"] = found
+                    if found.get("owner"):
+                        lead["data"]["owner"] = clean_name(found["owner"])
+                    counts["enriched"] += 1
+            for err in estats.errors[:3]:
+                log(f"enrich: {err}")
+        if queue is not None:
+            with timings.stage("queue", len(chunk)):
+                counts["queued"] += queue.add_many(chunk)
+        else:
+            records = [
+                _record(l, args.status, f"Possible duplicate ({l['data']['duplicate']})"
+                        if l["data"].get("duplicate") else "")
+                for l in chunk
+            ]
+            with timings.stage("save", len(records)):
+                store.upsert_many(records)
+            counts["saved"] += len(records)
+        if letters is not None:
+            letters += [(d["owner"], d["full_address"], d["case"], d["date"])
+                        for d in (l["data"] for l in chunk) if d.get("owner")]
+        log(f"{stats.lines:,} lines, {stats.leads:,} leads, "
+            f"{counts['saved'] + counts['queued']:,} written, {counts['skipped']:,} skipped")
+
+    if letters is not None:
+        counts["letters"] = counts["letters_skipped"] = 0
+        if letters:
+            lstats = write_lor_zip(
+                letters, args.letters, workers=args.workers,
+                progress=lambda done, total: log(f"{done:,} / {total:,} letters"),
+            )
+            timings.add("letters", lstats.seconds, lstats.letters)
+            counts["letters"], counts["letters_skipped"] = lstats.letters, lstats.skipped
+            for error in lstats.errors:
+                log(f"skipped {error}")
+        else:
+            log("no written lead has an owner: no letters (use --enrich to look owners up)")
+
+    return {
+        "lines": stats.lines, "leads": stats.leads,
+        "malformed": stats.malformed, "ignored_lines": stats.skipped, **counts,
+    }
+
+
+def cmd_letters(args, timings, log):
+    with timings.stage("collect"):
+        queue = get_work_queue(args.db) if args.include_queue else {}
+        jobs = batch_leads(queue, get_lead_cache(args.db).records())
+    stats = write_lor_zip(
+        jobs, args.output, workers=args.workers, chunk_size=args.pdf_chunk,
+        progress=lambda done, total: log(f"{done:,} / {total:,} letters"),
+    )
+    timings.add("render", stats.seconds, stats.letters)
+    for error in stats.errors:
+        log(f"skipped {error}")
+    return {"letters": stats.letters, "skipped": stats.skipped, "workers": stats.workers, "output": args.output}
+
+
+def cmd_outreach(args, timings, log):
+    fmt = args.format or next((f for f, suffix in FORMATS.items() if args.output.endswith(f".{suffix}")), "csv")
+    statuses = [s.strip() for s in args.status.split(",")] if args.status else None
+    with timings.stage("count"):
+        queue = get_work_queue(args.db) if args.include_queue else None
+        leads, total = ready_leads(get_store(args.db), queue, statuses, email_only=fmt == "eml")
+    stats = write_outreach(
+        leads, args.output, fmt, chunk_size=args.chunk_size, workers=args.workers, total=total,
+        progress=lambda done, total: log(f"{done:,} / {total:,} leads"),
+    )
+    timings.add("render", stats.render_seconds, stats.leads)
+    timings.add("write", stats.seconds - stats.render_seconds, stats.files or stats.leads)
+    return {"leads": stats.leads, "files": stats.files, "skipped": stats.skipped, "format": fmt,
+            "output": args.output}
+
+
+CANVASS_COLUMNS = ["day", "cluster", "stop", "lead_id", "full_address", "type", "case",
+                   "lat", "lon", "precision", "miles"]
+
+
+def cmd_canvass(args, timings, log):
+    index = get_canvass_index(args.db)
+    t0 = time.perf_counter()
+    index.refresh()
+    timings.add("geocode", time.perf_counter() - t0, len(index.grid))
+    dates = {d.strip() for d in args.date.split(",")} if args.date else None
+    leads = {lid: d for lid, d in index.queue.items() if dates is None or d.get("date") in dates}
+    with timings.stage("cluster", len(leads)):
+        days = index.day_clusters(leads, args.miles)
+    rows = []
+    with timings.stage("route", len(leads)):
+        # MM/DD/YYYY loss dates, oldest day first
+        for day in sorted(days, key=lambda d: (d[6:], d[:5])):
+            for n, group in enumerate(days[day], 1):
+                prev = None
+                for stop, lid in enumerate(index.route(group), 1):
+                    lat, lon, precision = index.position(lid)
+                    step = miles(*prev, lat, lon) if prev else 0.0
+                    prev = (lat, lon)
+                    rows.append((day, n, stop, lid, leads[lid]["full_address"], leads[lid]["type"],
+                                 leads[lid]["case"], lat, lon, precision, round(step, 2)))
+    if args.output:
+        with timings.stage("write", len(rows)), open(args.output, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(CANVASS_COLUMNS)
+            writer.writerows(rows)
+    result = {
+        "leads": len(leads), "placed": len(rows), "days": len(days),
+        "clusters": sum(len(groups) for groups in days.values()),
+        "route_miles": round(sum(r[-1] for r in rows), 1),
+    }
+    if args.output:
+        result["output"] = args.output
+    elif not args.json:
+        for day in sorted(days, key=lambda d: (d[6:], d[:5]))[-args.top:]:
+            sizes = [len(g) for g in days[day]]
+            print(f"{day}  {sum(sizes):,} leads in {len(sizes):,} cluster(s), largest {sizes[0]:,}")
+    return result
+
+
+def cmd_export(args, timings, log):
+    store = get_store(args.db)
+    with timings.stage("export", store.count()):
+        store.export_excel(args.output)
+    return {"leads": store.count(), "output": args.output}
+
+
+def cmd_archive(args, timings, log):
+    store = get_store(args.db)
+    t0 = time.perf_counter()
+    result = move_to_archive(
+        store, get_archive(args.db), closed_days=args.closed_days, stale_days=args.stale_days,
+        progress=lambda done, total: log(f"{done:,} / {total:,} leads archived"),
+    )
+    timings.add("archive", time.perf_counter() - t0, result["archived"])
+    if args.vacuum:
+        with timings.stage("vacuum"):
+            store.vacuum()
+    return {**result, "leads_left": store.count(), **get_archive(args.db).summary()}
+
+
+def cmd_history(args, timings, log):
+    columns = [c.strip() for c in args.columns.split(",")] if args.columns else None
+    t0 = time.perf_counter()
+    found = get_archive(args.db).query(columns, county=args.county, status=args.status,
+                                       date_from=args.date_from, date_to=args.date_to, text=args.text)
+    timings.add("query", time.perf_counter() - t0, len(found))
+    if args.output:
+        with timings.stage("write", len(found)):
+            found.to_csv(args.output, index=False)
+        return {"leads": len(found), "output": args.output}
+    if not args.json:
+        print(found.to_string(index=False, max_rows=args.top))
+    return {"leads": len(found)}
+
+
+def cmd_stats(args, timings, log):
+    from .analytics import get_lead_stats
+
+    with timings.stage("load saved leads"):
+        lead_stats = get_lead_stats(args.db)
+    summary = lead_stats.summary()
+    if args.json:
+        return summary
+    result = {"total": summary["total"], "archived": summary["archived"]}
+    for stage in summary["funnel"]:
+        result[stage["stage"].lower()] = f"{stage['reached']:,} ({stage['rate']:.0%})"
+    for dim in ("county", "type", "status"):
+        top = lead_stats.breakdown(dim)[:args.top]
+        result[dim] = ", ".join(f"{k} {n:,}" for k, n in top)
+    result["recent weeks"] = ", ".join(f"{k} {n:,}" for k, n in lead_stats.breakdown("week")[:args.top])
+    return result
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ENTRY POINT
+# ═══════════════════════════════════════════════════════════════════════════════
+def build_parser():
+    ap = argparse.ArgumentParser(prog="python -m primestate", description=__doc__.splitlines()[0])
+    ap.add_argument("--db", default=STORE_FILE, help=f"SQLite store (default {STORE_FILE})")
+    ap.add_argument("--json", action="store_true", help="print the report as JSON")
+    ap.add_argument("-q", "--quiet", action="store_true", help="no progress on stderr")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("ingest", help="parse feed files, drop already-saved leads, save the rest")
+    p.add_argument("inputs", nargs="+", help="feed files (.gz ok), or - for stdin")
+    p.add_argument("--chunk-size", type=int, default=5000, help="leads per save transaction")
+    p.add_argument("--queue", action="store_true",
+                   help="add to the shared work queue instead of saving")
+    p.add_argument("--status", default=PIPELINE[0], choices=PIPELINE,
+                   help=f"Status for saved leads (default {PIPELINE[0]}, as the app saves them)")
+    p.add_argument("--keep-duplicates", action="store_true",
+                   help="also write leads whose case number is already saved")
+    p.add_argument("--enrich", metavar="CONFIG",
+                   help="look up owner/contact with the providers in this JSON file")
+    p.add_argument("--concurrency", type=int, default=16, help="parallel lookups (with --enrich)")
+    p.add_argument("--letters", metavar="ZIP",
+                   help="also render an LOR for every written lead with an owner into this ZIP")
+    p.add_argument("--workers", type=int, default=None, help="letter processes (with --letters)")
+    p.set_defaults(func=cmd_ingest)
+
+    p = sub.add_parser("letters", help="render LORs for saved leads with an owner into a ZIP")
+    p.add_argument("output")
+    p.add_argument("--workers", type=int, default=None, help="render processes (default: all cores)")
+    p.add_argument("--pdf-chunk", type=int, default=16, help="letters per worker task")
+    p.add_argument("--include-queue", action="store_true",
+                   help="also render queued leads that already have an owner")
+    p.set_defaults(func=cmd_letters)
+
+    p = sub.add_parser("outreach", help="mail-merge SMS / email texts for leads ready to contact")
+    p.add_argument("output", help=".csv, .jsonl, or .zip of .eml drafts")
+    p.add_argument("--format", choices=sorted(FORMATS), help="default: from the output's extension")
+    p.add_argument("--status", default=",".join(READY_STATUSES),
+                   help=f"saved leads with these statuses (default {','.join(READY_STATUSES)}; '' for all)")
+    p.add_argument("--include-queue", action="store_true",
+                   help="also queued leads whose owner lookup found a phone or email")
+    p.add_argument("--chunk-size", type=int, default=5000, help="leads rendered and written per step")
+    p.add_argument("--workers", type=int, default=None, help="letter processes for eml (default: all cores)")
+    p.set_defaults(func=cmd_outreach)
+
+    p = sub.add_parser("canvass", help="group queued leads by loss day and area, in driving order")
+    p.add_argument("output", nargs="?", help="write every stop to this CSV (default: summary only)")
+    p.add_argument("--miles", type=float, default=CLUSTER_MILES,
+                   help=f"leads this close join one cluster (default {CLUSTER_MILES:g})")
+    p.add_argument("--date", help="comma-separated loss dates (MM/DD/YYYY) to plan (default all)")
+    p.add_argument("--top", type=int, default=14, help="most recent days in the text summary")
+    p.set_defaults(func=cmd_canvass)
+
+    p = sub.add_parser("stats", help="pipeline counts by county, type, status and week")
+    p.add_argument("--top", type=int, default=8, help="rows per breakdown in the text report")
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("export", help="write every saved lead to an Excel workbook")
+    p.add_argument("output")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("archive", help="move closed and old leads into the Parquet archive")
+    p.add_argument("--closed-days", type=int, default=CLOSED_DAYS,
+                   help=f"archive Closed leads untouched this many days (default {CLOSED_DAYS})")
+    p.add_argument("--stale-days", type=int, default=STALE_DAYS,
+                   help=f"archive any lead lost more than this many days ago (default {STALE_DAYS})")
+    p.add_argument("--vacuum", action="store_true", help="shrink the SQLite file afterwards")
+    p.set_defaults(func=cmd_archive)
+
+    p = sub.add_parser("history", help="query the Parquet archive")
+    p.add_argument("--columns", help="comma-separated columns to read (default all)")
+    p.add_argument("--county")
+    p.add_argument("--status")
+    p.add_argument("--from", dest="date_from", help="loss date on or after (YYYY-MM-DD)")
+    p.add_argument("--to", dest="date_to", help="loss date on or before (YYYY-MM-DD)")
+    p.add_argument("--text", help="substring of owner, address or case number")
+    p.add_argument("--output", help="write the matches to this CSV instead of printing them")
+    p.add_argument("--top", type=int, default=50, help="rows printed without --output")
+    p.set_defaults(func=cmd_history)
+    return ap
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    timings = Timings()
+
+    def log(msg):
+        if not args.quiet:
+            print(msg, file=sys.stderr, flush=True)
+
+    t0 = time.perf_counter()
+    result = args.func(args, timings, log)
+    total = time.perf_counter() - t0
+
+    if args.json:
+        result["stages"] = {
+            name: {"count": count, "seconds": round(sec, 4)} for name, count, sec, _ in timings.rows()
+        }
+        result["seconds"] = round(total, 4)
+        print(json.dumps(result, indent=2))
+        return 0
+    for key, value in result.items():
+        print(f"{key:14s} {value:,}" if isinstance(value, int) else f"{key:14s} {value}")
+    print(f"{'stage':20s} {'count':>10s} {'seconds':>9s} {'per sec':>12s}")
+    for name, count, sec, rate in timings.rows():
+        print(f"{name:20s} {count:10,} {sec:9.3f} {rate:12,.0f}")
+    print(f"{'total':20s} {'':10s} {total:9.3f}")
+    return 0
@@ -0,0 +1,16 @@
+"""Company constants — single source of truth for branding."""
+
+CO = {
+    "name": "PrimeState Public Adjusters, Inc.",
+    "short": "PrimeState Adjusters",
+    "president": "Carlos A. Jimenez",
+    "title": "President",
+    "nj_address": "9060 Palisade Ave Unit C-003, North Bergen, NJ 07047",
+    "nj_phone": "(201) 305-1006",
+    "toll_free": "1-800-211-0434",
+    "email": "info@primestateadjusters.com",
+    "web": "primestateadjusters.com",
+    "logo_url": "https://e1w.61f.myftpupload.com/wp-content/uploads/2024/03/prime-state-logo-quality-png-.png",
+    "tagline": "No Recovery, No Fee.",
+    "license_nj": "Licensed by the State of New Jersey Dept. of Banking & Insurance",
+}
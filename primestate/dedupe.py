@@ -0,0 +1,106 @@
+"""Import-time duplicate detection against the saved lead database.
+
+:class:`DedupeIndex` keeps a hash set of Lead IDs and counted hash sets of
+case numbers and normalised addresses for every saved lead.  It is built once from the
+process-wide :class:`~primestate.store.LeadCache` (plus the key columns of
+the Parquet archive, so an archived lead is still a duplicate) and then
+patched from the cache's change feed, so checking an import is a few set
+lookups per lead.
+"""
+import threading
+from collections import Counter
+
+from .archive import get_archive
+from .store import COLUMNS, STORE_FILE, get_lead_cache, per_path
+from .normalize import address_key
+
+_ID, _ADDRESS, _CASE = (COLUMNS.index(c) for c in ("Lead ID", "Address", "Case Number"))
+
+# placeholder case numbers that say nothing about identity
+_NO_CASE = {"", "pending", "none", "nan"}
+
+
+def norm_case(case):
+    c = str(case).strip().lstrip("#").lower()
+    return None if c in _NO_CASE else c
+
+
+class DedupeIndex:
+    """Hash-set index over saved leads: Lead ID, case number and address.
+
+    Without a ``cache`` it holds only the keys it is given (``keys`` and the
+    archive's) and is kept current with :meth:`add`, so a streaming import
+    does not mirror every saved lead in memory.
+    """
+
+    def __init__(self, cache=None, archive=None, keys=()):
+        self._lock = threading.Lock()
+        # cases / addresses count the leads holding each key, so an edit can
+        # drop the old key without forgetting another lead that shares it
+        self.ids, self.cases, self.addresses = set(), Counter(), Counter()
+        if archive is not None:
+            self._add_keys(archive.keys())
+        self._add_keys(keys)
+        if cache is not None:
+            cache.subscribe(self._add_rows)
+        self._cache = cache
+
+    def _add_keys(self, keys):
+        with self._lock:
+            for lead_id, case, address in keys:
+                self.ids.add(lead_id)
+                self._count(1, case, address)
+
+    def _count(self, step, case, address):
+        case = norm_case(case) if case is not None else None
+        for counter, key in ((self.cases, case), (self.addresses, address and address_key(address))):
+            if key:
+                counter[key] += step
+                if counter[key] <= 0:
+                    del counter[key]
+
+    def _add_rows(self, rows, previous):
+        with self._lock:
+            for row, old in zip(rows, previous):
+                # removed (archived) leads keep their keys: re-importing one is still a duplicate
+                if row is None:
+                    continue
+                self.ids.add(row[_ID])
+                if old is not None:
+                    if (old[_CASE], old[_ADDRESS]) == (row[_CASE], row[_ADDRESS]):
+                        continue
+                    self._count(-1, old[_CASE], old[_ADDRESS])
+                self._count(1, row[_CASE], row[_ADDRESS])
+
+    def add(self, lead_id, data):
+        """Index a parsed lead that is being written, so later leads in the same
+        import (even the same chunk) match it."""
+        self._add_keys([(lead_id, data.get("case"), data.get("full_address"))])
+
+    def match(self, lead_id, data):
+        """Return why a parsed lead is already saved: ``"id"``, ``"case"``,
+        ``"address"``, or ``None`` for a new lead."""
+        if lead_id in self.ids:
+            return "id"
+        case = norm_case(data.get("case", ""))
+        if case and case in self.cases:
+            return "case"
+        key = data.get("address_key") or address_key(data.get("full_address", ""))
+        if key in self.addresses:
+            return "address"
+        return None
+
+    def check(self, leads):
+        """Classify ``{"id", "data"}`` leads against the store in one pass.
+
+        Yields ``(lead, reason)`` pairs; the index is synced once up front.
+        """
+        if self._cache is not None:
+            self._cache.refresh()
+        for lead in leads:
+            yield lead, self.match(lead["id"], lead["data"])
+
+
+@per_path
+def get_dedupe_index(path=STORE_FILE):
+    return DedupeIndex(get_lead_cache(path), get_archive(path))
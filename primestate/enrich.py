@@ -0,0 +1,315 @@
+"""Optional owner / contact enrichment from HTTP lookup services.
+
+Providers are queried concurrently on asyncio through one pooled ``httpx``
+client, throttled per host and retried on transient failures.  Every answer
+(including "not found") is kept in an ``enrich_cache`` table of the store's
+SQLite file, keyed by provider and normalised address, so a re-imported lead
+is never fetched twice while its entry is fresh.
+
+Providers are configured in a JSON file (path in ``$PRIMESTATE_ENRICH``)::
+
+    [{"name": "owners",
+      "url": "https://lookup.example/owner?address={address}&city={city}",
+      "fields": {"owner": "result.owner_name", "phone": "result.phones.0"},
+      "rate": 5, "burst": 5, "ttl_days": 30}]
+
+``url`` placeholders are lead fields (``address``, ``full_address``, ``city``,
+``county``, ``state``, ``case``); ``fields`` maps ``owner`` / ``phone`` /
+``email`` to dotted paths in the JSON response.  Anything more exotic can
+subclass :class:`Provider`.
+"""
+import asyncio
+import json
+import os
+import random
+import time
+import urllib.parse
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from .instrument import metrics
+from .normalize import address_key
+from .store import STORE_FILE, SQLiteFile, per_path
+
+ENRICH_ENV = "PRIMESTATE_ENRICH"
+RESULT_FIELDS = ("owner", "phone", "email")
+DAY = 86400
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS enrich_cache (
+    provider    TEXT NOT NULL,
+    key         TEXT NOT NULL,
+    payload     TEXT NOT NULL,
+    fetched_at  REAL NOT NULL,
+    expires_at  REAL NOT NULL,
+    PRIMARY KEY (provider, key)
+);
+"""
+
+
+class EnrichError(Exception):
+    """A provider gave up on a lead (after retries, or a permanent error)."""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PROVIDERS
+# ═══════════════════════════════════════════════════════════════════════════════
+class Provider:
+    """One lookup service.  Subclasses implement :meth:`request` and :meth:`parse`."""
+
+    name = "provider"
+    rate = 5.0        # requests per second, per host
+    burst = 5
+    ttl = 30 * DAY
+
+    def host(self):
+        return self.name
+
+    def request(self, lead):
+        """``(method, url, kwargs)`` for ``lead``."""
+        raise NotImplementedError
+
+    def parse(self, response):
+        """Result dict (a subset of ``RESULT_FIELDS``) from an OK response."""
+        raise NotImplementedError
+
+
+def _lookup(doc, path):
+    for part in path.split("."):
+        if isinstance(doc, list):
+            doc = doc[int(part)] if part.isdigit() and int(part) < len(doc) else None
+        elif isinstance(doc, dict):
+            doc = doc.get(part)
+        else:
+            return None
+    return doc
+
+
+class JSONProvider(Provider):
+    """GET a templated URL and pick fields out of the JSON answer."""
+
+    def __init__(self, name, url, fields, rate=5.0, burst=5, ttl_days=30, headers=None):
+        self.name, self.url, self.fields = name, url, fields
+        self.rate, self.burst, self.ttl = float(rate), int(burst), ttl_days * DAY
+        self.headers = headers or {}
+
+    def host(self):
+        return urllib.parse.urlsplit(self.url).netloc
+
+    def request(self, lead):
+        values = {
+            "address": lead.get("address_part", ""),
+            "full_address": lead.get("full_address", ""),
+            "city": lead.get("city", ""),
+            "county": lead.get("county", ""),
+            "state": lead.get("state", ""),
+            "case": lead.get("case", ""),
+        }
+        url = self.url.format(**{k: urllib.parse.quote(str(v)) for k, v in values.items()})
+        return "GET", url, {"headers": self.headers}
+
+    def parse(self, response):
+        doc = response.json()
+        out = {}
+        for key, path in self.fields.items():
+            value = _lookup(doc, path)
+            if value not in (None, ""):
+                out[key] = str(value)
+        return out
+
+
+def load_providers(path):
+    """:class:`JSONProvider` list from a JSON config file."""
+    with open(path, encoding="utf-8") as f:
+        return [JSONProvider(**spec) for spec in json.load(f)]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CACHE
+# ═══════════════════════════════════════════════════════════════════════════════
+class EnrichCache(SQLiteFile):
+    """Provider answers keyed by ``(provider, address key)``, with expiry."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._connect().executescript(_SCHEMA)
+
+    def get_many(self, provider, keys):
+        """``{key: result}`` for the fresh entries among ``keys``."""
+        rows = self._connect().execute(
+            "SELECT key, payload FROM enrich_cache WHERE provider = ? AND expires_at > ? "
+            "AND key IN (SELECT value FROM json_each(?))",
+            (provider, time.time(), json.dumps(list(keys))),
+        )
+        return {k: json.loads(p) for k, p in rows}
+
+    def put_many(self, provider, results, ttl):
+        """Store ``{key: result}``; empty results are "not found" answers."""
+        if not results:
+            return
+        now = time.time()
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO enrich_cache (provider, key, payload, fetched_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                ((provider, k, json.dumps(r), now, now + ttl) for k, r in results.items()),
+            )
+
+    def purge(self):
+        """Drop expired entries; returns how many."""
+        with self.transaction() as conn:
+            return conn.execute("DELETE FROM enrich_cache WHERE expires_at <= ?", (time.time(),)).rowcount
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ENRICHER
+# ═══════════════════════════════════════════════════════════════════════════════
+class RateLimiter:
+    """Async token bucket: ``rate`` requests/second with bursts of ``burst``."""
+
+    def __init__(self, rate, burst=1):
+        self.rate, self.capacity = rate, max(1, burst)
+        self.tokens, self.updated = float(self.capacity), time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+@dataclass
+class EnrichStats:
+    leads: int = 0
+    cached: int = 0
+    fetched: int = 0
+    retries: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+    errors: list = field(default_factory=list)
+
+
+class Enricher:
+    """Run leads through ``providers``; the first provider to fill a field wins."""
+
+    RETRY_STATUS = {429, 500, 502, 503, 504}
+
+    def __init__(self, providers, cache, concurrency=16, retries=3, timeout=10.0, backoff=0.5):
+        self.providers, self.cache = list(providers), cache
+        self.concurrency, self.retries = concurrency, retries
+        self.timeout, self.backoff = timeout, backoff
+
+    def enrich(self, leads):
+        """Blocking wrapper around :meth:`run` for scripts and Streamlit."""
+        return asyncio.run(self.run(leads))
+
+    async def run(self, leads):
+        """Enrich parsed lead dicts; returns ``(results, EnrichStats)``.
+
+        ``results[i]`` holds the ``RESULT_FIELDS`` found for ``leads[i]``.
+        Leads sharing a normalised address are looked up once.
+        """
+        import httpx
+
+        t0 = time.perf_counter()
+        stats = EnrichStats(leads=len(leads))
+        keys = [lead.get("address_key") or address_key(lead.get("full_address", "")) for lead in leads]
+        by_key = {}
+        for key, lead in zip(keys, leads):
+            if key:
+                by_key.setdefault(key, lead)
+        answers = {p.name: self.cache.get_many(p.name, by_key) for p in self.providers}
+        stats.cached = sum(len(a) for a in answers.values())
+        metrics.count("enrich_cache.hit", stats.cached)
+        metrics.count("enrich_cache.miss", len(by_key) * len(self.providers) - stats.cached)
+
+        limiters = {}
+        for p in self.providers:
+            limiters.setdefault(p.host(), RateLimiter(p.rate, p.burst))
+        gate = asyncio.Semaphore(self.concurrency)
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        async with httpx.AsyncClient(limits=limits, timeout=self.timeout) as client:
+            jobs = [
+                (p, key, self._fetch(client, gate, limiters[p.host()], p, lead, stats))
+                for p in self.providers
+                for key, lead in by_key.items()
+                if key not in answers[p.name]
+            ]
+            done = await asyncio.gather(*(job for _, _, job in jobs), return_exceptions=True)
+        fresh = {p.name: {} for p in self.providers}
+        for (p, key, _), result in zip(jobs, done):
+            if isinstance(result, Exception):
+                stats.failed += 1
+                if len(stats.errors) < 20:
+                    stats.errors.append(f"{p.name}: {result}")
+                continue
+            stats.fetched += 1
+            fresh[p.name][key] = answers[p.name][key] = result
+        for p in self.providers:
+            self.cache.put_many(p.name, fresh[p.name], p.ttl)
+
+        results = []
+        for key in keys:
+            merged = {}
+            for p in self.providers:
+                for k, v in answers[p.name].get(key, {}).items():
+                    merged.setdefault(k, v)
+            results.append(merged)
+        stats.seconds = time.perf_counter() - t0
+        return results, stats
+
+    async def _fetch(self, client, gate, limiter, provider, lead, stats):
+        import httpx
+
+        method, url, kwargs = provider.request(lead)
+        for attempt in range(self.retries + 1):
+            delay = self.backoff * 2 ** attempt * (0.5 + random.random())
+            async with gate:
+                await limiter.acquire()
+                try:
+                    resp = await client.request(method, url, **kwargs)
+                except httpx.TransportError as exc:
+                    error = exc
+                else:
+                    if resp.status_code == 404:
+                        return {}
+                    if resp.is_success:
+                        return provider.parse(resp)
+                    if resp.status_code not in self.RETRY_STATUS:
+                        raise EnrichError(f"HTTP {resp.status_code} for {url}")
+                    error = EnrichError(f"HTTP {resp.status_code} for {url}")
+                    retry_after = resp.headers.get("Retry-After", "")
+                    if retry_after.isdigit():
+                        delay = max(delay, float(retry_after))
+            if attempt < self.retries:
+                stats.retries += 1
+                await asyncio.sleep(delay)
+        raise EnrichError(str(error) or type(error).__name__)
+
+
+@per_path
+def get_enrich_cache(path=STORE_FILE):
+    return EnrichCache(path)
+
+
+@lru_cache(maxsize=None)
+def _enricher(config, path):
+    return Enricher(load_providers(config), get_enrich_cache(path))
+
+
+def get_enricher(config=None, path=STORE_FILE):
+    """Process-wide :class:`Enricher` from ``config`` (or ``$PRIMESTATE_ENRICH``).
+
+    Returns ``None`` when no providers are configured.  Keyed on the resolved
+    config file and store path, so every way of asking gets the same one.
+    """
+    config = config or os.environ.get(ENRICH_ENV)
+    if not config:
+        return None
+    return _enricher(os.path.abspath(config), path)
@@ -0,0 +1,628 @@
+"""Offline geocoding and a grid spatial index for canvassing queued leads.
+
+:func:`geocode` places a ``"street, town, NJ"`` address from the tables
+below, with no network: a street centroid when a street table is configured
+(``$PRIMESTATE_STREETS``, a CSV of ``town,street,lat,lon``), else the
+town's centroid, else the county's.  The feed carries no ZIP code and the
+bundled table is town-level, so out of the box every lead in a town shares
+one point and the route orders a town's leads by street and house number.
+
+:class:`GridIndex` buckets points into square cells of ``CELL_MILES`` on a
+flat projection of NJ (a degree of longitude is ~53 miles here, one of
+latitude ~69), so "within N miles", single-linkage clusters and a
+nearest-neighbour route only look at the cells around a point.  Leads at
+the same coordinates share one slot.  :class:`CanvassIndex` keeps one over
+the work queue, patched from its change feed like
+:class:`~primestate.work_queue.QueueIndex`.
+"""
+import csv
+import math
+import os
+import re
+import threading
+from collections import defaultdict
+from functools import lru_cache
+
+from .normalize import (
+    MUNICIPALITY_COUNTY, SHARED_TOWN_COUNTY, UNIT_DESIGNATORS, county_key, normalize_street, town_keys,
+)
+from .store import STORE_FILE, per_path
+from .work_queue import get_work_queue
+
+STREETS_ENV = "PRIMESTATE_STREETS"
+CELL_MILES = 1.0
+NEARBY_MILES = 2.0     # "near this lead" in the workspace
+CLUSTER_MILES = 1.0    # leads this close are one stop on a canvass day
+
+MILES_PER_DEGREE = 3958.8 * math.pi / 180      # mean Earth radius in miles
+_X_SCALE = math.cos(math.radians(40.15))       # NJ's middle latitude
+# cos(latitude) over NJ (38.9°–41.4°) is within 2% of _X_SCALE, so a ring of
+# cells this much wider than the radius always covers it
+_RING_SLACK = 1.02
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CENTROID TABLES
+# ═══════════════════════════════════════════════════════════════════════════════
+# (latitude, longitude) of each county's geographic centre.
+COUNTY_CENTROIDS = {
+    "atlantic": (39.470, -74.630), "bergen": (40.960, -74.070),
+    "burlington": (39.880, -74.670), "camden": (39.800, -74.960),
+    "cape may": (39.090, -74.820), "cumberland": (39.330, -75.130),
+    "essex": (40.790, -74.250), "gloucester": (39.720, -75.140),
+    "hudson": (40.740, -74.080), "hunterdon": (40.570, -74.910),
+    "mercer": (40.280, -74.700), "middlesex": (40.440, -74.410),
+    "monmouth": (40.290, -74.150), "morris": (40.860, -74.540),
+    "ocean": (39.870, -74.250), "passaic": (41.030, -74.300),
+    "salem": (39.580, -75.360), "somerset": (40.560, -74.620),
+    "sussex": (41.140, -74.690), "union": (40.660, -74.310),
+    "warren": (40.860, -75.010),
+}
+
+# Town centre of every municipality in normalize.MUNICIPALITY_COUNTY and
+# normalize.SHARED_TOWN_COUNTY.
+TOWN_CENTROIDS = {
+    # atlantic
+    "atlantic city": (39.364, -74.423), "egg harbor township": (39.381, -74.610),
+    "egg harbor city": (39.529, -74.648), "galloway": (39.492, -74.487),
+    "hammonton": (39.637, -74.802), "pleasantville": (39.390, -74.524),
+    "absecon": (39.428, -74.496), "ventnor city": (39.340, -74.477),
+    "ventnor": (39.340, -74.477), "margate city": (39.328, -74.503),
+    "margate": (39.328, -74.503), "somers point": (39.318, -74.595),
+    "brigantine": (39.410, -74.365), "mays landing": (39.452, -74.728),
+    "northfield": (39.370, -74.550), "linwood": (39.340, -74.575),
+    # bergen
+    "hackensack": (40.886, -74.043), "teaneck": (40.890, -74.016),
+    "fort lee": (40.851, -73.970), "fair lawn": (40.940, -74.118),
+    "garfield": (40.881, -74.113), "englewood": (40.893, -73.973),
+    "paramus": (40.945, -74.071), "ridgewood": (40.979, -74.117),
+    "lodi": (40.882, -74.083), "cliffside park": (40.821, -73.988),
+    "bergenfield": (40.928, -73.997), "mahwah": (41.089, -74.144),
+    "lyndhurst": (40.812, -74.124), "rutherford": (40.827, -74.107),
+    "ramsey": (41.057, -74.141), "elmwood park": (40.904, -74.118),
+    "hasbrouck heights": (40.858, -74.081), "saddle brook": (40.899, -74.093),
+    "little ferry": (40.851, -74.041), "ridgefield park": (40.857, -74.022),
+    "ridgefield": (40.834, -74.009), "palisades park": (40.848, -73.998),
+    "dumont": (40.941, -73.997), "westwood": (40.991, -74.033),
+    "new milford": (40.935, -74.019), "tenafly": (40.925, -73.963),
+    "closter": (40.973, -73.961), "oradell": (40.958, -74.037),
+    "wyckoff": (41.007, -74.173), "franklin lakes": (41.017, -74.206),
+    "edgewater": (40.827, -73.976), "north arlington": (40.788, -74.133),
+    "east rutherford": (40.834, -74.097), "wallington": (40.853, -74.114),
+    "cresskill": (40.941, -73.959), "glen rock": (40.963, -74.133),
+    "leonia": (40.861, -73.988),
+    # burlington
+    "burlington": (40.071, -74.865), "mount laurel": (39.934, -74.891),
+    "evesham": (39.866, -74.892), "marlton": (39.891, -74.922),
+    "willingboro": (40.028, -74.869), "moorestown": (39.969, -74.949),
+    "pemberton": (39.972, -74.683), "cinnaminson": (40.000, -74.993),
+    "medford": (39.901, -74.823), "maple shade": (39.952, -74.992),
+    "delran": (40.015, -74.957), "bordentown": (40.146, -74.712),
+    "lumberton": (39.966, -74.802), "mount holly": (39.993, -74.787),
+    "riverside": (40.039, -74.958), "palmyra": (40.007, -75.028),
+    "browns mills": (39.970, -74.583), "florence": (40.118, -74.805),
+    "burlington township": (40.060, -74.840),
+    # camden
+    "camden": (39.926, -75.120), "cherry hill": (39.935, -75.031),
+    "gloucester township": (39.793, -75.036), "pennsauken": (39.956, -75.058),
+    "winslow": (39.657, -74.862), "voorhees": (39.852, -74.962),
+    "collingswood": (39.918, -75.071), "haddonfield": (39.891, -75.038),
+    "lindenwold": (39.824, -74.998), "bellmawr": (39.867, -75.095),
+    "haddon heights": (39.878, -75.065), "haddon township": (39.907, -75.064),
+    "audubon": (39.891, -75.073), "berlin": (39.791, -74.929),
+    "pine hill": (39.784, -74.992), "gloucester city": (39.892, -75.116),
+    "runnemede": (39.852, -75.068), "sicklerville": (39.717, -74.969),
+    "blackwood": (39.802, -75.064), "somerdale": (39.844, -75.022),
+    "stratford": (39.827, -75.016), "magnolia": (39.855, -75.036),
+    # cape may
+    "cape may": (38.935, -74.906), "ocean city": (39.278, -74.575),
+    "wildwood": (38.992, -74.815), "north wildwood": (39.000, -74.799),
+    "wildwood crest": (38.975, -74.835), "lower township": (38.984, -74.902),
+    "middle township": (39.083, -74.830), "upper township": (39.205, -74.723),
+    "cape may court house": (39.083, -74.823), "sea isle city": (39.153, -74.693),
+    "avalon": (39.101, -74.718), "stone harbor": (39.051, -74.758),
+    "villas": (39.028, -74.938), "rio grande": (39.015, -74.878),
+    # cumberland
+    "vineland": (39.486, -75.026), "millville": (39.402, -75.039),
+    "bridgeton": (39.427, -75.234), "upper deerfield": (39.493, -75.210),
+    "commercial township": (39.260, -75.030), "maurice river": (39.280, -74.920),
+    "fairton": (39.382, -75.220),
+    # essex
+    "newark": (40.736, -74.172), "east orange": (40.767, -74.205),
+    "irvington": (40.732, -74.235), "bloomfield": (40.807, -74.185),
+    "west orange": (40.799, -74.239), "orange": (40.770, -74.233),
+    "montclair": (40.826, -74.209), "belleville": (40.794, -74.150),
+    "livingston": (40.796, -74.315), "nutley": (40.822, -74.160),
+    "maplewood": (40.731, -74.273), "south orange": (40.749, -74.261),
+    "millburn": (40.725, -74.304), "short hills": (40.748, -74.326),
+    "verona": (40.830, -74.240), "cedar grove": (40.852, -74.229),
+    "west caldwell": (40.841, -74.302), "caldwell": (40.840, -74.276),
+    "north caldwell": (40.864, -74.258), "glen ridge": (40.805, -74.204),
+    "fairfield": (40.884, -74.306), "roseland": (40.821, -74.294),
+    "essex fells": (40.825, -74.284),
+    # gloucester
+    "deptford": (39.827, -75.116), "west deptford": (39.839, -75.168),
+    "glassboro": (39.703, -75.112), "mantua": (39.762, -75.165),
+    "woodbury": (39.838, -75.153), "paulsboro": (39.830, -75.241),
+    "pitman": (39.733, -75.132), "williamstown": (39.686, -74.995),
+    "sewell": (39.766, -75.144), "logan": (39.787, -75.360),
+    "swedesboro": (39.748, -75.310), "franklinville": (39.618, -75.077),
+    "mullica hill": (39.739, -75.224), "clayton": (39.660, -75.092),
+    "woolwich": (39.740, -75.320), "national park": (39.866, -75.179),
+    "westville": (39.868, -75.132), "turnersville": (39.773, -75.052),
+    # hudson
+    "jersey city": (40.728, -74.078), "hoboken": (40.744, -74.032),
+    "bayonne": (40.669, -74.114), "union city": (40.780, -74.024),
+    "west new york": (40.788, -74.014), "north bergen": (40.804, -74.012),
+    "kearny": (40.768, -74.145), "secaucus": (40.790, -74.057),
+    "weehawken": (40.770, -74.020), "harrison": (40.746, -74.156),
+    "guttenberg": (40.792, -74.004), "east newark": (40.752, -74.162),
+    # hunterdon
+    "flemington": (40.512, -74.859), "clinton": (40.637, -74.910),
+    "raritan township": (40.497, -74.850), "readington": (40.570, -74.780),
+    "lambertville": (40.366, -74.943), "tewksbury": (40.700, -74.780),
+    "high bridge": (40.667, -74.896), "whitehouse station": (40.615, -74.771),
+    "frenchtown": (40.526, -75.062),
+    # mercer
+    "trenton": (40.217, -74.743), "hamilton": (40.207, -74.676),
+    "hamilton township": (40.207, -74.676), "hamilton square": (40.228, -74.653),
+    "mercerville": (40.237, -74.687), "ewing": (40.270, -74.800),
+    "lawrence": (40.297, -74.725), "lawrenceville": (40.297, -74.730),
+    "princeton": (40.357, -74.667), "west windsor": (40.297, -74.620),
+    "east windsor": (40.261, -74.530), "hopewell": (40.389, -74.762),
+    "robbinsville": (40.215, -74.620), "hightstown": (40.270, -74.523),
+    "pennington": (40.328, -74.791),
+    # middlesex
+    "new brunswick": (40.486, -74.452), "edison": (40.519, -74.412),
+    "woodbridge": (40.558, -74.285), "perth amboy": (40.507, -74.265),
+    "piscataway": (40.554, -74.465), "old bridge": (40.414, -74.365),
+    "sayreville": (40.459, -74.361), "east brunswick": (40.428, -74.416),
+    "north brunswick": (40.450, -74.480), "south brunswick": (40.380, -74.530),
+    "plainsboro": (40.333, -74.595), "carteret": (40.577, -74.228),
+    "south plainfield": (40.579, -74.412), "metuchen": (40.543, -74.363),
+    "highland park": (40.496, -74.425), "south river": (40.446, -74.386),
+    "spotswood": (40.392, -74.398), "milltown": (40.456, -74.443),
+    "dunellen": (40.589, -74.472), "middlesex": (40.573, -74.493),
+    "jamesburg": (40.353, -74.440), "iselin": (40.575, -74.322),
+    "colonia": (40.593, -74.315), "avenel": (40.580, -74.285),
+    "fords": (40.529, -74.316), "parlin": (40.462, -74.338),
+    "kendall park": (40.421, -74.561), "south amboy": (40.478, -74.291),
+    # monmouth
+    "asbury park": (40.220, -74.012), "long branch": (40.304, -73.992),
+    "freehold": (40.260, -74.274), "middletown": (40.395, -74.083),
+    "howell": (40.180, -74.195), "marlboro": (40.315, -74.246),
+    "manalapan": (40.280, -74.343), "neptune": (40.210, -74.050),
+    "neptune city": (40.200, -74.028), "wall": (40.169, -74.093),
+    "red bank": (40.347, -74.064), "holmdel": (40.345, -74.184),
+    "hazlet": (40.424, -74.170), "keansburg": (40.442, -74.130),
+    "eatontown": (40.296, -74.051), "tinton falls": (40.304, -74.100),
+    "aberdeen": (40.424, -74.212), "matawan": (40.415, -74.230),
+    "belmar": (40.178, -74.022), "colts neck": (40.288, -74.174),
+    "rumson": (40.372, -73.999), "keyport": (40.433, -74.200),
+    "union beach": (40.447, -74.178), "manasquan": (40.126, -74.049),
+    "spring lake": (40.153, -74.028), "shrewsbury": (40.330, -74.062),
+    "oceanport": (40.318, -74.015), "highlands": (40.404, -73.991),
+    "atlantic highlands": (40.413, -74.035), "englishtown": (40.297, -74.358),
+    "ocean grove": (40.212, -74.007), "sea girt": (40.132, -74.035),
+    # morris
+    "morristown": (40.797, -74.481), "parsippany": (40.858, -74.426),
+    "parsippany-troy hills": (40.858, -74.426), "dover": (40.884, -74.562),
+    "rockaway": (40.901, -74.514), "randolph": (40.848, -74.574),
+    "mount olive": (40.852, -74.733), "montville": (40.915, -74.359),
+    "denville": (40.892, -74.477), "roxbury": (40.874, -74.657),
+    "hanover": (40.817, -74.430), "east hanover": (40.820, -74.365),
+    "madison": (40.760, -74.417), "chatham": (40.741, -74.384),
+    "florham park": (40.788, -74.388), "boonton": (40.903, -74.407),
+    "pequannock": (40.946, -74.299), "jefferson": (41.003, -74.550),
+    "butler": (40.998, -74.342), "kinnelon": (40.983, -74.367),
+    "lincoln park": (40.924, -74.304), "mendham": (40.776, -74.601),
+    "morris plains": (40.822, -74.481), "morris township": (40.790, -74.510),
+    "wharton": (40.893, -74.582), "netcong": (40.899, -74.707),
+    "mine hill": (40.877, -74.600), "whippany": (40.824, -74.417),
+    "cedar knolls": (40.822, -74.450), "budd lake": (40.871, -74.734),
+    "lake hiawatha": (40.880, -74.382), "long valley": (40.786, -74.780),
+    "mountain lakes": (40.895, -74.433), "riverdale": (40.994, -74.303),
+    "chester": (40.784, -74.697), "succasunna": (40.869, -74.640),
+    "ledgewood": (40.879, -74.655),
+    # ocean
+    "toms river": (39.954, -74.198), "lakewood": (40.098, -74.218),
+    "brick": (40.060, -74.110), "jackson": (40.097, -74.358),
+    "manchester": (39.995, -74.310), "berkeley": (39.895, -74.199),
+    "stafford": (39.710, -74.260), "barnegat": (39.753, -74.223),
+    "little egg harbor": (39.590, -74.350), "point pleasant": (40.083, -74.068),
+    "point pleasant beach": (40.091, -74.048), "lacey": (39.860, -74.260),
+    "forked river": (39.840, -74.190), "bayville": (39.909, -74.155),
+    "seaside heights": (39.944, -74.073), "seaside park": (39.927, -74.077),
+    "lavallette": (39.970, -74.069), "beachwood": (39.939, -74.193),
+    "ocean gate": (39.926, -74.134), "pine beach": (39.936, -74.170),
+    "tuckerton": (39.603, -74.340), "manahawkin": (39.695, -74.259),
+    "waretown": (39.792, -74.195), "long beach": (39.640, -74.190),
+    "beach haven": (39.559, -74.243), "surf city": (39.662, -74.165),
+    "ship bottom": (39.643, -74.180), "plumsted": (40.055, -74.490),
+    "lakehurst": (40.015, -74.311), "island heights": (39.942, -74.150),
+    "bay head": (40.071, -74.046), "mantoloking": (40.040, -74.050),
+    "whiting": (39.947, -74.380),
+    # passaic
+    "paterson": (40.917, -74.172), "clifton": (40.858, -74.164),
+    "passaic": (40.857, -74.128), "wayne": (40.925, -74.277),
+    "west milford": (41.131, -74.367), "little falls": (40.869, -74.208),
+    "totowa": (40.905, -74.210), "woodland park": (40.890, -74.195),
+    "hawthorne": (40.949, -74.154), "haledon": (40.936, -74.186),
+    "north haledon": (40.955, -74.186), "prospect park": (40.937, -74.174),
+    "pompton lakes": (41.005, -74.291), "ringwood": (41.113, -74.245),
+    "wanaque": (41.038, -74.294), "bloomingdale": (40.999, -74.327),
+    # salem
+    "salem": (39.572, -75.467), "pennsville": (39.654, -75.517),
+    "carneys point": (39.711, -75.470), "penns grove": (39.729, -75.468),
+    "woodstown": (39.652, -75.328), "pilesgrove": (39.665, -75.300),
+    "pittsgrove": (39.546, -75.130),
+    # somerset
+    "bridgewater": (40.594, -74.605), "somerville": (40.574, -74.610),
+    "bound brook": (40.568, -74.538), "south bound brook": (40.553, -74.531),
+    "hillsborough": (40.500, -74.635), "bernards": (40.680, -74.550),
+    "basking ridge": (40.706, -74.549), "bernardsville": (40.719, -74.569),
+    "north plainfield": (40.630, -74.428), "manville": (40.541, -74.588),
+    "raritan": (40.569, -74.633), "branchburg": (40.580, -74.700),
+    "green brook": (40.602, -74.483), "watchung": (40.638, -74.451),
+    "montgomery": (40.426, -74.678), "skillman": (40.418, -74.708),
+    "somerset": (40.498, -74.489), "martinsville": (40.602, -74.559),
+    # sussex
+    "newton": (41.058, -74.753), "sparta": (41.033, -74.639),
+    "vernon": (41.198, -74.483), "hopatcong": (40.933, -74.659),
+    "hardyston": (41.125, -74.560), "byram": (40.946, -74.719),
+    "andover": (40.986, -74.742), "hamburg": (41.153, -74.576),
+    "wantage": (41.240, -74.626), "stanhope": (40.903, -74.709),
+    "sussex": (41.209, -74.608), "branchville": (41.146, -74.753),
+    # union
+    "elizabeth": (40.664, -74.211), "union": (40.698, -74.263),
+    "plainfield": (40.634, -74.407), "linden": (40.622, -74.245),
+    "westfield": (40.659, -74.347), "rahway": (40.608, -74.278),
+    "cranford": (40.658, -74.300), "summit": (40.716, -74.365),
+    "hillside": (40.695, -74.230), "roselle": (40.652, -74.259),
+    "roselle park": (40.665, -74.268), "springfield": (40.700, -74.322),
+    "scotch plains": (40.655, -74.390), "clark": (40.621, -74.312),
+    "berkeley heights": (40.676, -74.437), "kenilworth": (40.676, -74.291),
+    "new providence": (40.698, -74.401), "mountainside": (40.672, -74.357),
+    "fanwood": (40.641, -74.384), "garwood": (40.652, -74.323),
+    "winfield": (40.645, -74.285),
+    # warren
+    "phillipsburg": (40.694, -75.190), "hackettstown": (40.854, -74.829),
+    "belvidere": (40.830, -75.078), "blairstown": (40.982, -74.959),
+    "lopatcong": (40.707, -75.155), "independence": (40.880, -74.880),
+    "allamuchy": (40.922, -74.810), "knowlton": (40.930, -75.040),
+    "oxford": (40.803, -74.989),
+}
+
+_HOUSE = re.compile(r"(\d+)\s*(.*)")
+_UNITS = {u.lower() for u in UNIT_DESIGNATORS.values()}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# GEOCODING
+# ═══════════════════════════════════════════════════════════════════════════════
+@lru_cache(maxsize=65536)
+def street_key(street):
+    """``(street name, house number)`` of a street line, unit dropped:
+    ``"12 North Main Street Apt 2"`` -> ``("n main st", 12)``; the house
+    number is 0 when there is none."""
+    m = _HOUSE.match(str(street).strip())
+    house, name = (int(m[1]), m[2]) if m else (0, str(street))
+    words = normalize_street(f"0 {name}").lower().split()[1:]     # as if numbered
+    units = [i for i, w in enumerate(words) if w in _UNITS]
+    return " ".join(words[:units[0]] if units else words), house
+
+
+@lru_cache(maxsize=None)
+def load_streets(path=None):
+    """``{(town, street name): (lat, lon)}`` from a ``town,street,lat,lon`` CSV
+    (``$PRIMESTATE_STREETS`` by default); empty when none is configured."""
+    path = path or os.environ.get(STREETS_ENV)
+    if not path:
+        return {}
+    table = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            town = town_keys(row["town"])[1]
+            table[town, street_key(row["street"])[0]] = (float(row["lat"]), float(row["lon"]))
+    return table
+
+
+@lru_cache(maxsize=65536)
+def geocode(address, county=""):
+    """``(lat, lon, precision)`` of a ``"street, town, NJ"`` address, or ``None``.
+
+    ``precision`` is ``"street"``, ``"town"`` or ``"county"``.  A town from
+    another county than ``county`` is not trusted: the county centroid wins,
+    and a town name shared by several counties is only placed given ``county``.
+    """
+    parts = [p.strip() for p in str(address).split(",")]
+    street, town = parts[0], parts[1] if len(parts) > 2 else ""
+    county = county_key(county, town)
+    for key in town_keys(town):
+        home = MUNICIPALITY_COUNTY.get(key) or county and SHARED_TOWN_COUNTY.get(key)
+        if key in TOWN_CENTROIDS and home and (not county or home == county):
+            point = load_streets().get((town_keys(town)[1], street_key(street)[0]))
+            if point is not None:
+                return point + ("street",)
+            return TOWN_CENTROIDS[key] + ("town",)
+    if county in COUNTY_CENTROIDS:
+        return COUNTY_CENTROIDS[county] + ("county",)
+    return None
+
+
+def miles(lat1, lon1, lat2, lon2):
+    """Distance in miles (equirectangular at the pair's mean latitude; <0.1% off
+    the great-circle distance at canvassing ranges)."""
+    dx = (lon2 - lon1) * math.cos(math.radians((lat1 + lat2) / 2))
+    return math.hypot(dx, lat2 - lat1) * MILES_PER_DEGREE
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# GRID INDEX
+# ═══════════════════════════════════════════════════════════════════════════════
+# neighbour cells that, with a cell itself, visit each adjacent pair once
+_HALF_RING = ((1, -1), (1, 0), (1, 1), (0, 1))
+
+
+def _cell(point, size):
+    """Grid cell of a ``(lat, lon)`` point for squares of ``size`` miles."""
+    lat, lon = point
+    return (math.floor(lon * _X_SCALE * MILES_PER_DEGREE / size),
+            math.floor(lat * MILES_PER_DEGREE / size))
+
+
+class GridIndex:
+    """Items on a grid of ``cell_miles`` squares; items at one point share a slot."""
+
+    def __init__(self, cell_miles=CELL_MILES):
+        self.cell = cell_miles
+        self._cells = defaultdict(set)        # (cx, cy) -> points
+        self._slots = {}                      # (lat, lon) -> [items]
+        self._where = {}                      # item -> (lat, lon)
+
+    def _cell(self, point):
+        return _cell(point, self.cell)
+
+    def add(self, item, lat, lon):
+        if item in self._where:
+            self.remove(item)
+        point = (lat, lon)
+        self._where[item] = point
+        slot = self._slots.get(point)
+        if slot is None:
+            slot = self._slots[point] = []
+            self._cells[self._cell(point)].add(point)
+        slot.append(item)
+
+    def remove(self, item):
+        point = self._where.pop(item, None)
+        if point is None:
+            return
+        slot = self._slots[point]
+        slot.remove(item)
+        if not slot:
+            del self._slots[point]
+            cell = self._cell(point)
+            self._cells[cell].discard(point)
+            if not self._cells[cell]:
+                del self._cells[cell]
+
+    def __len__(self):
+        return len(self._where)
+
+    def __contains__(self, item):
+        return item in self._where
+
+    def position(self, item):
+        return self._where.get(item)
+
+    def _points_within(self, lat, lon, radius):
+        """``(distance, point)`` for slots within ``radius`` miles."""
+        cx, cy = self._cell((lat, lon))
+        ring = int(radius * _RING_SLACK / self.cell) + 1
+        found = []
+        for x in range(cx - ring, cx + ring + 1):
+            for y in range(cy - ring, cy + ring + 1):
+                for point in self._cells.get((x, y), ()):
+                    d = miles(lat, lon, *point)
+                    if d <= radius:
+                        found.append((d, point))
+        return found
+
+    def within(self, lat, lon, radius):
+        """``(miles, item)`` for every item within ``radius`` miles, nearest first."""
+        found = sorted(self._points_within(lat, lon, radius))
+        return [(d, item) for d, point in found for item in self._slots[point]]
+
+    def clusters(self, radius=CLUSTER_MILES):
+        """Single-linkage groups of items: chains of points ``radius`` miles apart
+        or closer.  Largest group first."""
+        parent = {point: point for point in self._slots}
+
+        def root(p):
+            while parent[p] != p:
+                parent[p] = parent[parent[p]]
+                p = parent[p]
+            return p
+
+        def join(p, q):
+            a, b = root(p), root(q)
+            if a != b and miles(*p, *q) <= radius:
+                parent[a] = b
+
+        # cells just wider than the radius: every link is within one neighbour
+        buckets = defaultdict(list)
+        for point in self._slots:
+            buckets[_cell(point, radius * _RING_SLACK)].append(point)
+        for (x, y), points in buckets.items():
+            for i, p in enumerate(points):
+                for q in points[i + 1:]:
+                    join(p, q)
+            for dx, dy in _HALF_RING:
+                for q in buckets.get((x + dx, y + dy), ()):
+                    for p in points:
+                        join(p, q)
+        groups = defaultdict(list)
+        for point, slot in self._slots.items():
+            groups[root(point)] += slot
+        return sorted(groups.values(), key=len, reverse=True)
+
+    def route(self, start=None):
+        """Every item in nearest-neighbour order, from ``start``'s point (default:
+        the first item added).  Items sharing a point keep their insertion order.
+
+        Each step searches rings of cells outwards from the current point and
+        stops once no unsearched cell can hold anything closer; when the rings
+        get wider than the occupied cells left, it scans those instead.
+        """
+        if not self._slots:
+            return []
+        cells = {cell: set(points) for cell, points in self._cells.items()}
+        point = self._where[start] if start in self._where else next(iter(self._slots))
+        order = []
+        while True:
+            order += self._slots[point]
+            cell = self._cell(point)
+            cells[cell].discard(point)
+            if not cells[cell]:
+                del cells[cell]
+            if not cells:
+                return order
+            point = self._nearest(point, cells)
+
+    def _nearest(self, point, cells):
+        lat, lon = point
+        cx, cy = self._cell(point)
+        best = (math.inf, None)
+        ring = 0
+        while True:
+            if (2 * ring + 1) ** 2 > 4 * len(cells):
+                # sparse leftovers: scanning every occupied cell is cheaper
+                candidates = (p for ps in cells.values() for p in ps)
+                return min(((miles(lat, lon, *p), p) for p in candidates), default=best)[1]
+            for x in range(cx - ring, cx + ring + 1):
+                for y in ((cy - ring, cy + ring) if abs(x - cx) < ring else range(cy - ring, cy + ring + 1)):
+                    for p in cells.get((x, y), ()):
+                        d = miles(lat, lon, *p)
+                        if d < best[0]:
+                            best = (d, p)
+            # anything beyond this ring is at least ring cells away
+            if best[1] is not None and best[0] <= ring * self.cell / _RING_SLACK:
+                return best[1]
+            ring += 1
+
+
+def route_miles(points):
+    """Length in miles of a route through ``(lat, lon)`` points in order."""
+    return sum(miles(*a, *b) for a, b in zip(points, points[1:]))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# QUEUE CANVASS INDEX
+# ═══════════════════════════════════════════════════════════════════════════════
+class CanvassIndex:
+    """Geocoded positions of the queued leads in a :class:`GridIndex`.
+
+    Built once, then patched from :meth:`WorkQueue.changes_since` whenever
+    the queue's membership version moves.  Leads that cannot be placed (no
+    known town or county) are left out of the grid.
+    """
+
+    def __init__(self, queue, cell_miles=CELL_MILES):
+        self.queue = queue
+        self.grid = GridIndex(cell_miles)
+        self._lock = threading.Lock()
+        self._leads = {}          # seq -> lead ID
+        self._info = {}           # lead ID -> (precision, loss date, street key)
+        self._version = None
+        self._last_seq = 0
+        self._routes = {}         # (start, lead IDs) -> order, cleared after changes
+
+    def refresh(self):
+        """Bring the grid up to date with the queue; one read when unchanged."""
+        if self._version is not None and self.queue.version() == self._version:
+            return
+        with self._lock:
+            version, seqs, rows = self.queue.changes_since(self._last_seq)
+            if version == self._version:
+                return
+            for seq in self._leads.keys() - set(seqs):
+                lead_id = self._leads.pop(seq)
+                self.grid.remove(lead_id)
+                self._info.pop(lead_id, None)
+            for seq, lead_id, data in rows:
+                self._leads[seq] = lead_id
+                self._last_seq = max(self._last_seq, seq)
+                found = geocode(data.get("full_address", ""), data.get("county_key") or data.get("county", ""))
+                if found is None:
+                    continue
+                lat, lon, precision = found
+                self.grid.add(lead_id, lat, lon)
+                self._info[lead_id] = (precision, data.get("date", ""), street_key(data.get("address_part", "")))
+            self._version = version
+            self._routes = {}
+
+    def __len__(self):
+        self.refresh()
+        return len(self.grid)
+
+    def position(self, lead_id):
+        """``(lat, lon, precision)`` of a queued lead, or ``None``."""
+        self.refresh()
+        point = self.grid.position(lead_id)
+        return point + (self._info[lead_id][0],) if point else None
+
+    def near(self, lead_id, radius=NEARBY_MILES):
+        """``(miles, lead ID)`` for other queued leads within ``radius`` miles."""
+        self.refresh()
+        point = self.grid.position(lead_id)
+        if point is None:
+            return []
+        with self._lock:
+            return [(d, other) for d, other in self.grid.within(*point, radius) if other != lead_id]
+
+    def _subgrid(self, lead_ids):
+        """A grid of just ``lead_ids``, each point's leads by street and house number."""
+        grid = GridIndex(self.grid.cell)
+        placed = [lid for lid in lead_ids if lid in self.grid]
+        for lid in sorted(placed, key=lambda lid: self._info[lid][2]):
+            grid.add(lid, *self.grid.position(lid))
+        return grid
+
+    def route(self, lead_ids, start=None):
+        """``lead_ids`` in canvass order: nearest-neighbour from ``start`` (default:
+        the first of them that is placed), then any that could not be placed, as
+        given."""
+        self.refresh()
+        lead_ids = list(lead_ids)
+        key = (start, tuple(lead_ids))
+        with self._lock:
+            order = self._routes.get(key)
+            if order is None:
+                if start is None:
+                    start = next((lid for lid in lead_ids if lid in self.grid), None)
+                order = self._subgrid(lead_ids).route(start)
+                placed = set(order)
+                order += [lid for lid in lead_ids if lid not in placed]
+                self._routes = {key: order}       # one route per queue version and filter
+        return order
+
+    def day_clusters(self, lead_ids, radius=CLUSTER_MILES):
+        """``{loss date: [[lead IDs], …]}``: each day's placed leads grouped into
+        chains no more than ``radius`` miles apart, largest first."""
+        self.refresh()
+        by_day = defaultdict(list)
+        with self._lock:
+            for lid in lead_ids:
+                if lid in self.grid:
+                    by_day[self._info[lid][1]].append(lid)
+            return {day: self._subgrid(ids).clusters(radius) for day, ids in by_day.items()}
+
+    def route_miles(self, lead_ids):
+        """Driving-distance floor: straight-line miles along ``lead_ids`` in order."""
+        self.refresh()
+        return route_miles([self.grid.position(lid) for lid in lead_ids if lid in self.grid])
+
+
+@per_path
+def get_canvass_index(path=STORE_FILE):
+    return CanvassIndex(get_work_queue(path))
@@ -0,0 +1,140 @@
+"""Timers, counters and per-run breakdowns for the hot paths.
+
+``timed(name)`` is a context manager and a decorator; every use feeds a
+rolling window of samples per name (for p50/p95) and, while a :class:`Run`
+is active in the current context, that run's breakdown.  Flat scripts such
+as the Streamlit app mark their sections with :meth:`Run.lap` instead of
+re-indenting them.  ``metrics.count(name)`` keeps plain counters (cache
+hits and misses).  A run can also be profiled with cProfile and dumped to
+disk when it turns out slow.
+
+Everything is process-wide and thread-safe; the cost per sample is a
+couple of ``perf_counter`` calls and a deque append.
+"""
+import contextvars
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from datetime import datetime
+
+WINDOW = 200          # samples kept per name for percentiles
+PROFILE_DIR = "profiles"
+
+
+class Metrics:
+    """Rolling timing samples and counters, keyed by name."""
+
+    def __init__(self, window=WINDOW):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+        self._counters = defaultdict(int)
+
+    def observe(self, name, seconds):
+        with self._lock:
+            self._samples[name].append(seconds)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self._counters[name] += n
+
+    def counters(self):
+        with self._lock:
+            return dict(self._counters)
+
+    def percentiles(self):
+        """``{name: (samples, p50, p95, last)}`` in seconds, over the rolling window."""
+        with self._lock:
+            windows = {name: list(s) for name, s in self._samples.items() if s}
+        out = {}
+        for name, samples in windows.items():
+            ordered = sorted(samples)
+            n = len(ordered)
+            out[name] = (n, ordered[n // 2], ordered[min(n - 1, int(n * 0.95))], samples[-1])
+        return out
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._counters.clear()
+
+
+metrics = Metrics()
+_current = contextvars.ContextVar("primestate_run", default=None)
+
+
+@contextmanager
+def timed(name):
+    """Time the block (or, as ``@timed(name)``, every call of the function)."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - t0
+        metrics.observe(name, elapsed)
+        run = _current.get()
+        if run is not None:
+            run.spans.append((name, elapsed))
+
+
+class Run:
+    """One pass of a script: section laps, nested ``timed`` spans, optional profile."""
+
+    def __init__(self, name, profile=False):
+        self.name = name
+        self.spans = []           # (name, seconds) from timed() inside this run
+        self.laps = []            # (section, seconds) from lap()
+        self.total = None
+        self.profile_path = None
+        self._profiler = None
+        if profile:
+            import cProfile       # only when asked: keeps the module cheap to import
+            self._profiler = cProfile.Profile()
+        self._token = _current.set(self)
+        self._start = self._mark = time.perf_counter()
+        if self._profiler is not None:
+            self._profiler.enable()
+
+    @property
+    def active(self):
+        return self.total is None
+
+    def lap(self, section):
+        """Close the section that started at the previous lap (or run start)."""
+        now = time.perf_counter()
+        self.laps.append((section, now - self._mark))
+        metrics.observe(f"{self.name}.{section}", now - self._mark)
+        self._mark = now
+
+    def finish(self, dump_over=None, directory=PROFILE_DIR):
+        """Stop the run; if profiled and slower than ``dump_over`` seconds, dump stats.
+
+        Returns the run's total seconds.
+        """
+        if not self.active:
+            return self.total
+        if self._profiler is not None:
+            self._profiler.disable()
+        self.total = time.perf_counter() - self._start
+        metrics.observe(self.name, self.total)
+        try:
+            _current.reset(self._token)
+        except ValueError:        # finished from another context
+            _current.set(None)
+        if self._profiler is not None and dump_over is not None and self.total >= dump_over:
+            os.makedirs(directory, exist_ok=True)
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+            self.profile_path = os.path.join(directory, f"{self.name}-{stamp}.prof")
+            self._profiler.dump_stats(self.profile_path)
+        self._profiler = None
+        return self.total
+
+    def breakdown(self):
+        """Laps plus aggregated ``timed`` spans: ``[(name, seconds, calls), …]``."""
+        spans = {}
+        for name, seconds in self.spans:
+            total, calls = spans.get(name, (0.0, 0))
+            spans[name] = (total + seconds, calls + 1)
+        return ([(name, sec, 1) for name, sec in self.laps]
+                + [(name, sec, calls) for name, (sec, calls) in spans.items()])
@@ -0,0 +1,305 @@
+"""In-process background jobs with a persistent job table.
+
+Long work (big imports, bulk updates, exports) runs on a bounded thread pool
+instead of the Streamlit script thread.  Every job has a row in a ``jobs``
+table of the store's SQLite file, so its status, progress, timings and
+result outlive the page that started it: after a refresh the UI just reads
+the row again.  Queued jobs go to the owner with the fewest running (then
+the one served longest ago), under a per-owner cap, so one adjuster's batch
+of exports can't hold every worker.
+
+Cancellation is cooperative: a job function reports progress through
+:meth:`Job.progress`, which raises :class:`JobCancelled` once a cancel has
+been requested.  Each job records the runner that owns it (its process ID
+and a per-runner ID) and a heartbeat that runner refreshes while the job is
+queued or running.  Several processes can share the table (Streamlit
+servers, the CLI), so a runner starting up marks another's jobs
+``interrupted`` only once that process is gone or its heartbeat has gone
+stale; their work is not resumed.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .instrument import metrics
+from .store import STORE_FILE, SQLiteFile, per_path
+
+MAX_WORKERS = 2        # jobs running at once, across everyone
+PER_OWNER = 1          # jobs running at once for one owner
+KEEP_DAYS = 7          # finished jobs (and their files) kept this long
+PROGRESS_EVERY = 0.25  # seconds between progress writes to the table
+HEARTBEAT_EVERY = 10   # seconds between heartbeats of a runner's active jobs
+STALE_AFTER = 60       # a job whose heartbeat is older than this has lost its runner
+
+_ACTIVE = "status IN ('queued', 'running')"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          TEXT PRIMARY KEY,
+    kind        TEXT NOT NULL,
+    label       TEXT NOT NULL,
+    owner       TEXT NOT NULL,
+    status      TEXT NOT NULL,      -- queued, running, done, failed, cancelled, interrupted
+    done        INTEGER NOT NULL DEFAULT 0,
+    total       INTEGER,
+    message     TEXT,
+    result      TEXT,               -- JSON returned by the job function
+    file        TEXT,               -- path of a file the job wrote, if any
+    error       TEXT,
+    cancel      INTEGER NOT NULL DEFAULT 0,
+    created_at  REAL NOT NULL,
+    started_at  REAL,
+    finished_at REAL,
+    runner      TEXT,               -- ID of the JobRunner that owns the job
+    pid         INTEGER,            -- process of that runner
+    heartbeat   REAL                -- last time that runner vouched for the job
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_created ON jobs(created_at);
+"""
+
+_COLS = ("id", "kind", "label", "owner", "status", "done", "total", "message", "result",
+         "file", "error", "cancel", "created_at", "started_at", "finished_at")
+
+
+def _alive(pid):
+    """Whether process ``pid`` still exists on this machine."""
+    if os.name == "nt":
+        return True     # signal 0 is CTRL_C_EVENT there; the heartbeat decides
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True     # someone else's process, but alive
+    return True
+
+
+class JobCancelled(Exception):
+    """Raised inside a job by :meth:`Job.progress` after a cancel request."""
+
+
+class Job:
+    """Handle passed to a running job function."""
+
+    def __init__(self, runner, job_id):
+        self.id = job_id
+        self._runner = runner
+        self._last_write = 0.0
+        self.file = None
+
+    @property
+    def cancelled(self):
+        return self.id in self._runner._cancelled
+
+    def progress(self, done, total=None, message=None):
+        """Record progress (throttled); raises :class:`JobCancelled` if cancelled."""
+        if self.cancelled:
+            raise JobCancelled()
+        now = time.monotonic()
+        if now - self._last_write >= PROGRESS_EVERY or (total is not None and done >= total):
+            self._last_write = now
+            self._runner._set(self.id, done=done, total=total, message=message, heartbeat=time.time())
+
+    def output_path(self, suffix):
+        """Path for a file result (e.g. ``"xlsx"``), kept with the job until purged."""
+        os.makedirs(self._runner.directory, exist_ok=True)
+        self.file = os.path.join(self._runner.directory, f"{self.id}.{suffix}")
+        return self.file
+
+
+class JobRunner(SQLiteFile):
+    """Bounded pool running ``fn(job, *args)`` jobs, recorded in the ``jobs`` table."""
+
+    def __init__(self, path, workers=MAX_WORKERS, per_owner=PER_OWNER):
+        super().__init__(path)
+        self.directory = f"{path}-jobs"
+        self.per_owner = per_owner
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="primestate-job")
+        self._workers = workers
+        self._lock = threading.Lock()
+        self._pending = {}          # owner -> deque of (job_id, kind, fn, args)
+        self._running = {}          # owner -> running count
+        self._served = {}           # owner -> dispatch number of their latest job
+        self._dispatched = 0
+        self._started = set()       # IDs handed to the pool and not finished
+        self._cancelled = set()
+        self.id = uuid.uuid4().hex[:12]
+        self._migrate(self._connect())
+        self.interrupt_orphans()
+        self.purge()
+        threading.Thread(target=self._beat, name="primestate-job-heartbeat", daemon=True).start()
+
+    def _migrate(self, conn):
+        """Create the table and add the owner columns to tables from older builds."""
+        conn.executescript(_SCHEMA)
+        cols = {r[1] for r in conn.execute("PRAGMA table_info(jobs)")}
+        for col, kind in (("runner", "TEXT"), ("pid", "INTEGER"), ("heartbeat", "REAL")):
+            if col not in cols:
+                conn.execute(f"ALTER TABLE jobs ADD COLUMN {col} {kind}")
+
+    def interrupt_orphans(self):
+        """Mark queued or running jobs whose runner is gone ``interrupted``; returns how many.
+
+        A runner is gone when its process has exited or its heartbeat is older
+        than :data:`STALE_AFTER` (jobs from older builds have none).
+        """
+        now = time.time()
+        with self.transaction() as conn:
+            orphans = [
+                (now, job_id)
+                for job_id, pid, beat in conn.execute(f"SELECT id, pid, heartbeat FROM jobs WHERE {_ACTIVE}")
+                if beat is None or beat < now - STALE_AFTER
+                or (pid is not None and pid != os.getpid() and not _alive(pid))
+            ]
+            conn.executemany(
+                "UPDATE jobs SET status = 'interrupted', finished_at = ? WHERE id = ?", orphans
+            )
+        return len(orphans)
+
+    def _beat(self):
+        """Refresh the heartbeat of this runner's active jobs, for as long as the process lives."""
+        while True:
+            time.sleep(HEARTBEAT_EVERY)
+            with self._lock:
+                if not (self._pending or self._started):
+                    continue
+            try:
+                self.heartbeat()
+            except Exception:   # a busy or locked file; the next beat tries again
+                pass
+
+    def heartbeat(self):
+        """Vouch for this runner's queued and running jobs now."""
+        with self.transaction() as conn:
+            conn.execute(f"UPDATE jobs SET heartbeat = ? WHERE runner = ? AND {_ACTIVE}",
+                         (time.time(), self.id))
+
+    # ── submitting ──────────────────────────────────────────────────────────
+    def submit(self, kind, fn, *args, owner="", label=None):
+        """Queue ``fn(job, *args)``; returns the job ID at once."""
+        job_id, now = uuid.uuid4().hex[:12], time.time()
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, label, owner, status, created_at, runner, pid, heartbeat) "
+                "VALUES (?, ?, ?, ?, 'queued', ?, ?, ?, ?)",
+                (job_id, kind, label or kind, owner, now, self.id, os.getpid(), now),
+            )
+        with self._lock:
+            self._pending.setdefault(owner, deque()).append((job_id, kind, fn, args))
+            self._dispatch()
+        return job_id
+
+    def _dispatch(self):
+        """Start queued jobs while workers are free (caller holds the lock)."""
+        while sum(self._running.values()) < self._workers:
+            ready = [o for o in self._pending if self._running.get(o, 0) < self.per_owner]
+            if not ready:
+                return      # nobody with queued jobs has a free slot
+            owner = min(ready, key=lambda o: (self._running.get(o, 0), self._served.get(o, -1)))
+            job_id, kind, fn, args = self._pending[owner].popleft()
+            if not self._pending[owner]:
+                del self._pending[owner]
+            self._dispatched += 1
+            self._served[owner] = self._dispatched
+            self._running[owner] = self._running.get(owner, 0) + 1
+            self._started.add(job_id)
+            self._pool.submit(self._run, owner, job_id, kind, fn, args)
+
+    def _run(self, owner, job_id, kind, fn, args):
+        job = Job(self, job_id)
+        started = time.time()
+        try:
+            if job.cancelled:
+                raise JobCancelled()
+            self._set(job_id, status="running", started_at=started, heartbeat=started)
+            result = fn(job, *args)
+            self._set(job_id, status="done", result=json.dumps(result), file=job.file,
+                      finished_at=time.time())
+        except JobCancelled:
+            if job.file and os.path.exists(job.file):
+                os.remove(job.file)         # a partial export is no use to anyone
+            self._set(job_id, status="cancelled", finished_at=time.time())
+        except Exception as exc:
+            self._set(job_id, status="failed", error=f"{type(exc).__name__}: {exc}",
+                      finished_at=time.time())
+        finally:
+            metrics.observe(f"job.{kind}", time.time() - started)
+            with self._lock:
+                self._started.discard(job_id)
+                self._cancelled.discard(job_id)
+                self._running[owner] -= 1
+                if not self._running[owner]:
+                    del self._running[owner]
+                self._dispatch()
+
+    def cancel(self, job_id):
+        """Ask a job to stop; a queued job is dropped before it starts."""
+        with self._lock:
+            for owner, queued in list(self._pending.items()):
+                for item in queued:
+                    if item[0] == job_id:
+                        queued.remove(item)
+                        if not queued:
+                            del self._pending[owner]
+                        self._set(job_id, status="cancelled", cancel=1, finished_at=time.time())
+                        return
+            if job_id not in self._started:
+                return      # already finished
+            self._cancelled.add(job_id)
+        self._set(job_id, cancel=1)
+
+    # ── reading ─────────────────────────────────────────────────────────────
+    def _set(self, job_id, **fields):
+        fields = {k: v for k, v in fields.items() if v is not None}
+        sets = ", ".join(f"{k} = ?" for k in fields)
+        with self.transaction() as conn:
+            conn.execute(f"UPDATE jobs SET {sets} WHERE id = ?", (*fields.values(), job_id))
+
+    @staticmethod
+    def _row(row):
+        job = dict(zip(_COLS, row))
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        start, end = job["started_at"], job["finished_at"]
+        job["wait"] = (start or end or time.time()) - job["created_at"]
+        job["seconds"] = ((end or time.time()) - start) if start else 0.0
+        return job
+
+    def get(self, job_id):
+        """The job as a dict (plus ``wait`` / ``seconds`` timings), or ``None``."""
+        row = self._connect().execute(
+            f"SELECT {', '.join(_COLS)} FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return self._row(row) if row else None
+
+    def recent(self, limit=10, owner=None):
+        """Newest jobs first, optionally one owner's."""
+        sql, args = f"SELECT {', '.join(_COLS)} FROM jobs", []
+        if owner is not None:
+            sql += " WHERE owner = ?"
+            args.append(owner)
+        sql += " ORDER BY created_at DESC LIMIT ?"
+        args.append(limit)
+        return [self._row(r) for r in self._connect().execute(sql, args)]
+
+    def purge(self, days=KEEP_DAYS):
+        """Drop finished jobs older than ``days`` and their files; returns how many."""
+        cutoff = time.time() - days * 86400
+        with self.transaction() as conn:
+            old = conn.execute(
+                f"SELECT id, file FROM jobs WHERE created_at < ? AND NOT {_ACTIVE}",
+                (cutoff,),
+            ).fetchall()
+            conn.executemany("DELETE FROM jobs WHERE id = ?", ((job_id,) for job_id, _ in old))
+        for _, path in old:
+            if path and os.path.exists(path):
+                os.remove(path)
+        return len(old)
+
+
+@per_path
+def get_job_runner(path=STORE_FILE):
+    return JobRunner(path)
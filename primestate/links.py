@@ -0,0 +1,50 @@
+"""Owner-lookup helpers: county tax-record pages and people-search links."""
+import urllib.parse
+
+from .normalize import NJ_COUNTIES, clean_city, county_key, normalize_street
+
+# County-specific search pages; the rest use the statewide tax-board system,
+# which selects the county by its two-digit code (ctb01 … ctb21).
+DEFAULT_TAX = "https://taxrecords-nj.com/pub/cgi/prc6.cgi?menu=index&ms_user=ctb00"
+COUNTY_TAX_URLS = {
+    county: f"https://taxrecords-nj.com/pub/cgi/prc6.cgi?menu=index&ms_user=ctb{code}"
+    for county, code in NJ_COUNTIES.items()
+}
+COUNTY_TAX_URLS.update({
+    "essex":    "https://www.taxdatahub.com/6229fbf0ce4aef911f9de7bc/Essex%20County",
+    "camden":   "https://www.taxdatahub.com/60d088c3d3501df3b0e45ddb/camden-county",
+    "mercer":   "https://pip.mercercounty.org/mapsearch",
+    "ocean":    "https://tax.co.ocean.nj.us/frmTaxBoardTaxListSearch",
+    "monmouth":"https://tax1.co.monmouth.nj.us/cgi-bin/prc6.cgi?menu=index&ms_user=monm&passwd=data&mode=11",
+    "morris":   "https://mcweb1.co.morris.nj.us/MCTaxBoard/SearchTaxRecords.aspx",
+})
+
+
+def get_county_tax_url(county, city=""):
+    return COUNTY_TAX_URLS.get(county_key(county, city), DEFAULT_TAX)
+
+
+def clean_name(raw):
+    if "," in raw:
+        parts = raw.split(",", 1)
+        name = f"{parts[1].strip()} {parts[0].strip()}"
+    else:
+        name = raw.strip()
+    # Tax records often return ALL CAPS — convert to proper title case
+    return name.title()
+
+
+def get_search_links(name, address, city, state, is_commercial):
+    clean = clean_name(name)
+    s_name, s_city, s_state = (urllib.parse.quote(x) for x in (clean, clean_city(city), state))
+    if is_commercial:
+        return {
+            "Google Business": f"https://www.google.com/search?q={s_name}+{urllib.parse.quote(normalize_street(address))}+phone",
+            "NJ Entity Search": "https://www.njportal.com/DOR/BusinessNameSearch/Search/BusinessName",
+        }
+    h_name = clean.replace(" ", "-")
+    return {
+        "TruePeopleSearch": f"https://www.truepeoplesearch.com/results?name={s_name}&citystatezip={s_city},+{s_state}",
+        "FastPeopleSearch": f"https://www.fastpeoplesearch.com/name/{s_name}_{s_city}-{s_state}",
+        "ThatsThem": f"https://thatsthem.com/name/{h_name}/{s_state}",
+    }
@@ -0,0 +1,283 @@
+"""Address, municipality and county normalisation for NJ leads.
+
+Everything here is precompiled at import and memoised with ``lru_cache``:
+county feeds repeat the same handful of counties, towns and streets, so
+after warm-up a lookup is a cache hit.  The parser calls these once per
+lead and stores the results on the lead, so the UI, dedupe index and save
+path reuse them instead of normalising again on every rerun.
+"""
+import re
+from functools import lru_cache
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# COUNTIES & MUNICIPALITIES
+# ═══════════════════════════════════════════════════════════════════════════════
+# All 21 NJ counties with their state county code (01 Atlantic … 21 Warren).
+NJ_COUNTIES = {
+    "atlantic": "01", "bergen": "02", "burlington": "03", "camden": "04",
+    "cape may": "05", "cumberland": "06", "essex": "07", "gloucester": "08",
+    "hudson": "09", "hunterdon": "10", "mercer": "11", "middlesex": "12",
+    "monmouth": "13", "morris": "14", "ocean": "15", "passaic": "16",
+    "salem": "17", "somerset": "18", "sussex": "19", "union": "20",
+    "warren": "21",
+}
+
+# Municipality (or well-known place name) -> county.  Names shared by towns in
+# several counties (Franklin, Washington, Monroe, ...) are left out so an
+# ambiguous town never picks the wrong county; the ones we still want to place
+# are in _SHARED_NAMES below.
+_MUNICIPALITIES = {
+    "atlantic": [
+        "Atlantic City", "Egg Harbor Township", "Egg Harbor City", "Galloway",
+        "Hammonton", "Pleasantville", "Absecon", "Ventnor City", "Ventnor",
+        "Margate City", "Margate", "Somers Point", "Brigantine", "Mays Landing",
+        "Northfield", "Linwood",
+    ],
+    "bergen": [
+        "Hackensack", "Teaneck", "Fort Lee", "Fair Lawn", "Garfield", "Englewood",
+        "Paramus", "Ridgewood", "Lodi", "Cliffside Park", "Bergenfield", "Mahwah",
+        "Lyndhurst", "Rutherford", "Ramsey", "Elmwood Park", "Hasbrouck Heights",
+        "Saddle Brook", "Little Ferry", "Ridgefield Park", "Ridgefield",
+        "Palisades Park", "Dumont", "Westwood", "New Milford", "Tenafly", "Closter",
+        "Oradell", "Wyckoff", "Franklin Lakes", "Edgewater", "North Arlington",
+        "East Rutherford", "Wallington", "Cresskill", "Glen Rock", "Leonia",
+    ],
+    "burlington": [
+        "Burlington", "Mount Laurel", "Evesham", "Marlton", "Willingboro",
+        "Moorestown", "Pemberton", "Cinnaminson", "Medford", "Maple Shade",
+        "Delran", "Bordentown", "Lumberton", "Mount Holly", "Riverside", "Palmyra",
+        "Browns Mills", "Florence", "Burlington Township",
+    ],
+    "camden": [
+        "Camden", "Cherry Hill", "Gloucester Township", "Pennsauken", "Winslow",
+        "Voorhees", "Collingswood", "Haddonfield", "Lindenwold", "Bellmawr",
+        "Haddon Heights", "Haddon Township", "Audubon", "Berlin", "Pine Hill",
+        "Gloucester City", "Runnemede", "Sicklerville", "Blackwood", "Somerdale",
+        "Stratford", "Magnolia",
+    ],
+    "cape may": [
+        "Cape May", "Ocean City", "Wildwood", "North Wildwood", "Wildwood Crest",
+        "Lower Township", "Middle Township", "Upper Township", "Cape May Court House",
+        "Sea Isle City", "Avalon", "Stone Harbor", "Villas", "Rio Grande",
+    ],
+    "cumberland": [
+        "Vineland", "Millville", "Bridgeton", "Upper Deerfield", "Commercial Township",
+        "Maurice River", "Fairton",
+    ],
+    "essex": [
+        "Newark", "East Orange", "Irvington", "Bloomfield", "West Orange", "Orange",
+        "Montclair", "Belleville", "Livingston", "Nutley", "Maplewood",
+        "South Orange", "Millburn", "Short Hills", "Verona", "Cedar Grove",
+        "West Caldwell", "Caldwell", "North Caldwell", "Glen Ridge", "Roseland",
+        "Essex Fells",
+    ],
+    "gloucester": [
+        "Deptford", "West Deptford", "Glassboro", "Mantua", "Woodbury", "Paulsboro",
+        "Pitman", "Williamstown", "Sewell", "Logan", "Swedesboro", "Franklinville",
+        "Mullica Hill", "Clayton", "Woolwich", "National Park", "Westville",
+        "Turnersville",
+    ],
+    "hudson": [
+        "Jersey City", "Hoboken", "Bayonne", "Union City", "West New York",
+        "North Bergen", "Kearny", "Secaucus", "Weehawken", "Guttenberg",
+        "East Newark",
+    ],
+    "hunterdon": [
+        "Flemington", "Clinton", "Raritan Township", "Readington", "Lambertville",
+        "Tewksbury", "High Bridge", "Whitehouse Station", "Frenchtown",
+    ],
+    "mercer": [
+        "Trenton", "Hamilton Square", "Mercerville", "Ewing", "Lawrenceville",
+        "Princeton", "West Windsor", "East Windsor", "Robbinsville", "Hightstown",
+        "Pennington",
+    ],
+    "middlesex": [
+        "New Brunswick", "Edison", "Woodbridge", "Perth Amboy", "Piscataway",
+        "Old Bridge", "Sayreville", "East Brunswick", "North Brunswick",
+        "South Brunswick", "Plainsboro", "Carteret", "South Plainfield", "Metuchen",
+        "Highland Park", "South River", "Spotswood", "Milltown", "Dunellen",
+        "Middlesex", "Jamesburg", "Iselin", "Colonia", "Avenel", "Fords", "Parlin",
+        "Kendall Park", "South Amboy",
+    ],
+    "monmouth": [
+        "Asbury Park", "Long Branch", "Freehold", "Middletown", "Howell", "Marlboro",
+        "Manalapan", "Neptune", "Neptune City", "Wall", "Red Bank", "Holmdel",
+        "Hazlet", "Keansburg", "Eatontown", "Tinton Falls", "Aberdeen", "Matawan",
+        "Belmar", "Colts Neck", "Rumson", "Keyport", "Union Beach", "Manasquan",
+        "Spring Lake", "Shrewsbury", "Oceanport", "Highlands", "Atlantic Highlands",
+        "Englishtown", "Ocean Grove", "Sea Girt",
+    ],
+    "morris": [
+        "Morristown", "Parsippany", "Parsippany-Troy Hills", "Dover", "Rockaway",
+        "Randolph", "Mount Olive", "Montville", "Denville", "Roxbury", "Hanover",
+        "East Hanover", "Madison", "Chatham", "Florham Park", "Boonton", "Pequannock",
+        "Jefferson", "Butler", "Kinnelon", "Lincoln Park", "Mendham", "Morris Plains",
+        "Morris Township", "Wharton", "Netcong", "Mine Hill", "Whippany",
+        "Cedar Knolls", "Budd Lake", "Lake Hiawatha", "Long Valley",
+        "Mountain Lakes", "Riverdale", "Chester", "Succasunna", "Ledgewood",
+    ],
+    "ocean": [
+        "Toms River", "Lakewood", "Brick", "Jackson", "Manchester", "Berkeley",
+        "Stafford", "Barnegat", "Little Egg Harbor", "Point Pleasant",
+        "Point Pleasant Beach", "Lacey", "Forked River", "Bayville", "Seaside Heights",
+        "Seaside Park", "Lavallette", "Beachwood", "Ocean Gate", "Pine Beach",
+        "Tuckerton", "Manahawkin", "Waretown", "Long Beach", "Beach Haven",
+        "Surf City", "Ship Bottom", "Plumsted", "Lakehurst", "Island Heights",
+        "Bay Head", "Mantoloking", "Whiting",
+    ],
+    "passaic": [
+        "Paterson", "Clifton", "Passaic", "Wayne", "West Milford", "Little Falls",
+        "Totowa", "Woodland Park", "Hawthorne", "Haledon", "North Haledon",
+        "Prospect Park", "Pompton Lakes", "Ringwood", "Wanaque", "Bloomingdale",
+    ],
+    "salem": [
+        "Salem", "Pennsville", "Carneys Point", "Penns Grove", "Woodstown",
+        "Pilesgrove", "Pittsgrove",
+    ],
+    "somerset": [
+        "Bridgewater", "Somerville", "Bound Brook", "South Bound Brook",
+        "Hillsborough", "Bernards", "Basking Ridge", "Bernardsville",
+        "North Plainfield", "Manville", "Raritan", "Branchburg", "Green Brook",
+        "Watchung", "Montgomery", "Skillman", "Somerset", "Martinsville",
+    ],
+    "sussex": [
+        "Newton", "Sparta", "Vernon", "Hopatcong", "Hardyston", "Byram", "Andover",
+        "Hamburg", "Wantage", "Stanhope", "Sussex", "Branchville",
+    ],
+    "union": [
+        "Elizabeth", "Plainfield", "Linden", "Westfield", "Rahway", "Cranford",
+        "Summit", "Hillside", "Roselle", "Roselle Park",
+        "Scotch Plains", "Clark", "Berkeley Heights", "Kenilworth", "New Providence",
+        "Mountainside", "Fanwood", "Garwood", "Winfield",
+    ],
+    "warren": [
+        "Phillipsburg", "Hackettstown", "Belvidere", "Blairstown", "Lopatcong",
+        "Independence", "Allamuchy", "Knowlton", "Oxford",
+    ],
+}
+MUNICIPALITY_COUNTY = {
+    town.lower(): county for county, towns in _MUNICIPALITIES.items() for town in towns
+}
+
+# Towns whose name is also a municipality in another county (Hamilton in
+# Atlantic, Union in Hunterdon, Springfield in Burlington, ...).  They never
+# decide a lead's county; they are only trusted alongside the county they are
+# listed under here.
+_SHARED_NAMES = {
+    "essex": ["Fairfield"],
+    "hudson": ["Harrison"],
+    "mercer": ["Hamilton", "Hamilton Township", "Lawrence", "Hopewell"],
+    "union": ["Union", "Springfield"],
+}
+SHARED_TOWN_COUNTY = {
+    town.lower(): county for county, towns in _SHARED_NAMES.items() for town in towns
+}
+
+_COUNTY_NOISE = re.compile(r"[^a-z ]+|\b(county|cnty|co)\b")
+_SPACE = re.compile(r"\s+")
+_TOWN_NOISE = re.compile(r"\b(twp|township|boro|borough|city|town|village)\b\.?")
+
+
+@lru_cache(maxsize=1024)
+def county_key(county, city=""):
+    """Canonical lower-case county name (``"cape may"``), or ``""`` if unknown.
+
+    Accepts feed spellings like ``"ESSEX CO."`` and falls back to the city
+    when the county field is empty or unrecognised.
+    """
+    c = _SPACE.sub(" ", _COUNTY_NOISE.sub(" ", str(county).lower())).strip()
+    if c in NJ_COUNTIES:
+        return c
+    return next((MUNICIPALITY_COUNTY[t] for t in town_keys(city) if t in MUNICIPALITY_COUNTY), "")
+
+
+@lru_cache(maxsize=1024)
+def town_keys(city):
+    """Lower-case spellings to look a town up by: as written, then without
+    Twp/Boro/City ("Hamilton Twp." -> ``("hamilton twp", "hamilton")``)."""
+    town = _SPACE.sub(" ", str(city).lower().replace(".", "")).strip()
+    return town, _SPACE.sub(" ", _TOWN_NOISE.sub(" ", town)).strip()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# STREET ADDRESSES
+# ═══════════════════════════════════════════════════════════════════════════════
+# USPS Publication 28 abbreviations for the suffixes seen in county feeds.
+STREET_SUFFIXES = {
+    "street": "St", "st": "St", "str": "St",
+    "avenue": "Ave", "ave": "Ave", "av": "Ave",
+    "road": "Rd", "rd": "Rd",
+    "drive": "Dr", "dr": "Dr",
+    "lane": "Ln", "ln": "Ln",
+    "court": "Ct", "ct": "Ct",
+    "place": "Pl", "pl": "Pl",
+    "boulevard": "Blvd", "blvd": "Blvd",
+    "terrace": "Ter", "ter": "Ter",
+    "parkway": "Pkwy", "pkwy": "Pkwy",
+    "highway": "Hwy", "hwy": "Hwy",
+    "circle": "Cir", "cir": "Cir",
+    "square": "Sq", "sq": "Sq",
+    "turnpike": "Tpke", "tpke": "Tpke",
+    "way": "Way",
+    "trail": "Trl", "trl": "Trl",
+    "route": "Rte", "rte": "Rte",
+}
+DIRECTIONALS = {
+    "north": "N", "south": "S", "east": "E", "west": "W",
+    "n": "N", "s": "S", "e": "E", "w": "W",
+    "ne": "NE", "nw": "NW", "se": "SE", "sw": "SW",
+}
+UNIT_DESIGNATORS = {
+    "apartment": "Apt", "apt": "Apt", "unit": "Unit", "suite": "Ste", "ste": "Ste",
+    "floor": "Fl", "fl": "Fl", "room": "Rm", "rm": "Rm", "#": "Unit",
+}
+
+_TOKEN = re.compile(r"#|[A-Za-z0-9'-]+")
+_ORDINAL = re.compile(r"\d+(st|nd|rd|th)", re.IGNORECASE)
+
+
+def _word(token):
+    low = token.lower()
+    if _ORDINAL.fullmatch(token):
+        return low
+    if token[0].isdigit():
+        return token.upper()
+    return token[0].upper() + low[1:]
+
+
+@lru_cache(maxsize=65536)
+def normalize_street(address):
+    """Canonical display form of a street line: ``"12 N Main St Unit 4B"``."""
+    tokens = _TOKEN.findall(str(address))
+    out = []
+    for i, tok in enumerate(tokens):
+        low = tok.lower()
+        if low in UNIT_DESIGNATORS:
+            out.append(UNIT_DESIGNATORS[low])
+        elif low in DIRECTIONALS and (i == 1 or i == len(tokens) - 1):
+            # "12 North Main St" / "12 Main St North", not "North Ave"
+            out.append(DIRECTIONALS[low])
+        elif low in STREET_SUFFIXES and i > 1:
+            out.append(STREET_SUFFIXES[low])
+        else:
+            out.append(_word(tok))
+    return " ".join(out)
+
+
+@lru_cache(maxsize=65536)
+def address_key(address):
+    """Case/punctuation/abbreviation-insensitive key for matching addresses.
+
+    Works on a street line or a full ``"street, city, NJ"`` address; unit
+    designators collapse to ``#`` so ``Apt 4`` and ``Unit 4`` match.
+    """
+    parts = [normalize_street(p) for p in str(address).split(",")]
+    key = " ".join(p for p in parts if p).lower()
+    for word in ("apt", "unit", "ste", "fl", "rm"):
+        key = key.replace(f" {word} ", " # ")
+    return key
+
+
+def clean_city(city):
+    """Title-case a municipality name from the feed (``"TOMS RIVER"``)."""
+    return " ".join(_word(w) for w in str(city).split())
@@ -0,0 +1,270 @@
+"""Outreach texts (SMS, email subject and body) for one lead or a whole batch.
+
+:data:`TEMPLATES` are the Step 3 texts as ``str.format`` templates over a
+queued lead's fields plus ``owner``.  Each is compiled once into literal runs
+and field names, with the company constants (``{co[nj_phone]}``) folded into
+the literals.  One lead is a string join; a batch is one Arrow
+``binary_join_element_wise`` per template over the columns of a DataFrame,
+a single pass in C++ however many leads there are.
+
+:func:`write_outreach` renders ready leads ``CHUNK`` rows at a time and
+streams each chunk to CSV (Arrow's writer, ~30x pandas' ``to_csv``), JSON
+Lines, or a ZIP of ``.eml`` drafts with the Letter of Representation
+attached.  :func:`ready_leads` reads them from the store with a cursor and
+counts them with COUNT queries, so memory holds one chunk (plus the IDs of
+the saved leads already written) however big the batch.  pandas,
+pyarrow and the email package are imported on first use.
+"""
+import string
+import time
+from dataclasses import dataclass
+from itertools import islice
+
+from .batch import lor_filename, write_lor_zip
+from .company import CO
+from .instrument import timed
+from .links import clean_name
+from .pdf import render_lor_pdf
+
+CHUNK = 5000                             # leads rendered and written per step
+# saved leads not contacted yet ("New": leads ingested by older CLI builds)
+READY_STATUSES = ("New", "Processed")
+
+TEMPLATES = {
+    "sms": (
+        "Hello {owner}, this is {co[short]} reaching out regarding the "
+        "{type} loss at {address_part}. Please call us at "
+        "{co[nj_phone]} — Case #{case}."
+    ),
+    "email_subject": "Letter of Representation — {type} at {address_part} (Case #{case})",
+    "email_body": (
+        "Dear {owner},\n\n"
+        "Please find attached our Letter of Representation regarding "
+        "the loss at your property on {date}.\n\n"
+        "Should you have any questions, please do not hesitate to contact "
+        "our office at {co[nj_phone]} or reply to this email.\n\n"
+        "Respectfully,\n"
+        "{co[president]}\n"
+        "{co[name]}\n"
+        "{co[nj_phone]} | {co[email]}"
+    ),
+}
+
+# one ready lead, as :func:`outreach_leads` yields it
+LEAD_FIELDS = ["lead_id", "owner", "type", "address_part", "case", "date",
+               "full_address", "phone", "email"]
+# columns of the CSV / JSONL exports
+OUTPUT = ["lead_id", "owner", "full_address", "case", "phone", "email",
+          "sms", "email_subject", "email_body"]
+FORMATS = {"csv": "csv", "jsonl": "jsonl", "eml": "zip"}   # format -> file suffix
+
+_FORMATTER = string.Formatter()
+_EMAIL = LEAD_FIELDS.index("email")
+
+
+class Template:
+    """A ``str.format`` template split once into ``(literal, field)`` pieces."""
+
+    def __init__(self, text):
+        self.text = text
+        self.parts = []
+        literal = ""
+        for lit, field, spec, conversion in _FORMATTER.parse(text):
+            literal += lit
+            if field is None:
+                continue
+            if spec or conversion:
+                raise ValueError(f"{text!r}: format specs and conversions are not supported")
+            if field.startswith("co["):
+                literal += str(_FORMATTER.get_field(field, (), {"co": CO})[0])
+            else:
+                self.parts.append((literal, field))
+                literal = ""
+        self.tail = literal
+        self.fields = [field for _, field in self.parts]
+
+    def render(self, values):
+        """Fill the template from a mapping of field values."""
+        return "".join(literal + str(values[field]) for literal, field in self.parts) + self.tail
+
+    def render_frame(self, frame):
+        """Fill the template for every row of ``frame`` (string columns named by
+        field); returns an Arrow string array."""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        text = pa.large_string()
+        if not self.parts:
+            return pa.array([self.tail] * len(frame), text)
+        pieces = []
+        for literal, field in self.parts:
+            if literal:
+                pieces.append(pa.scalar(literal, text))
+            pieces.append(pa.array(frame[field], text))
+        if self.tail:
+            pieces.append(pa.scalar(self.tail, text))
+        return pc.binary_join_element_wise(*pieces, pa.scalar("", text))
+
+
+COMPILED = {name: Template(text) for name, text in TEMPLATES.items()}
+
+
+def lead_messages(values):
+    """``{"sms", "email_subject", "email_body"}`` texts for one lead's field values."""
+    return {name: template.render(values) for name, template in COMPILED.items()}
+
+
+@timed("outreach.render")
+def render_frame(frame):
+    """Add the message columns to a frame of ``LEAD_FIELDS``, in place.
+
+    The SMS is left blank for leads without a phone and the email without an
+    address.
+    """
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    missing = {contact: pc.equal(pa.array(frame[contact]), "") for contact in ("phone", "email")}
+    for name, template in COMPILED.items():
+        blank = missing["phone" if name == "sms" else "email"]
+        rendered = pc.if_else(blank, "", template.render_frame(frame))
+        frame[name] = pd.Series(pd.arrays.ArrowStringArray(rendered), index=frame.index)
+    return frame
+
+
+def outreach_leads(queue, saved, statuses=READY_STATUSES):
+    """Yield ``LEAD_FIELDS`` tuples for every lead ready for outreach.
+
+    Ready means an owner name plus a phone or email, and for saved
+    ``COLUMNS``-keyed records a Status in ``statuses``.  ``queue`` is
+    anything whose ``items()`` yields ``(lead_id, lead)`` pairs (the contact
+    comes from an owner lookup); a lead both saved and queued is taken from
+    the saved record.
+    """
+    seen = set()
+    for rec in saved:
+        if not rec.get("Homeowner") or not (rec.get("Phone") or rec.get("Email")):
+            continue
+        if statuses is not None and rec.get("Status") not in statuses:
+            continue
+        seen.add(rec["Lead ID"])
+        address = rec["Address"] or ""
+        yield (rec["Lead ID"], clean_name(rec["Homeowner"]), rec["Type"] or "",
+               address.split(",", 1)[0], rec["Case Number"] or "", rec["Date"] or "",
+               address, rec["Phone"] or "", rec["Email"] or "")
+    for lead_id, lead in queue.items():
+        found = lead.get("enriched", {})
+        if lead_id in seen or not lead.get("owner") or not (found.get("phone") or found.get("email")):
+            continue
+        yield (lead_id, lead["owner"], lead["type"], lead["address_part"], lead["case"],
+               lead.get("date", ""), lead["full_address"], found.get("phone", ""), found.get("email", ""))
+
+
+def ready_leads(store, queue=None, statuses=READY_STATUSES, email_only=False):
+    """``(leads, total)``: :func:`outreach_leads` over ``store`` and ``queue``,
+    read lazily, and how many it yields, from COUNT queries.
+
+    ``total`` counts a lead that is both saved and queued twice; saving a lead
+    from the workspace takes it off the queue, so that is rare.
+    """
+    total = store.count_ready(statuses, email_only)
+    if queue is not None:
+        total += queue.count_ready(email_only)
+    return outreach_leads(queue or {}, store.ready(statuses, email_only), statuses), total
+
+
+@dataclass
+class OutreachStats:
+    leads: int = 0                # leads rendered (an SMS and an email each)
+    files: int = 0                # .eml drafts written (eml format only)
+    skipped: int = 0              # .eml drafts left out: their letter failed to render
+    render_seconds: float = 0.0   # filling the templates
+    seconds: float = 0.0          # rendering plus writing (and letters, for eml)
+
+    @property
+    def per_sec(self):
+        return self.leads / self.render_seconds if self.render_seconds else 0.0
+
+
+def _frames(leads, stats, chunk_size):
+    """Rendered DataFrames of ``chunk_size`` leads at a time."""
+    import pandas as pd
+
+    leads = iter(leads)
+    for chunk in iter(lambda: list(islice(leads, chunk_size)), []):
+        frame = pd.DataFrame.from_records(chunk, columns=LEAD_FIELDS)
+        t0 = time.perf_counter()
+        render_frame(frame)
+        stats.render_seconds += time.perf_counter() - t0
+        stats.leads += len(frame)
+        yield frame
+
+
+def _eml_chunk(chunk, print_date):
+    """``(file name, .eml bytes)`` drafts with the letter attached, for ``write_lor_zip``."""
+    from email.message import EmailMessage
+    from email.utils import formataddr
+
+    out = []
+    for owner, address, case, loss_date, email, subject, body in chunk:
+        msg = EmailMessage()
+        msg["From"] = formataddr((CO["name"], CO["email"]))
+        msg["To"] = formataddr((owner, email))
+        msg["Subject"] = subject
+        msg["X-Unsent"] = "1"      # mail clients open the file as a draft to send
+        msg.set_content(body)
+        msg.add_attachment(render_lor_pdf(owner, address, case, loss_date, print_date),
+                           maintype="application", subtype="pdf", filename=lor_filename(case, owner))
+        out.append((f"{case}_{owner.replace(' ', '_')}.eml", msg.as_bytes()))
+    return out
+
+
+def write_outreach(leads, target, fmt="csv", chunk_size=CHUNK, workers=None, progress=None,
+                   total=None):
+    """Render ``LEAD_FIELDS`` tuples and write them to the file at ``target``.
+
+    ``fmt`` is ``"csv"`` or ``"jsonl"`` (one row of ``OUTPUT`` per lead) or
+    ``"eml"``: a ZIP with one draft per lead that has an email, letter
+    attached (rendered in worker processes as :func:`write_lor_zip` does).
+    ``progress(done, total)`` is called after each chunk.  With ``total``
+    given (for ``"eml"``, of the leads with an email), ``leads`` may be an
+    iterator and is consumed a chunk at a time, as :func:`ready_leads`
+    returns it.  Returns :class:`OutreachStats`.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown outreach format {fmt!r} (expected one of {', '.join(FORMATS)})")
+    if fmt == "eml":
+        leads = (lead for lead in leads if lead[_EMAIL])
+    if total is None:
+        leads = list(leads)
+        total = len(leads)
+    stats = OutreachStats()
+    t0 = time.perf_counter()
+    if fmt == "eml":
+        drafts = (
+            row for frame in _frames(leads, stats, chunk_size)
+            for row in frame[["owner", "full_address", "case", "date", "email",
+                              "email_subject", "email_body"]].itertuples(index=False, name=None)
+        )
+        written = write_lor_zip(drafts, target, workers=workers, progress=progress,
+                                render=_eml_chunk, total=total)
+        stats.files, stats.skipped = written.letters, written.skipped
+    elif fmt == "csv":
+        import pyarrow as pa
+        import pyarrow.csv
+
+        schema = pa.schema([(c, pa.string()) for c in OUTPUT])
+        with pyarrow.csv.CSVWriter(target, schema) as writer:
+            for frame in _frames(leads, stats, chunk_size):
+                writer.write_table(pa.Table.from_pandas(frame[OUTPUT], preserve_index=False).cast(schema))
+                if progress:
+                    progress(stats.leads, total)
+    else:
+        with open(target, "w", encoding="utf-8") as f:
+            for frame in _frames(leads, stats, chunk_size):
+                f.write(frame[OUTPUT].to_json(orient="records", lines=True, force_ascii=False))
+                if progress:
+                    progress(stats.leads, total)
+    stats.seconds = time.perf_counter() - t0
+    return stats
@@ -0,0 +1,143 @@
+"""Parsers for the pipe-delimited county lead feeds.
+
+A feed is a sequence of lead lines followed by their loss-date line::
+
+    NJ | Essex | Newark | 123 Main St | Fire | Desc | #12345
+    01/15/2026 10:42 AM
+
+Two front ends share the same rules:
+
+* :func:`iter_leads` streams ``{"id", "data"}`` dicts one lead at a time
+  from a string, an uploaded file or any iterable of lines.
+* :func:`parse_frame` / :func:`iter_frames` return the same fields as a
+  columnar DataFrame, built in bounded chunks, for bulk imports.
+
+Lines that look like feed records but can't be paired up are counted in a
+:class:`ParseStats` instead of being dropped silently.
+"""
+import io
+import re
+from dataclasses import dataclass
+from itertools import islice
+
+from .normalize import address_key, county_key
+
+DATE_RE = re.compile(r"\d{2}/\d{2}/\d{4}")
+
+FIELDS = ["state", "county", "city", "address_part", "full_address",
+          "type", "desc", "case", "date",
+          # normalised once here and reused downstream (see normalize.py)
+          "county_key", "address_key"]
+
+
+@dataclass
+class ParseStats:
+    lines: int = 0       # non-blank lines seen
+    leads: int = 0       # leads emitted
+    malformed: int = 0   # short pipe lines, lead lines without a date, dates without a lead
+    skipped: int = 0     # free text that is neither a lead nor a date line
+
+    def merge(self, other):
+        self.lines += other.lines
+        self.leads += other.leads
+        self.malformed += other.malformed
+        self.skipped += other.skipped
+
+
+def iter_lines(source):
+    """Yield text lines lazily from a str, bytes, file object or iterable."""
+    if isinstance(source, str):
+        source = io.StringIO(source)
+    elif isinstance(source, (bytes, bytearray)):
+        source = io.StringIO(source.decode("utf-8", errors="replace"))
+    for line in source:
+        if isinstance(line, (bytes, bytearray)):
+            line = line.decode("utf-8", errors="replace")
+        yield line
+
+
+def lead_id(date, full_address, case):
+    return f"{date} — {full_address} — {case}"
+
+
+def _iter_rows(source, stats):
+    """Core scanner: yield one tuple per lead, ordered like ``FIELDS``."""
+    date_match = DATE_RE.match
+    current = keys = None
+    for line in iter_lines(source):
+        line = line.strip()
+        if not line:
+            continue
+        stats.lines += 1
+        if "|" in line and "NJ" in line:
+            parts = [p.strip() for p in line.split("|")]
+            n = len(parts)
+            if n < 4:
+                stats.malformed += 1
+                continue
+            if current is not None:
+                stats.malformed += 1   # previous lead never got its date line
+            last = parts[-1]
+            full = f"{parts[3]}, {parts[2]}, {parts[0]}"
+            current = (
+                parts[0], parts[1], parts[2], parts[3], full,
+                parts[4] if n > 4 else "Unknown",
+                parts[5] if n > 5 else "",
+                last.replace("#", "") if "#" in last else "Pending",
+            )
+            keys = (county_key(parts[1], parts[2]), address_key(full))
+        elif date_match(line):
+            if current is None:
+                stats.malformed += 1
+                continue
+            stats.leads += 1
+            yield current + (line.split(" ", 1)[0],) + keys
+            current = None
+        else:
+            stats.skipped += 1
+    if current is not None:
+        stats.malformed += 1
+
+
+def iter_leads(source, stats=None):
+    """Stream leads from ``source`` as ``{"id": ..., "data": {...}}`` dicts."""
+    stats = stats if stats is not None else ParseStats()
+    for row in _iter_rows(source, stats):
+        yield {"id": lead_id(row[8], row[4], row[7]), "data": dict(zip(FIELDS, row))}
+
+
+def parse_bulk_text(text, stats=None):
+    """Parse a pasted feed into a list of leads (see :func:`iter_leads`)."""
+    return list(iter_leads(text, stats))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# COLUMNAR (pandas) MODE
+# ═══════════════════════════════════════════════════════════════════════════════
+def _to_frame(rows):
+    import pandas as pd
+
+    frame = pd.DataFrame.from_records(rows, columns=FIELDS)
+    frame.insert(0, "id", frame["date"] + " — " + frame["full_address"] + " — " + frame["case"])
+    return frame
+
+
+def iter_frames(source, chunk_rows=100_000, stats=None):
+    """Yield DataFrames of at most ``chunk_rows`` leads; memory is bounded by one chunk."""
+    stats = stats if stats is not None else ParseStats()
+    rows = _iter_rows(source, stats)
+    while True:
+        chunk = list(islice(rows, chunk_rows))
+        if not chunk:
+            return
+        yield _to_frame(chunk)
+
+
+def parse_frame(source, stats=None):
+    """Parse a whole feed into one columnar DataFrame (``id`` + ``FIELDS``)."""
+    import pandas as pd
+
+    frames = list(iter_frames(source, stats=stats))
+    if not frames:
+        return pd.DataFrame(columns=["id"] + FIELDS)
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,232 @@
+"""Letter of Representation PDF (branded), with a content-addressed cache.
+
+The letter's bytes depend only on owner, address, case number, loss date and
+the print date, so :func:`create_lor_pdf` keys an in-process LRU cache on a
+hash of those inputs and Streamlit reruns become a dictionary lookup.  On a
+miss, the static letterhead and footer are replayed from content-stream ops
+recorded the first time they were laid out.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+
+from .company import CO
+from .instrument import timed
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PRE-RENDERED LETTERHEAD
+# ═══════════════════════════════════════════════════════════════════════════════
+# Graphics state restored after replaying a block, so the rest of the page
+# sees exactly what it would have after laying the block out.
+_STATE = (
+    "font_family", "font_style", "font_size_pt", "font_size", "underline",
+    "draw_color", "fill_color", "text_color", "color_flag", "line_width",
+    "x", "y",
+)
+_blocks = {}
+_blocks_lock = threading.Lock()
+
+
+class _Letterhead:
+    """Header/footer behaviour mixed into FPDF by :func:`_lor_pdf_class`."""
+
+    def _stamp(self, name, render):
+        """Lay out ``render`` once, then replay its recorded ops on later pages.
+
+        Blocks are keyed on the fonts already registered in the document, since
+        the recorded ops refer to fonts by their per-document index.
+        """
+        key = (name, self.page_no(), tuple(sorted((k, f["i"]) for k, f in self.fonts.items())))
+        block = _blocks.get(key)
+        if block is None:
+            before = set(self.fonts)
+            start = len(self.pages[self.page])
+            render()
+            current = next((k for k, f in self.fonts.items() if f is self.current_font), None)
+            block = (
+                self.pages[self.page][start:],
+                {k: dict(self.fonts[k]) for k in self.fonts if k not in before},
+                current,
+                {a: getattr(self, a) for a in _STATE},
+            )
+            with _blocks_lock:
+                _blocks[key] = block
+            return
+        ops, fonts, current, state = block
+        self.pages[self.page] += ops
+        # copies: _putfonts() stamps each document's object numbers into these
+        self.fonts.update({k: dict(f) for k, f in fonts.items()})
+        if current is not None:
+            self.current_font = self.fonts[current]
+        for attr, value in state.items():
+            setattr(self, attr, value)
+
+    def header(self):
+        self._stamp("header", self._header)
+
+    def footer(self):
+        self._stamp("footer", self._footer)
+
+    def _header(self):
+        self.set_font("Arial", "B", 14)
+        self.cell(0, 8, CO["name"].upper(), 0, 1, "C")
+        self.set_font("Arial", "", 9)
+        self.cell(0, 5, "Public Insurance Adjusters", 0, 1, "C")
+        self.cell(0, 4, CO["nj_address"], 0, 1, "C")
+        self.cell(0, 4, f'Tel: {CO["nj_phone"]}  |  Toll-Free: {CO["toll_free"]}  |  {CO["email"]}', 0, 1, "C")
+        self.cell(0, 4, CO["web"], 0, 1, "C")
+        # gold accent line
+        self.set_draw_color(201, 168, 76)
+        self.set_line_width(0.6)
+        self.line(15, self.get_y() + 3, 195, self.get_y() + 3)
+        self.ln(8)
+
+    def _footer(self):
+        self.set_y(-20)
+        self.set_draw_color(201, 168, 76)
+        self.set_line_width(0.3)
+        self.line(15, self.get_y(), 195, self.get_y())
+        self.ln(3)
+        self.set_font("Arial", "I", 7)
+        self.set_text_color(100, 116, 139)
+        self.cell(0, 4, CO["license_nj"], 0, 1, "C")
+        self.cell(0, 4, f'{CO["tagline"]}  |  Page {self.page_no()}', 0, 0, "C")
+
+
+@lru_cache(maxsize=None)
+def _lor_pdf_class():
+    """Build the FPDF subclass on first use, so importing this module stays cheap."""
+    from fpdf import FPDF
+
+    return type("LOR_PDF", (_Letterhead, FPDF), {"__module__": __name__})
+
+
+def __getattr__(name):
+    if name == "LOR_PDF":
+        return _lor_pdf_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@timed("pdf.render")
+def render_lor_pdf(owner_name, address, case_num, loss_date, print_date):
+    """Lay out the letter and return its bytes (no caching)."""
+    pdf = _lor_pdf_class()()
+    pdf.add_page()
+    pdf.set_text_color(30, 41, 59)
+    pdf.set_font("Arial", size=11)
+
+    # Date
+    pdf.cell(0, 8, f"Date: {print_date}", 0, 1)
+    pdf.ln(4)
+
+    # RE block
+    pdf.set_font("Arial", "B", 11)
+    pdf.cell(0, 6, "RE: Letter of Representation", 0, 1)
+    pdf.set_font("Arial", size=11)
+    pdf.cell(0, 5, f"Insured / Claimant: {owner_name}", 0, 1)
+    pdf.cell(0, 5, f"Property Address: {address}", 0, 1)
+    pdf.cell(0, 5, f"Date of Loss: {loss_date}", 0, 1)
+    pdf.cell(0, 5, f"Claim / Case No.: {case_num}", 0, 1)
+    pdf.ln(8)
+
+    # Salutation
+    pdf.multi_cell(0, 6, "To Whom It May Concern:")
+    pdf.ln(4)
+
+    # Body
+    body = (
+        f"Please be advised that {owner_name} has retained {CO['name']} "
+        "to represent them in the adjustment of their insurance claim for "
+        f"loss and damage sustained at the above-referenced property on {loss_date}.\n\n"
+        "We respectfully request that all future correspondence, telephone calls, "
+        "and communications regarding this claim be directed to our office at the "
+        "address listed above. We ask that you refrain from contacting the insured "
+        "directly regarding any matters pertaining to this claim.\n\n"
+        "Please acknowledge receipt of this letter at your earliest convenience "
+        "and provide the claim number assigned to this matter.\n\n"
+        "We look forward to working toward a fair and prompt resolution. "
+        "Thank you for your anticipated cooperation."
+    )
+    pdf.multi_cell(0, 6, body)
+    pdf.ln(12)
+
+    # Signature block
+    pdf.cell(0, 6, "Respectfully,", 0, 1)
+    pdf.ln(16)
+    pdf.set_font("Arial", "B", 11)
+    pdf.cell(0, 5, CO["name"], 0, 1)
+    pdf.set_font("Arial", "", 10)
+    pdf.cell(0, 5, f'{CO["president"]}, {CO["title"]}', 0, 1)
+    pdf.cell(0, 5, f'Tel: {CO["nj_phone"]}  |  {CO["email"]}', 0, 1)
+    pdf.ln(18)
+
+    # Client signature line
+    pdf.set_draw_color(30, 41, 59)
+    pdf.set_line_width(0.4)
+    pdf.cell(85, 0, "", "T")
+    pdf.ln(3)
+    pdf.set_font("Arial", "", 9)
+    pdf.cell(0, 5, f"Authorized Signature - {owner_name}", 0, 1)
+
+    return pdf.output(dest="S").encode("latin-1")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CONTENT-ADDRESSED CACHE
+# ═══════════════════════════════════════════════════════════════════════════════
+class PDFCache:
+    """Thread-safe LRU of rendered letters, bounded by entry count and bytes."""
+
+    def __init__(self, max_entries=256, max_bytes=32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    @staticmethod
+    def key(*fields):
+        return hashlib.sha256("\x1f".join(map(str, fields)).encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            data = self._data.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._data[key] = data
+            self._bytes += len(data)
+            while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+                _, evicted = self._data.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def __len__(self):
+        return len(self._data)
+
+
+pdf_cache = PDFCache()
+
+
+@timed("pdf.create_lor_pdf")
+def create_lor_pdf(owner_name, address, case_num, loss_date, print_date=None):
+    if print_date is None:
+        print_date = datetime.today().strftime("%B %d, %Y")
+    key = PDFCache.key(owner_name, address, case_num, loss_date, print_date)
+    data = pdf_cache.get(key)
+    if data is None:
+        data = render_lor_pdf(owner_name, address, case_num, loss_date, print_date)
+        pdf_cache.put(key, data)
+    return data
@@ -0,0 +1,746 @@
+"""SQLite lead store behind the dashboard's load/save helpers.
+
+Leads live in a single WAL-mode SQLite file keyed by ``Lead ID``.  A save is
+one indexed upsert inside a ``BEGIN IMMEDIATE`` transaction, so concurrent
+adjusters (Streamlit threads or separate processes) serialize on SQLite's
+file lock instead of overwriting each other's rows.  The legacy Excel
+workbook is imported once on first open and can be re-exported on demand.
+
+Every write transaction bumps a store-wide version counter and stamps the
+rows it touched with it, which lets :class:`LeadCache` keep one in-memory
+copy per process and refresh it incrementally instead of re-reading
+everything on a timer.  Deleted leads (moved to the archive) leave a
+tombstone stamped the same way, so the mirror drops them too.
+"""
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache, wraps
+
+from .instrument import metrics, timed
+
+# Default on-disk locations, relative to the working directory.
+STORE_FILE = "Primestate_Leads.sqlite3"
+DB_FILE = "Primestate_Leads_Database.xlsx"  # legacy workbook / export name
+
+COLUMNS = [
+    "Lead ID", "Date", "County", "Address", "Case Number",
+    "Type", "Homeowner", "Phone", "Email", "Status", "Notes",
+]
+
+# Spreadsheet header -> SQL column
+FIELDS = {
+    "Lead ID": "lead_id",
+    "Date": "date",
+    "County": "county",
+    "Address": "address",
+    "Case Number": "case_number",
+    "Type": "type",
+    "Homeowner": "homeowner",
+    "Phone": "phone",
+    "Email": "email",
+    "Status": "status",
+    "Notes": "notes",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS leads (
+    lead_id     TEXT PRIMARY KEY,
+    date        TEXT,
+    county      TEXT,
+    address     TEXT,
+    case_number TEXT,
+    type        TEXT,
+    homeowner   TEXT,
+    phone       TEXT,
+    email       TEXT,
+    status      TEXT,
+    notes       TEXT,
+    updated_at  TEXT NOT NULL,
+    rev         INTEGER NOT NULL DEFAULT 0,
+    loss_date   TEXT GENERATED ALWAYS AS ({loss_date}) VIRTUAL
+);
+CREATE INDEX IF NOT EXISTS ix_leads_county ON leads(county);
+CREATE INDEX IF NOT EXISTS ix_leads_status ON leads(status);
+CREATE INDEX IF NOT EXISTS ix_leads_case   ON leads(case_number);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('version', '0');
+CREATE TABLE IF NOT EXISTS lead_audit (
+    id          INTEGER PRIMARY KEY,
+    lead_id     TEXT NOT NULL,
+    field       TEXT NOT NULL,
+    old_value   TEXT,
+    new_value   TEXT,
+    changed_at  TEXT NOT NULL,
+    actor       TEXT,
+    rev         INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_audit_lead ON lead_audit(lead_id);
+CREATE TABLE IF NOT EXISTS removed_leads (
+    lead_id     TEXT PRIMARY KEY,
+    rev         INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_removed_rev ON removed_leads(rev);
+"""
+
+# Feed dates are MM/DD/YYYY; index them as ISO so ranges and sorting work.
+_LOSS_DATE = (
+    "CASE WHEN date GLOB '[0-9][0-9]/[0-9][0-9]/[0-9][0-9][0-9][0-9]*' "
+    "THEN substr(date, 7, 4) || '-' || substr(date, 1, 2) || '-' || substr(date, 4, 2) "
+    "ELSE date END"
+)
+
+# Trigram full-text index over the searchable columns, kept in sync by
+# triggers.  It follows leads.rowid, so rebuild it after any VACUUM.
+_FTS = """
+CREATE VIRTUAL TABLE leads_fts USING fts5(
+    homeowner, address, case_number,
+    content='leads', content_rowid='rowid', tokenize='trigram'
+);
+INSERT INTO leads_fts (leads_fts) VALUES ('rebuild');
+"""
+
+# The insert/update triggers stand down while upsert_many() holds the
+# 'fts_bulk' meta row and syncs the index itself in one rowid-ordered
+# statement: FTS5 flushes its pending terms whenever rowids arrive out of
+# order, which made trigger-driven bulk saves several times slower.
+_FTS_TRIGGERS = """
+CREATE TRIGGER leads_fts_ai AFTER INSERT ON leads
+WHEN NOT EXISTS (SELECT 1 FROM meta WHERE key = 'fts_bulk') BEGIN
+    INSERT INTO leads_fts (rowid, homeowner, address, case_number)
+    VALUES (new.rowid, new.homeowner, new.address, new.case_number);
+END;
+CREATE TRIGGER leads_fts_ad AFTER DELETE ON leads BEGIN
+    INSERT INTO leads_fts (leads_fts, rowid, homeowner, address, case_number)
+    VALUES ('delete', old.rowid, old.homeowner, old.address, old.case_number);
+END;
+CREATE TRIGGER leads_fts_au AFTER UPDATE OF homeowner, address, case_number ON leads
+WHEN NOT EXISTS (SELECT 1 FROM meta WHERE key = 'fts_bulk') BEGIN
+    INSERT INTO leads_fts (leads_fts, rowid, homeowner, address, case_number)
+    VALUES ('delete', old.rowid, old.homeowner, old.address, old.case_number);
+    INSERT INTO leads_fts (rowid, homeowner, address, case_number)
+    VALUES (new.rowid, new.homeowner, new.address, new.case_number);
+END;
+"""
+
+# Claim pipeline, in order; "advance" moves a lead one stage along.
+PIPELINE = ["Processed", "Contacted", "Signed", "Closed"]
+
+# Browser sort keys -> SQL column ("Date" sorts chronologically)
+SORTABLE = {
+    "Date": "loss_date",
+    "County": "county",
+    "Homeowner": "homeowner",
+    "Case Number": "case_number",
+    "Status": "status",
+    "Last Updated": "updated_at",
+}
+
+
+def _clean(value):
+    """Normalise a cell for SQLite (NaN/NaT from pandas -> NULL)."""
+    if type(value) is str:
+        return value
+    if value is None:
+        return None
+    if isinstance(value, float) and value != value:
+        return None
+    if hasattr(value, "isoformat") and not isinstance(value, str):
+        return str(value)
+    return value
+
+
+class SQLiteFile:
+    """Per-thread autocommit connections to one WAL-mode SQLite file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # autocommit mode; transactions are opened explicitly below
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            # 16 MB page cache; the 2 MB default thrashes the indexes on bulk saves
+            conn.execute("PRAGMA cache_size=-16384")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """Write transaction holding SQLite's reserved lock for its duration."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+def _per_version(method):
+    """Memoise a read-only query on the store's version.
+
+    Until the next committed write, asking again costs one ``meta`` lookup
+    instead of the query, which is what a Streamlit rerun mostly does.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        version = self.version()
+        with self._memo_lock:
+            if self._memo_version != version:
+                self._memo, self._memo_version = {}, version
+            elif key in self._memo:
+                metrics.count("store.memo_hit")
+                return self._memo[key]
+        value = method(self, *args, **kwargs)
+        with self._memo_lock:
+            if self._memo_version == version and len(self._memo) < 256:
+                self._memo[key] = value
+        return value
+
+    return wrapper
+
+
+class LeadStore(SQLiteFile):
+    """Thread-safe handle on the SQLite lead database."""
+
+    def __init__(self, path, legacy_xlsx=None):
+        super().__init__(path)
+        self._memo, self._memo_version, self._memo_lock = {}, None, threading.Lock()
+        self._migrate(self._connect())
+        if legacy_xlsx:
+            self._import_legacy(legacy_xlsx)
+
+    def _migrate(self, conn):
+        """Create the schema and bring databases from older builds up to date."""
+        conn.executescript(_SCHEMA.format(loss_date=_LOSS_DATE))
+        cols = {r[1] for r in conn.execute("PRAGMA table_xinfo(leads)")}
+        if "rev" not in cols:
+            conn.execute("ALTER TABLE leads ADD COLUMN rev INTEGER NOT NULL DEFAULT 0")
+        if "loss_date" not in cols:
+            conn.execute(f"ALTER TABLE leads ADD COLUMN loss_date TEXT GENERATED ALWAYS AS ({_LOSS_DATE}) VIRTUAL")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_leads_rev ON leads(rev)")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_leads_loss_date ON leads(loss_date)")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_leads_county_date ON leads(county, loss_date)")
+        self.fts = bool(conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'leads_fts'"
+        ).fetchone())
+        if not self.fts:
+            try:
+                conn.executescript("BEGIN IMMEDIATE;" + _FTS + _FTS_TRIGGERS + "COMMIT;")
+                self.fts = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5: text search falls back to LIKE
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+        elif "fts_bulk" not in conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'leads_fts_ai'"
+        ).fetchone()[0]:
+            conn.executescript(
+                "BEGIN IMMEDIATE;"
+                + "".join(f"DROP TRIGGER IF EXISTS leads_fts_{t};" for t in ("ai", "ad", "au"))
+                + _FTS_TRIGGERS + "COMMIT;"
+            )
+
+    @staticmethod
+    def _bump_version(conn):
+        """Advance the store version inside an open write transaction."""
+        conn.execute("UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'version'")
+        return int(conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0])
+
+    # ── writes ──────────────────────────────────────────────────────────────
+    def upsert(self, record):
+        """Insert or update one lead keyed by ``Lead ID``."""
+        self.upsert_many([record])
+
+    def upsert_many(self, records):
+        """Upsert many leads in a single transaction; returns the new version."""
+        records = list(records)
+        if not records:
+            return self.version()
+        now = datetime.now().isoformat(timespec="seconds")
+        # Group by column set so each shape is one executemany() call.
+        batches = {}
+        for rec in records:
+            cols = tuple(FIELDS[k] for k in COLUMNS if k in rec)
+            if "lead_id" not in cols:
+                raise KeyError("record is missing 'Lead ID'")
+            batches.setdefault(cols, []).append([_clean(rec[k]) for k in COLUMNS if k in rec])
+        ids = json.dumps([rec["Lead ID"] for rec in records])
+        match = "lead_id IN (SELECT value FROM json_each(?))"
+        with self.transaction() as conn:
+            rev = self._bump_version(conn)
+            if self.fts:
+                conn.execute("INSERT INTO meta (key, value) VALUES ('fts_bulk', '1')")
+                conn.execute(
+                    "INSERT INTO leads_fts (leads_fts, rowid, homeowner, address, case_number) "
+                    f"SELECT 'delete', rowid, homeowner, address, case_number FROM leads WHERE {match} "
+                    "ORDER BY rowid",
+                    (ids,),
+                )
+            for cols, rows in batches.items():
+                updates = ", ".join(f"{c}=excluded.{c}" for c in cols if c != "lead_id")
+                conn.executemany(
+                    f"INSERT INTO leads ({', '.join(cols)}, updated_at, rev) "
+                    f"VALUES ({', '.join('?' * len(cols))}, ?, ?) "
+                    f"ON CONFLICT(lead_id) DO UPDATE SET {updates}, "
+                    "updated_at=excluded.updated_at, rev=excluded.rev",
+                    (vals + [now, rev] for vals in rows),
+                )
+            if self.fts:
+                conn.execute(
+                    "INSERT INTO leads_fts (rowid, homeowner, address, case_number) "
+                    f"SELECT rowid, homeowner, address, case_number FROM leads WHERE {match} "
+                    "ORDER BY rowid",
+                    (ids,),
+                )
+                conn.execute("DELETE FROM meta WHERE key = 'fts_bulk'")
+        return rev
+
+    def update_leads(self, lead_ids, status=None, advance=False, notes=None,
+                     append_notes=True, actor=""):
+        """Change Status and/or Notes for many leads in one transaction.
+
+        ``status`` sets every lead to that stage; ``advance=True`` instead moves
+        each lead to the next ``PIPELINE`` stage.  ``notes`` is appended on a
+        new line (or replaces the notes with ``append_notes=False``).  One
+        ``lead_audit`` row is written per lead and field that actually changes.
+        Returns ``(version, changed_leads)``.
+        """
+        ids = json.dumps(list(lead_ids))
+        match = "lead_id IN (SELECT value FROM json_each(?))"
+        exprs = {}
+        if advance:
+            steps = " ".join("WHEN ? THEN ?" for _ in PIPELINE[:-1])
+            exprs["status"] = (
+                f"CASE status {steps} ELSE status END",
+                [v for pair in zip(PIPELINE, PIPELINE[1:]) for v in pair],
+            )
+        elif status is not None:
+            exprs["status"] = ("?", [status])
+        if notes:
+            if append_notes:
+                exprs["notes"] = ("CASE WHEN notes IS NULL OR notes = '' THEN ? "
+                                  "ELSE notes || char(10) || ? END", [notes, notes])
+            else:
+                exprs["notes"] = ("?", [notes])
+        if not exprs:
+            return self.version(), 0
+
+        now = datetime.now().isoformat(timespec="seconds")
+        changed = " OR ".join(f"{col} IS NOT ({expr})" for col, (expr, _) in exprs.items())
+        changed_args = [a for _, args in exprs.values() for a in args]
+        with self.transaction() as conn:
+            rev = self._bump_version(conn)
+            for col, (expr, args) in exprs.items():
+                conn.execute(
+                    "INSERT INTO lead_audit (lead_id, field, old_value, new_value, changed_at, actor, rev) "
+                    f"SELECT lead_id, ?, {col}, {expr}, ?, ?, ? FROM leads "
+                    f"WHERE {match} AND {col} IS NOT ({expr})",
+                    [col.title()] + args + [now, actor, rev, ids] + args,
+                )
+            sets = ", ".join(f"{col} = {expr}" for col, (expr, _) in exprs.items())
+            cur = conn.execute(
+                f"UPDATE leads SET {sets}, updated_at = ?, rev = ? WHERE {match} AND ({changed})",
+                changed_args + [now, rev, ids] + changed_args,
+            )
+        return rev, cur.rowcount
+
+    @contextmanager
+    def removing(self, lead_ids):
+        """Hand over leads for deletion: yields their rows, deletes them if the block succeeds.
+
+        The whole block runs in one write transaction, so no one can change
+        the rows between reading and deleting them, and an exception (say,
+        the archive write failing) leaves the store untouched.  Deleted leads
+        get a tombstone so :class:`LeadCache` mirrors drop them too.
+        """
+        ids = json.dumps(list(lead_ids))
+        match = "lead_id IN (SELECT value FROM json_each(?))"
+        sel = ", ".join(FIELDS[c] for c in COLUMNS)
+        with self.transaction() as conn:
+            rows = conn.execute(f"SELECT {sel} FROM leads WHERE {match} ORDER BY rowid", (ids,)).fetchall()
+            yield rows
+            rev = self._bump_version(conn)
+            conn.execute(
+                f"INSERT OR REPLACE INTO removed_leads (lead_id, rev) SELECT lead_id, ? FROM leads WHERE {match}",
+                (rev, ids),
+            )
+            conn.execute(f"DELETE FROM leads WHERE {match}", (ids,))
+
+    def vacuum(self):
+        """Give the pages freed by :meth:`removing` back to the filesystem.
+
+        VACUUM may renumber rowids, so the full-text index is rebuilt after it.
+        """
+        conn = self._connect()
+        conn.execute("VACUUM")
+        if self.fts:
+            with self.transaction() as conn:
+                conn.execute("INSERT INTO leads_fts (leads_fts) VALUES ('rebuild')")
+
+    def audit(self, lead_id):
+        """Status/Notes history for one lead, oldest first."""
+        return self._connect().execute(
+            "SELECT changed_at, field, old_value, new_value, actor FROM lead_audit "
+            "WHERE lead_id = ? ORDER BY id", (lead_id,)
+        ).fetchall()
+
+    # ── reads ───────────────────────────────────────────────────────────────
+    def version(self):
+        """Monotonic counter bumped by every committed write."""
+        return int(self._connect().execute(
+            "SELECT value FROM meta WHERE key = 'version'"
+        ).fetchone()[0])
+
+    def changes_since(self, rev):
+        """Return ``(version, rows, removed)`` for leads written after version ``rev``.
+
+        All three are read from one snapshot, so the rows (and the IDs of
+        leads removed since) are exactly the changes between ``rev`` and the
+        returned version.  ``rev=None`` returns every row and no removals.
+        """
+        sel = ", ".join(FIELDS[c] for c in COLUMNS)
+        conn = self._connect()
+        conn.execute("BEGIN")
+        try:
+            version = int(conn.execute(
+                "SELECT value FROM meta WHERE key = 'version'"
+            ).fetchone()[0])
+            removed = []
+            if rev is None:
+                rows = conn.execute(f"SELECT {sel} FROM leads ORDER BY rowid").fetchall()
+            else:
+                rows = conn.execute(
+                    f"SELECT {sel} FROM leads WHERE rev > ? ORDER BY rowid", (rev,)
+                ).fetchall()
+                removed = [r[0] for r in conn.execute(
+                    "SELECT lead_id FROM removed_leads WHERE rev > ?", (rev,)
+                )]
+        finally:
+            conn.execute("COMMIT")
+        return version, rows, removed
+
+    def count(self):
+        return self._connect().execute("SELECT COUNT(*) FROM leads").fetchone()[0]
+
+    @_per_version
+    def distinct(self, column):
+        """Sorted distinct non-empty values of a ``COLUMNS`` field (index scan).
+
+        Memoised per store version; treat the list as read-only.
+        """
+        col = FIELDS[column]
+        return [r[0] for r in self._connect().execute(
+            f"SELECT DISTINCT {col} FROM leads WHERE {col} IS NOT NULL AND {col} != '' ORDER BY {col}"
+        )]
+
+    def _filter(self, county=None, status=None, date_from=None, date_to=None, text=None):
+        """WHERE clause and args shared by :meth:`query` and :meth:`matching_ids`."""
+        where, args = [], []
+        if county:
+            where.append("county = ?")
+            args.append(county)
+        if status:
+            where.append("status = ?")
+            args.append(status)
+        if date_from:
+            where.append("loss_date >= ?")
+            args.append(str(date_from))
+        if date_to:
+            where.append("loss_date <= ?")
+            args.append(str(date_to))
+        text = (text or "").strip()
+        if text and self.fts and len(text) >= 3:   # trigram index needs 3+ chars
+            where.append("rowid IN (SELECT rowid FROM leads_fts WHERE leads_fts MATCH ?)")
+            args.append('"' + text.replace('"', '""') + '"')
+        elif text:
+            like = "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            where.append("(homeowner LIKE ? ESCAPE '\\' OR address LIKE ? ESCAPE '\\' "
+                         "OR case_number LIKE ? ESCAPE '\\')")
+            args += [like] * 3
+        return (f"WHERE {' AND '.join(where)}" if where else ""), args
+
+    def archivable(self, closed_before=None, loss_before=None):
+        """IDs of leads Closed and untouched since ``closed_before``, or lost before ``loss_before``.
+
+        Both bounds are dates or ISO strings; the IDs come back in loss-date order.
+        """
+        where, args = [], []
+        if closed_before:
+            where.append("(status = ? AND updated_at < ?)")
+            args += [PIPELINE[-1], str(closed_before)]
+        if loss_before:
+            # unparseable dates fall through _LOSS_DATE as-is; they are not "old"
+            where.append("(loss_date < ? AND loss_date GLOB '[0-9][0-9][0-9][0-9]-*')")
+            args.append(str(loss_before))
+        if not where:
+            return []
+        return [r[0] for r in self._connect().execute(
+            f"SELECT lead_id FROM leads WHERE {' OR '.join(where)} ORDER BY loss_date", args
+        )]
+
+    def matching_ids(self, **filters):
+        """Lead IDs matching :meth:`query`-style filters (no paging)."""
+        clause, args = self._filter(**filters)
+        return [r[0] for r in self._connect().execute(f"SELECT lead_id FROM leads {clause}", args)]
+
+    @staticmethod
+    def _ready(statuses, email_only):
+        where = ["homeowner != ''", "email != ''" if email_only else "(phone != '' OR email != '')"]
+        args = []
+        if statuses is not None:
+            where.append(f"status IN ({', '.join('?' * len(statuses))})")
+            args += list(statuses)
+        return f"WHERE {' AND '.join(where)}", args
+
+    def ready(self, statuses=None, email_only=False):
+        """Iterate ``COLUMNS``-keyed dicts of leads with an owner and a phone or
+        email (an email, with ``email_only``) whose Status is in ``statuses``."""
+        clause, args = self._ready(statuses, email_only)
+        sel = ", ".join(FIELDS[c] for c in COLUMNS)
+        cur = self._connect().cursor()
+        cur.execute(f"SELECT {sel} FROM leads {clause} ORDER BY rowid", args)
+        for row in cur:
+            yield dict(zip(COLUMNS, row))
+
+    def count_ready(self, statuses=None, email_only=False):
+        """How many leads :meth:`ready` yields."""
+        clause, args = self._ready(statuses, email_only)
+        return self._connect().execute(f"SELECT COUNT(*) FROM leads {clause}", args).fetchone()[0]
+
+    @_per_version
+    @timed("store.query")
+    def query(self, county=None, status=None, date_from=None, date_to=None, text=None,
+              sort="Date", descending=True, limit=50, offset=0):
+        """One page of leads matching the filters, plus the total match count.
+
+        Dates are ``datetime.date`` or ISO strings and bound the loss date
+        inclusively.  ``text`` matches Homeowner, Address or Case Number as a
+        substring.  Returns ``(total, rows)`` with rows aligned to ``COLUMNS``;
+        memoised per store version, so treat them as read-only.
+        """
+        clause, args = self._filter(county, status, date_from, date_to, text)
+        order = "DESC" if descending else "ASC"
+        sel = ", ".join(FIELDS[c] for c in COLUMNS)
+
+        conn = self._connect()
+        conn.execute("BEGIN")
+        try:
+            total = conn.execute(f"SELECT COUNT(*) FROM leads {clause}", args).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT {sel} FROM leads {clause} "
+                f"ORDER BY {SORTABLE[sort]} {order}, rowid {order} LIMIT ? OFFSET ?",
+                args + [limit, offset],
+            ).fetchall()
+        finally:
+            conn.execute("COMMIT")
+        return total, rows
+
+    def get(self, lead_id):
+        """Return one lead as a ``COLUMNS``-keyed dict, or ``None``."""
+        sel = ", ".join(FIELDS[c] for c in COLUMNS)
+        row = self._connect().execute(
+            f"SELECT {sel} FROM leads WHERE lead_id = ?", (lead_id,)
+        ).fetchone()
+        return dict(zip(COLUMNS, row)) if row else None
+
+    def keys(self):
+        """Cursor over ``(Lead ID, Case Number, Address)`` of every lead, for de-duplication."""
+        return self._connect().execute("SELECT lead_id, case_number, address FROM leads")
+
+    def rows(self):
+        """All leads in insertion order as tuples aligned with ``COLUMNS``."""
+        sel = ", ".join(FIELDS[c] for c in COLUMNS)
+        return self._connect().execute(f"SELECT {sel} FROM leads ORDER BY rowid").fetchall()
+
+    def to_dataframe(self):
+        import pandas as pd
+
+        return pd.DataFrame(self.rows(), columns=COLUMNS)
+
+    # ── Excel interop ───────────────────────────────────────────────────────
+    def export_excel(self, target):
+        """Write every lead to ``target`` (path or buffer) in ``COLUMNS`` layout."""
+        self.to_dataframe().to_excel(target, index=False)
+
+    def _import_legacy(self, xlsx_path):
+        """One-time import of the pre-SQLite workbook."""
+        conn = self._connect()
+        done = conn.execute("SELECT value FROM meta WHERE key = 'legacy_import'").fetchone()
+        if done or not os.path.exists(xlsx_path):
+            return
+        import pandas as pd
+
+        df = pd.read_excel(xlsx_path)
+        records = [
+            {k: v for k, v in rec.items() if k in FIELDS}
+            for rec in df.to_dict("records")
+            if _clean(rec.get("Lead ID")) is not None
+        ]
+        self.upsert_many(records)
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_import', ?)",
+                (xlsx_path,),
+            )
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PROCESS-WIDE CACHE
+# ═══════════════════════════════════════════════════════════════════════════════
+class LeadCache:
+    """In-memory mirror of a :class:`LeadStore`, shared by every session.
+
+    Freshness is checked against the store version (one single-row read),
+    never a wall-clock TTL.  When another process has written, only rows
+    stamped after the cached version are fetched and patched in; our own
+    saves are applied directly without touching the database at all.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._rows = {}          # Lead ID -> row tuple, in insertion order
+        self._version = None
+        self._frame = None
+        self._listeners = []
+
+    def _patch(self, rows, removed=()):
+        # removals first: a lead archived and then saved again is in both
+        previous = [self._rows.pop(lead_id) for lead_id in removed if lead_id in self._rows]
+        rows = [tuple(row) for row in rows]
+        changed = [None] * len(previous)
+        for row in rows:
+            previous.append(self._rows.get(row[0]))
+            self._rows[row[0]] = row
+        changed += rows
+        if changed:
+            self._frame = None
+            for listener in self._listeners:
+                listener(changed, previous)
+
+    def subscribe(self, listener):
+        """Call ``listener(rows, previous)`` with every current row, then with each patch.
+
+        ``previous[i]`` is the row that ``rows[i]`` replaced (``None`` for a new
+        lead), so derived indexes and counters can be built once and kept
+        current incrementally.  ``rows[i]`` is ``None`` when the lead was
+        removed from the store (e.g. moved to the archive).
+        """
+        self.refresh()
+        with self._lock:
+            self._listeners.append(listener)
+            rows = list(self._rows.values())
+            listener(rows, [None] * len(rows))
+
+    def refresh(self):
+        """Bring the mirror up to date with the store; cheap when unchanged."""
+        if self._version is not None and self.store.version() == self._version:
+            metrics.count("lead_cache.fresh")
+            return
+        metrics.count("lead_cache.delta")
+        with self._lock:
+            version, rows, removed = self.store.changes_since(self._version)
+            if version != self._version:
+                self._patch(rows, removed)
+                self._version = version
+
+    def save(self, records):
+        """Upsert through the store and patch the mirror in place."""
+        records = list(records)
+        version = self.store.upsert_many(records)
+        with self._lock:
+            if self._version is not None and version == self._version + 1:
+                blank = (None,) * len(COLUMNS)
+                patched = []
+                for rec in records:
+                    base = list(self._rows.get(rec["Lead ID"], blank))
+                    for i, col in enumerate(COLUMNS):
+                        if col in rec:
+                            base[i] = _clean(rec[col])
+                    patched.append(base)
+                self._patch(patched)
+                self._version = version
+        # Someone else wrote in between (or we were cold): fetch the delta.
+        self.refresh()
+        return version
+
+    def count(self):
+        self.refresh()
+        return len(self._rows)
+
+    def records(self):
+        """Snapshot of every lead as ``COLUMNS``-keyed dicts."""
+        self.refresh()
+        with self._lock:
+            rows = list(self._rows.values())
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def frame(self):
+        """Full DataFrame, rebuilt at most once per store version.
+
+        Treat the result as read-only; it is shared between sessions.
+        """
+        import pandas as pd
+
+        self.refresh()
+        with self._lock:
+            if self._frame is None:
+                metrics.count("frame.rebuild")
+                self._frame = pd.DataFrame(list(self._rows.values()), columns=COLUMNS)
+            return self._frame
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PROCESS-WIDE ACCESSORS
+# ═══════════════════════════════════════════════════════════════════════════════
+def per_path(getter):
+    """Cache a ``get_*(path=STORE_FILE)`` accessor: one instance per path per process.
+
+    A bare ``lru_cache`` keys ``get_x()`` and ``get_x(STORE_FILE)`` apart,
+    which gave the app and the indexes it subscribes two separate mirrors.
+    """
+    cached = lru_cache(maxsize=None)(getter)
+
+    @wraps(getter)
+    def get(path=STORE_FILE):
+        return cached(path)
+
+    get.cache_clear = cached.cache_clear
+    return get
+
+
+@per_path
+def get_store(path=STORE_FILE):
+    """One :class:`LeadStore` per path per process."""
+    return LeadStore(path, legacy_xlsx=DB_FILE if path == STORE_FILE else None)
+
+
+@per_path
+def get_lead_cache(path=STORE_FILE):
+    return LeadCache(get_store(path))
+
+
+@timed("load_database")
+def load_database(path=STORE_FILE):
+    return get_lead_cache(path).frame()
+
+
+@timed("save_to_database")
+def save_to_database(record, path=STORE_FILE):
+    """Upsert one lead dict keyed by ``Lead ID``; returns the new store version."""
+    return get_lead_cache(path).save([record])
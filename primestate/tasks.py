@@ -0,0 +1,99 @@
+"""Job bodies for :class:`~primestate.jobs.JobRunner`: imports, bulk updates, exports, archiving.
+
+Each takes the running :class:`~primestate.jobs.Job` first, reports progress
+through it (which is also where a cancel request lands) and returns a small
+JSON-able summary for the job table.
+"""
+from .archive import get_archive, move_to_archive
+from .batch import batch_leads, write_lor_zip
+from .dedupe import get_dedupe_index
+from .outreach import FORMATS, ready_leads, write_outreach
+from .parser import ParseStats, iter_leads
+from .store import STORE_FILE, get_lead_cache, get_store
+from .work_queue import get_work_queue
+
+CHUNK = 5000          # leads queued per transaction by an import
+UPDATE_CHUNK = 1000   # leads per transaction in a bulk update
+
+
+def import_feed(job, source, skip_saved=True, path=STORE_FILE):
+    """Parse, de-duplicate and queue a feed (str or bytes).
+
+    Leads are queued a chunk at a time, so a cancelled import keeps the
+    chunks it had already queued.
+    """
+    total = source.count("\n" if isinstance(source, str) else b"\n") + 1
+    stats = ParseStats()
+    queue = get_work_queue(path)
+    added = skipped = 0
+    fresh = []
+    for lead, reason in get_dedupe_index(path).check(iter_leads(source, stats)):
+        if reason in ("id", "case") and skip_saved:
+            skipped += 1
+            continue
+        if reason:
+            lead["data"]["duplicate"] = reason
+        fresh.append(lead)
+        if len(fresh) >= CHUNK:
+            added += queue.add_many(fresh)   # already-queued IDs are ignored
+            fresh = []
+            job.progress(stats.lines, total, f"{stats.leads:,} leads read, {added:,} queued")
+    added += queue.add_many(fresh)
+    job.progress(total, total, f"{stats.leads:,} leads read, {added:,} queued")
+    return {"lines": stats.lines, "leads": stats.leads, "malformed": stats.malformed,
+            "skipped": skipped, "added": added}
+
+
+def bulk_update(job, lead_ids, status=None, advance=False, notes=None, path=STORE_FILE):
+    """:meth:`LeadStore.update_leads` in chunks, one transaction each."""
+    store = get_store(path)
+    lead_ids = list(lead_ids)
+    changed = 0
+    for i in range(0, len(lead_ids), UPDATE_CHUNK):
+        job.progress(i, len(lead_ids), f"{changed:,} updated")
+        _, n = store.update_leads(lead_ids[i:i + UPDATE_CHUNK], status=status, advance=advance,
+                                  notes=notes, actor="dashboard")
+        changed += n
+    job.progress(len(lead_ids), len(lead_ids), f"{changed:,} updated")
+    return {"leads": len(lead_ids), "changed": changed}
+
+
+def export_excel(job, path=STORE_FILE):
+    """Write the whole database to an .xlsx file kept with the job."""
+    job.progress(0, 1, "Writing workbook…")
+    get_store(path).export_excel(job.output_path("xlsx"))
+    job.progress(1, 1)
+    return {"leads": get_lead_cache(path).count()}
+
+
+def export_lors(job, path=STORE_FILE):
+    """Render every queued or saved lead with an owner into a ZIP of letters."""
+    letters = batch_leads(get_work_queue(path), get_lead_cache(path).records())
+    if not letters:
+        return {"letters": 0}
+    stats = write_lor_zip(
+        letters, job.output_path("zip"),
+        progress=lambda done, total: job.progress(done, total, f"{done:,} / {total:,} letters"),
+    )
+    return {"letters": stats.letters, "skipped": stats.skipped, "errors": stats.errors[:5],
+            "workers": stats.workers, "seconds": round(stats.seconds, 2), "per_sec": round(stats.per_sec, 1)}
+
+
+def export_outreach(job, fmt="csv", path=STORE_FILE):
+    """Mail-merge SMS / email texts for every ready lead (see :mod:`primestate.outreach`)."""
+    leads, total = ready_leads(get_store(path), get_work_queue(path), email_only=fmt == "eml")
+    stats = write_outreach(
+        leads, job.output_path(FORMATS[fmt]), fmt, total=total,
+        progress=lambda done, total: job.progress(done, total, f"{done:,} / {total:,} leads"),
+    )
+    return {"leads": stats.leads, "files": stats.files, "skipped": stats.skipped, "render_ms": round(stats.render_seconds * 1000, 1),
+            "per_sec": round(stats.per_sec), "seconds": round(stats.seconds, 2)}
+
+
+def archive_leads(job, path=STORE_FILE):
+    """Move Closed-and-idle and long-past leads into the Parquet archive, then compact it."""
+    job.progress(0, None, "Selecting leads…")
+    return move_to_archive(
+        get_store(path), get_archive(path),
+        progress=lambda done, total: job.progress(done, total, f"{done:,} / {total:,} leads archived"),
+    )
@@ -0,0 +1,367 @@
+"""Durable, shared work queue of imported leads with claim/lease semantics.
+
+The queue lives in a table of the same SQLite file as the lead store, so it
+survives page refreshes, dropped websockets and server restarts, and every
+adjuster sees the same queue.  Working a lead *claims* it for one user until
+its lease expires; claims are renewed on every interaction, and a lead whose
+lease has lapsed is back in the pool for anyone to pick up.
+
+:class:`QueueIndex` mirrors the queue in memory for the lead picker: a token
+index over county, town, street, case number and loss date, kept current
+from the queue's membership version like the lead cache is from the store's.
+"""
+import json
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime
+
+from .instrument import timed
+from .store import STORE_FILE, SQLiteFile, per_path
+
+# How long a claimed lead stays reserved without any activity.
+LEASE_SECONDS = 15 * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS work_queue (
+    seq         INTEGER PRIMARY KEY AUTOINCREMENT,
+    lead_id     TEXT NOT NULL UNIQUE,
+    data        TEXT NOT NULL,
+    added_at    TEXT NOT NULL,
+    claimed_by  TEXT,
+    lease_until REAL
+);
+CREATE INDEX IF NOT EXISTS ix_work_queue_claim ON work_queue(claimed_by, lease_until);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('queue_version', '0');
+"""
+
+# Rows ``user`` may work on: unclaimed, lease expired, or already theirs.
+_AVAILABLE = "(claimed_by IS NULL OR lease_until < ? OR claimed_by = ?)"
+
+
+class WorkQueue(SQLiteFile):
+    """File-backed queue of parsed leads shared by every session and process."""
+
+    def __init__(self, path, lease_seconds=LEASE_SECONDS):
+        super().__init__(path)
+        self.lease_seconds = lease_seconds
+        self._connect().executescript(_SCHEMA)
+
+    @staticmethod
+    def _bump_version(conn):
+        """Advance the membership version inside an open write transaction."""
+        conn.execute("UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'queue_version'")
+
+    # ── contents ────────────────────────────────────────────────────────────
+    def add_many(self, leads):
+        """Enqueue ``{"id", "data"}`` leads; already-queued IDs are ignored.
+
+        Returns the number actually added.
+        """
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO work_queue (lead_id, data, added_at) VALUES (?, ?, ?)",
+                ((l["id"], json.dumps(l["data"]), now) for l in leads),
+            )
+            added = conn.total_changes - before
+            if added:
+                self._bump_version(conn)
+            return added
+
+    def __contains__(self, lead_id):
+        return self._connect().execute(
+            "SELECT 1 FROM work_queue WHERE lead_id = ?", (lead_id,)
+        ).fetchone() is not None
+
+    def count(self):
+        return self._connect().execute("SELECT COUNT(*) FROM work_queue").fetchone()[0]
+
+    def get(self, lead_id):
+        """Parsed lead dict for ``lead_id``, or ``None`` once it has left the queue."""
+        row = self._connect().execute(
+            "SELECT data FROM work_queue WHERE lead_id = ?", (lead_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def update(self, lead_id, **fields):
+        """Merge ``fields`` into a queued lead's data (e.g. the owner name)."""
+        with self.transaction() as conn:
+            row = conn.execute("SELECT data FROM work_queue WHERE lead_id = ?", (lead_id,)).fetchone()
+            if row:
+                data = json.loads(row[0])
+                data.update(fields)
+                conn.execute("UPDATE work_queue SET data = ? WHERE lead_id = ?",
+                             (json.dumps(data), lead_id))
+
+    @timed("queue.ids")
+    def ids(self, user=None, offset=0, limit=None):
+        """Lead IDs in import order; only those ``user`` may claim if given."""
+        sql, args = "SELECT lead_id FROM work_queue", []
+        if user is not None:
+            sql += f" WHERE {_AVAILABLE}"
+            args += [time.time(), user]
+        sql += " ORDER BY seq LIMIT ? OFFSET ?"
+        args += [-1 if limit is None else limit, offset]
+        return [r[0] for r in self._connect().execute(sql, args)]
+
+    def items(self):
+        """Iterate ``(lead_id, data)`` over the whole queue without loading it at once."""
+        cur = self._connect().cursor()
+        cur.execute("SELECT lead_id, data FROM work_queue ORDER BY seq")
+        for lead_id, data in cur:
+            yield lead_id, json.loads(data)
+
+    def count_ready(self, email_only=False):
+        """Queued leads with an owner and a looked-up phone or email (an email,
+        with ``email_only``): the ones outreach can write to."""
+        contact = ("json_extract(data, '$.enriched.email') != ''" if email_only else
+                   "(json_extract(data, '$.enriched.phone') != '' OR json_extract(data, '$.enriched.email') != '')")
+        return self._connect().execute(
+            f"SELECT COUNT(*) FROM work_queue WHERE json_extract(data, '$.owner') != '' AND {contact}"
+        ).fetchone()[0]
+
+    def remove(self, lead_id):
+        with self.transaction() as conn:
+            if conn.execute("DELETE FROM work_queue WHERE lead_id = ?", (lead_id,)).rowcount:
+                self._bump_version(conn)
+
+    def clear(self):
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM work_queue")
+            self._bump_version(conn)
+
+    # ── membership feed (for QueueIndex) ────────────────────────────────────
+    def version(self):
+        """Counter bumped whenever leads join or leave the queue.
+
+        Merging fields into a queued lead (:meth:`update`) and leases don't
+        bump it: neither changes what the picker searches.
+        """
+        return int(self._connect().execute(
+            "SELECT value FROM meta WHERE key = 'queue_version'"
+        ).fetchone()[0])
+
+    def changes_since(self, seq):
+        """Return ``(version, seqs, rows)`` from one snapshot.
+
+        ``seqs`` is every queued position; ``rows`` are ``(seq, lead_id, data)``
+        for leads added after position ``seq`` (all of them for ``0``).
+        """
+        conn = self._connect()
+        conn.execute("BEGIN")
+        try:
+            version = int(conn.execute(
+                "SELECT value FROM meta WHERE key = 'queue_version'"
+            ).fetchone()[0])
+            seqs = [r[0] for r in conn.execute("SELECT seq FROM work_queue")]
+            rows = [(q, lid, json.loads(data)) for q, lid, data in conn.execute(
+                "SELECT seq, lead_id, data FROM work_queue WHERE seq > ? ORDER BY seq", (seq,)
+            )]
+        finally:
+            conn.execute("COMMIT")
+        return version, seqs, rows
+
+    # ── leases ──────────────────────────────────────────────────────────────
+    def claim(self, lead_id, user):
+        """Check ``lead_id`` out to ``user`` (or renew their lease).
+
+        Returns ``False`` if another user holds an unexpired lease on it.
+        """
+        now = time.time()
+        with self.transaction() as conn:
+            cur = conn.execute(
+                f"UPDATE work_queue SET claimed_by = ?, lease_until = ? "
+                f"WHERE lead_id = ? AND {_AVAILABLE}",
+                (user, now + self.lease_seconds, lead_id, now, user),
+            )
+            return cur.rowcount == 1
+
+    def claim_next(self, user):
+        """Claim the oldest available lead for ``user``; returns its ID or ``None``."""
+        now = time.time()
+        with self.transaction() as conn:
+            row = conn.execute(
+                f"SELECT lead_id FROM work_queue WHERE {_AVAILABLE} "
+                "ORDER BY claimed_by = ? DESC, seq LIMIT 1",
+                (now, user, user),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE work_queue SET claimed_by = ?, lease_until = ? WHERE lead_id = ?",
+                (user, now + self.lease_seconds, row[0]),
+            )
+            return row[0]
+
+    def release(self, lead_id, user):
+        """Give a claimed lead back to the pool."""
+        with self.transaction() as conn:
+            conn.execute(
+                "UPDATE work_queue SET claimed_by = NULL, lease_until = NULL "
+                "WHERE lead_id = ? AND claimed_by = ?",
+                (lead_id, user),
+            )
+
+    def release_all(self, user):
+        """Give back every lead ``user`` holds; returns how many."""
+        with self.transaction() as conn:
+            return conn.execute(
+                "UPDATE work_queue SET claimed_by = NULL, lease_until = NULL WHERE claimed_by = ?",
+                (user,),
+            ).rowcount
+
+    def leased(self, except_user=None):
+        """IDs of leads under an unexpired lease, other than ``except_user``'s."""
+        # ">= ''" rather than IS NOT NULL so SQLite searches the claim index
+        sql = "SELECT lead_id FROM work_queue WHERE claimed_by >= '' AND lease_until >= ?"
+        args = [time.time()]
+        if except_user is not None:
+            sql += " AND claimed_by != ?"
+            args.append(except_user)
+        return {r[0] for r in self._connect().execute(sql, args)}
+
+    def holder(self, lead_id):
+        """User holding an unexpired lease on ``lead_id``, if any."""
+        row = self._connect().execute(
+            "SELECT claimed_by FROM work_queue WHERE lead_id = ? AND lease_until >= ?",
+            (lead_id, time.time()),
+        ).fetchone()
+        return row[0] if row else None
+
+    def reap_expired(self):
+        """Clear lapsed leases; returns how many leads went back to the pool."""
+        with self.transaction() as conn:
+            return conn.execute(
+                "UPDATE work_queue SET claimed_by = NULL, lease_until = NULL "
+                "WHERE claimed_by IS NOT NULL AND lease_until < ?",
+                (time.time(),),
+            ).rowcount
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SEARCH INDEX
+# ═══════════════════════════════════════════════════════════════════════════════
+_TOKEN = re.compile(r"[a-z0-9/]+")
+
+# Terms this long also match inside a token ("ewar" finds Newark); shorter
+# ones only match token prefixes, since "1" or "st" is in nearly every lead.
+SUBSTRING_MIN = 3
+
+
+def search_tokens(text):
+    """Lower-case words of ``text``; dates stay whole (``01/15/2026``)."""
+    return _TOKEN.findall(str(text).lower())
+
+
+def _lead_tokens(data):
+    return set(search_tokens(" ".join(str(data.get(f, "")) for f in (
+        "county", "county_key", "city", "address_part", "case", "date"
+    ))))
+
+
+class QueueIndex:
+    """In-memory token index over the queued leads, in queue order.
+
+    Built once, then patched from :meth:`WorkQueue.changes_since` whenever
+    the queue's membership version moves, so a search costs a few set
+    operations and never touches the table.
+    """
+
+    def __init__(self, queue):
+        self.queue = queue
+        self._lock = threading.Lock()
+        self._leads = {}                      # seq -> (lead_id, tokens)
+        self._postings = defaultdict(set)     # token -> seqs
+        self._version = None
+        self._last_seq = 0
+        self._order = None                    # lead IDs by seq, rebuilt after changes
+        self._vocab = None                    # sorted tokens, rebuilt after changes
+        self._terms = {}                      # term -> seqs, cleared after changes
+
+    def refresh(self):
+        """Bring the index up to date with the queue; one read when unchanged."""
+        if self._version is not None and self.queue.version() == self._version:
+            return
+        with self._lock:
+            version, seqs, rows = self.queue.changes_since(self._last_seq)
+            if version == self._version:
+                return
+            for seq in self._leads.keys() - set(seqs):
+                _, tokens = self._leads.pop(seq)
+                for token in tokens:
+                    posting = self._postings[token]
+                    posting.discard(seq)
+                    if not posting:
+                        del self._postings[token]
+            for seq, lead_id, data in rows:
+                tokens = _lead_tokens(data)
+                self._leads[seq] = (lead_id, tokens)
+                for token in tokens:
+                    self._postings[token].add(seq)
+                self._last_seq = max(self._last_seq, seq)
+            self._version = version
+            self._order = self._vocab = None
+            self._terms = {}
+
+    def __len__(self):
+        self.refresh()
+        return len(self._leads)
+
+    def _match(self, term):
+        seqs = self._terms.get(term)
+        if seqs is None:
+            if self._vocab is None:
+                self._vocab = sorted(self._postings)
+            if len(term) >= SUBSTRING_MIN:
+                tokens = [t for t in self._vocab if term in t]
+            else:
+                lo = bisect_left(self._vocab, term)
+                hi = bisect_left(self._vocab, term + "\uffff")
+                tokens = self._vocab[lo:hi]
+            seqs = self._terms[term] = set().union(*(self._postings[t] for t in tokens))
+        return seqs
+
+    def search(self, query="", user=None):
+        """Lead IDs matching every word of ``query``, in queue order.
+
+        Each word matches a token prefix (or, from ``SUBSTRING_MIN`` letters,
+        any part of a token).  With ``user``, leads leased to someone else
+        are left out.
+        """
+        self.refresh()
+        terms = search_tokens(query)
+        with self._lock:
+            if not terms:
+                if self._order is None:
+                    self._order = [self._leads[seq][0] for seq in sorted(self._leads)]
+                ids = self._order
+            else:
+                seqs = None
+                for term in sorted(terms, key=len, reverse=True):   # most selective first
+                    seqs = self._match(term) if seqs is None else seqs & self._match(term)
+                    if not seqs:
+                        break
+                ids = [self._leads[seq][0] for seq in sorted(seqs)]
+        if user is not None:
+            leased = self.queue.leased(except_user=user)
+            if leased:
+                ids = [lid for lid in ids if lid not in leased]
+        return ids
+
+
+@per_path
+def get_work_queue(path=STORE_FILE):
+    return WorkQueue(path)
+
+
+@per_path
+def get_queue_index(path=STORE_FILE):
+    return QueueIndex(get_work_queue(path))
@@ -0,0 +1,38 @@
+import os
+
+from primestate.analytics import LeadStats
+from primestate.archive import LeadArchive, move_to_archive
+from primestate.store import LeadCache, LeadStore
+
+STATUSES = ["Processed", "Contacted", "Signed", "Closed"]
+
+
+def seed(tmp_path):
+    path = os.path.join(tmp_path, "leads.sqlite3")
+    store = LeadStore(path)
+    cache = LeadCache(store)
+    cache.save([
+        {"Lead ID": f"L{i}", "Date": "01/05/2020" if i < 4 else "01/05/2026", "County": "Essex",
+         "Address": f"{i} Main St", "Case Number": str(i), "Type": "Fire", "Status": STATUSES[i % 4]}
+        for i in range(10)
+    ])
+    return store, cache, LeadArchive(f"{path}-archive")
+
+
+def test_archiving_keeps_the_funnel(tmp_path):
+    store, cache, archive = seed(tmp_path)
+    stats = LeadStats(cache, archive)
+    before = stats.funnel()
+    assert move_to_archive(store, archive)["archived"] == 4
+    assert stats.funnel() == before
+    assert (stats.total, stats.archived) == (10, 4)
+
+
+def test_archived_leads_counted_on_a_fresh_start(tmp_path):
+    store, cache, archive = seed(tmp_path)
+    before = LeadStats(cache).summary()
+    move_to_archive(store, archive)
+    after = LeadStats(LeadCache(store), archive).summary()
+    assert after["archived"] == 4
+    assert after["status"] == before["status"]
+    assert after["county_status"] == before["county_status"]
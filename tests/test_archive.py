@@ -0,0 +1,28 @@
+from primestate.archive import LeadArchive
+from primestate.store import COLUMNS
+
+
+def row(lead_id, date="03/15/2025", county="Essex"):
+    values = {"Lead ID": lead_id, "Date": date, "County": county, "Address": f"{lead_id} Main St",
+              "Case Number": lead_id, "Status": "Closed"}
+    return tuple(values.get(c, "") for c in COLUMNS)
+
+
+def test_compact_twice_in_a_row_keeps_every_lead(tmp_path):
+    archive = LeadArchive(str(tmp_path / "archive"))
+    archive.append([row("L1")])
+    archive.append([row("L2")])
+    assert archive.compact() == (1, 0)
+    archive.append([row("L3")])
+    assert archive.compact() == (1, 0)     # same partition, same second
+    assert archive.summary()["leads"] == 3
+    assert archive.summary()["files"] == 1
+    assert sorted(archive.query(["Lead ID"])["Lead ID"]) == ["L1", "L2", "L3"]
+
+
+def test_compact_keeps_latest_copy_of_a_lead(tmp_path):
+    archive = LeadArchive(str(tmp_path / "archive"))
+    archive.append([row("L1")])
+    archive.append([row("L1"), row("L2")])
+    assert archive.compact() == (1, 1)
+    assert sorted(archive.query(["Lead ID"])["Lead ID"]) == ["L1", "L2"]
@@ -0,0 +1,51 @@
+import io
+import multiprocessing
+import os
+import zipfile
+
+import pytest
+
+from primestate.batch import _render_chunk, write_lor_zip
+from primestate.outreach import write_outreach
+
+
+def jobs(n, bad=()):
+    return [(f"Owner {i}" if i not in bad else f"Dan O’Brien {i}", f"{i} Main St, Newark, NJ",
+             f"C{i}", "01/05/2026") for i in range(n)]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_unrenderable_letter_is_skipped(workers):
+    buf = io.BytesIO()
+    stats = write_lor_zip(jobs(30, bad={3, 17}), buf, workers=workers, chunk_size=8)
+    assert (stats.letters, stats.skipped) == (28, 2)
+    assert [e.split(":")[0] for e in sorted(stats.errors)] == ["C17", "C3"]
+    names = zipfile.ZipFile(buf).namelist()
+    assert len(names) == 28 and not any("C3_" in n or "C17_" in n for n in names)
+
+
+def test_unrenderable_eml_draft_is_skipped(tmp_path):
+    leads = [(f"L{i}", owner, "Fire", address, case, date, address, "", f"o{i}@example.com")
+             for i, (owner, address, case, date) in enumerate(jobs(5, bad={1}))]
+    stats = write_outreach(leads, str(tmp_path / "drafts.zip"), "eml", workers=1)
+    assert (stats.leads, stats.files, stats.skipped) == (5, 4, 1)
+
+
+def test_progress_counts_skipped_letters():
+    calls = []
+    write_lor_zip(jobs(10, bad={9}), io.BytesIO(), workers=1, chunk_size=4,
+                  progress=lambda done, total: calls.append((done, total)))
+    assert calls[-1] == (10, 10)
+
+
+def die_in_worker(chunk, print_date):
+    if multiprocessing.parent_process() is not None:
+        os._exit(1)     # a worker killed mid-batch
+    return _render_chunk(chunk, print_date)
+
+
+def test_dead_worker_falls_back_to_inline_rendering():
+    buf = io.BytesIO()
+    stats = write_lor_zip(jobs(40), buf, workers=2, chunk_size=4, render=die_in_worker)
+    assert (stats.letters, stats.skipped) == (40, 0)
+    assert len(zipfile.ZipFile(buf).namelist()) == 40
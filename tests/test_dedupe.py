@@ -0,0 +1,43 @@
+import os
+
+from primestate.archive import LeadArchive, move_to_archive
+from primestate.dedupe import DedupeIndex
+from primestate.store import LeadCache, LeadStore
+
+
+def lead(lead_id, case, address, date="01/05/2026"):
+    return {"Lead ID": lead_id, "Date": date, "County": "Essex", "Address": address,
+            "Case Number": case, "Type": "Fire", "Status": "Processed"}
+
+
+def parsed(case, address):
+    return {"case": case, "full_address": address}
+
+
+def test_edited_keys_are_dropped(tmp_path):
+    path = os.path.join(tmp_path, "leads.sqlite3")
+    cache = LeadCache(LeadStore(path))
+    cache.save([lead("L1", "100", "1 Main St, Newark, NJ"), lead("L2", "200", "1 Main St, Newark, NJ")])
+    index = DedupeIndex(cache)
+    assert index.match("new", parsed("100", "9 Oak Ave, Newark, NJ")) == "case"
+
+    cache.save([lead("L1", "101", "5 Elm St, Newark, NJ")])
+    index.check([])
+    assert index.match("new", parsed("100", "9 Oak Ave, Newark, NJ")) is None
+    assert index.match("new", parsed("101", "9 Oak Ave, Newark, NJ")) == "case"
+    assert index.match("new", parsed("", "5 Elm St, Newark, NJ")) == "address"
+    # L2 still lives at the old address
+    assert index.match("new", parsed("", "1 Main St, Newark, NJ")) == "address"
+
+
+def test_archived_keys_are_kept(tmp_path):
+    path = os.path.join(tmp_path, "leads.sqlite3")
+    store = LeadStore(path)
+    cache = LeadCache(store)
+    cache.save([lead("L1", "100", "1 Main St, Newark, NJ", date="01/05/2020")])
+    index = DedupeIndex(cache)
+    assert move_to_archive(store, LeadArchive(f"{path}-archive"))["archived"] == 1
+    index.check([])
+    assert index.match("L1", parsed("", "")) == "id"
+    assert index.match("new", parsed("100", "")) == "case"
+    assert index.match("new", parsed("", "1 Main St, Newark, NJ")) == "address"
@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from primestate import enrich
+from primestate.enrich import EnrichCache, Enricher, JSONProvider
+from primestate.normalize import address_key
+
+FIELDS = {"owner": "result.owner_name", "phone": "result.phones.0"}
+
+
+class Stub(BaseHTTPRequestHandler):
+    """``/owners`` knows owners, ``/phones`` knows phones; ``?address=1…`` is
+    unknown to both, and ``/flaky`` answers 503 to every first request."""
+
+    hits = []
+    seen = set()
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        address = parse_qs(url.query)["address"][0]
+        Stub.hits.append((url.path, address))
+        if url.path == "/flaky" and address not in Stub.seen:
+            Stub.seen.add(address)
+            return self._send(503, {}, {"Retry-After": "0"})
+        if address.startswith("1"):
+            return self._send(404, {})
+        if url.path == "/phones":
+            return self._send(200, {"result": {"owner_name": "", "phones": [f"555-{address[:3]}"]}})
+        return self._send(200, {"result": {"owner_name": f"Owner of {address}", "phones": []}})
+
+    def _send(self, status, body, headers=()):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        for k, v in dict(headers).items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Stub)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    Stub.hits, Stub.seen = [], set()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+def provider(server, name, path):
+    return JSONProvider(name, f"{server}/{path}?address={{address}}", FIELDS, rate=1000, burst=50)
+
+
+def leads(*addresses):
+    return [{"address_part": a, "full_address": f"{a}, Newark, NJ"} for a in addresses]
+
+
+def test_second_run_is_served_from_cache(server, tmp_path):
+    cache = EnrichCache(os.path.join(tmp_path, "leads.sqlite3"))
+    enricher = Enricher([provider(server, "owners", "owners")], cache, backoff=0.01)
+    batch = leads("22 Elm St", "33 Oak Ave", "22 Elm St", "10 Pine Rd")
+
+    results, stats = enricher.enrich(batch)
+    assert (stats.cached, stats.fetched, stats.failed) == (0, 3, 0)
+    assert len(Stub.hits) == 3
+    assert results[0] == results[2] == {"owner": "Owner of 22 Elm St"}
+    assert results[3] == {}
+
+    again, stats = enricher.enrich(batch)
+    assert (stats.cached, stats.fetched) == (3, 0)
+    assert len(Stub.hits) == 3
+    assert cache.get_many("owners", [address_key("10 Pine Rd, Newark, NJ")]) != {}
+    assert again == results
+
+
+def test_transient_errors_are_retried(server, tmp_path):
+    cache = EnrichCache(os.path.join(tmp_path, "leads.sqlite3"))
+    enricher = Enricher([provider(server, "flaky", "flaky")], cache, backoff=0.01)
+    results, stats = enricher.enrich(leads("22 Elm St", "33 Oak Ave"))
+    assert stats.retries == 2
+    assert (stats.fetched, stats.failed) == (2, 0)
+    assert [r["owner"] for r in results] == ["Owner of 22 Elm St", "Owner of 33 Oak Ave"]
+
+
+def test_giving_up_is_reported_and_not_cached(server, tmp_path):
+    cache = EnrichCache(os.path.join(tmp_path, "leads.sqlite3"))
+    enricher = Enricher([provider(server, "flaky", "flaky")], cache, retries=0, backoff=0.01)
+    results, stats = enricher.enrich(leads("22 Elm St"))
+    assert (stats.failed, stats.retries, results) == (1, 0, [{}])
+    assert "HTTP 503" in stats.errors[0]
+    assert cache.get_many("flaky", [address_key("22 Elm St, Newark, NJ")]) == {}
+
+
+def test_later_providers_fill_the_gaps(server, tmp_path):
+    cache = EnrichCache(os.path.join(tmp_path, "leads.sqlite3"))
+    enricher = Enricher(
+        [provider(server, "owners", "owners"), provider(server, "phones", "phones")], cache, backoff=0.01,
+    )
+    results, stats = enricher.enrich(leads("22 Elm St", "10 Pine Rd"))
+    assert results == [{"owner": "Owner of 22 Elm St", "phone": "555-22 "}, {}]
+    assert (stats.fetched, stats.failed) == (4, 0)
+
+
+def test_get_enricher_is_shared(tmp_path, monkeypatch):
+    config = os.path.join(tmp_path, "providers.json")
+    with open(config, "w") as f:
+        json.dump([{"name": "owners", "url": "http://127.0.0.1:9/?a={address}", "fields": FIELDS}], f)
+    monkeypatch.delenv(enrich.ENRICH_ENV, raising=False)
+    assert enrich.get_enricher() is None
+
+    monkeypatch.setenv(enrich.ENRICH_ENV, config)
+    path = os.path.join(tmp_path, "leads.sqlite3")
+    shared = enrich.get_enricher(path=path)
+    assert shared is enrich.get_enricher(config, path)
+    assert shared.cache is enrich.get_enrich_cache(path)
+    assert [p.name for p in shared.providers] == ["owners"]
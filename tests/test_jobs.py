@@ -0,0 +1,89 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from primestate.jobs import STALE_AFTER, JobRunner
+
+
+def wait_for(runner, job_id, *statuses, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = runner.get(job_id)
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} still {runner.get(job_id)['status']}")
+
+
+def blocker(release):
+    def fn(job):
+        release.wait(10)
+        return "ok"
+    return fn
+
+
+@pytest.fixture
+def runner(tmp_path):
+    return JobRunner(str(tmp_path / "jobs.sqlite3"), workers=2, per_owner=1)
+
+
+def test_cancel_queued_job_never_runs(runner):
+    release, ran = threading.Event(), []
+    first = runner.submit("slow", blocker(release), owner="ann")
+    second = runner.submit("slow", lambda job: ran.append(1), owner="ann")
+    wait_for(runner, first, "running")
+    runner.cancel(second)
+    assert runner.get(second)["status"] == "cancelled"
+    release.set()
+    wait_for(runner, first, "done")
+    time.sleep(0.05)
+    assert ran == [] and runner.get(second)["status"] == "cancelled"
+
+
+def test_cancel_running_job(runner):
+    def loop(job):
+        for i in range(1000):
+            job.progress(i, 1000)
+            time.sleep(0.01)
+
+    job_id = runner.submit("loop", loop, owner="ann")
+    wait_for(runner, job_id, "running")
+    runner.cancel(job_id)
+    assert wait_for(runner, job_id, "cancelled", "done")["status"] == "cancelled"
+
+
+def test_one_owner_cannot_hold_every_worker(runner):
+    release = threading.Event()
+    a1 = runner.submit("slow", blocker(release), owner="ann")
+    a2 = runner.submit("slow", blocker(release), owner="ann")
+    b1 = runner.submit("slow", blocker(release), owner="bob")
+    wait_for(runner, a1, "running")
+    wait_for(runner, b1, "running")
+    assert runner.get(a2)["status"] == "queued"    # the free worker went to bob
+    release.set()
+    for job_id in (a1, a2, b1):
+        wait_for(runner, job_id, "done")
+
+
+def test_restart_interrupts_only_orphaned_jobs(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    first = JobRunner(path)
+    exited = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"],
+                          capture_output=True, text=True).stdout
+    now = time.time()
+    rows = {"live": (os.getppid(), now), "stale": (os.getppid(), now - STALE_AFTER - 1),
+            "dead": (int(exited), now), "legacy": (None, None)}
+    with first.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO jobs (id, kind, label, owner, status, created_at, runner, pid, heartbeat) "
+            "VALUES (?, 'x', 'x', '', 'running', ?, 'other', ?, ?)",
+            [(job_id, now, pid, beat) for job_id, (pid, beat) in rows.items()],
+        )
+    JobRunner(path)
+    assert {job_id: first.get(job_id)["status"] for job_id in rows} == {
+        "live": "running", "stale": "interrupted", "dead": "interrupted", "legacy": "interrupted",
+    }
@@ -0,0 +1,51 @@
+import csv
+import os
+
+from primestate.outreach import ready_leads, write_outreach
+from primestate.store import LeadCache, LeadStore
+from primestate.work_queue import WorkQueue
+
+
+def seed(tmp_path):
+    path = os.path.join(tmp_path, "leads.sqlite3")
+    store = LeadStore(path)
+    LeadCache(store).save([
+        {"Lead ID": f"L{i}", "Date": "01/05/2026", "County": "Essex", "Address": f"{i} Main St, Newark, NJ",
+         "Case Number": str(i), "Type": "Fire", "Homeowner": "" if i % 5 == 0 else f"Owner {i}",
+         "Phone": f"555-{i:04}" if i % 2 else "", "Email": f"o{i}@example.com" if i % 3 == 0 else "",
+         "Status": "Contacted" if i == 7 else "Processed"}
+        for i in range(30)
+    ])
+    queue = WorkQueue(path)
+    queue.add_many([
+        {"id": "Q1", "data": {"owner": "Queued Owner", "enriched": {"email": "q@example.com"},
+                              "type": "Fire", "address_part": "1 Elm St", "case": "Q1",
+                              "full_address": "1 Elm St, Newark, NJ"}},
+        {"id": "Q2", "data": {"owner": "", "enriched": {}, "type": "Fire", "address_part": "2 Elm St",
+                              "case": "Q2", "full_address": "2 Elm St, Newark, NJ"}},
+    ])
+    return store, queue
+
+
+def test_ready_leads_are_streamed_and_counted(tmp_path):
+    store, queue = seed(tmp_path)
+    leads, total = ready_leads(store, queue)
+    assert not isinstance(leads, list)
+    listed = list(leads)
+    assert total == len(listed) == 16
+    assert "L7" not in {lead[0] for lead in listed}
+    _, emails = ready_leads(store, queue, email_only=True)
+    assert emails == sum(1 for lead in listed if lead[-1])
+
+
+def test_write_outreach_consumes_chunks(tmp_path):
+    store, queue = seed(tmp_path)
+    leads, total = ready_leads(store, queue)
+    seen = []
+    target = os.path.join(tmp_path, "out.csv")
+    stats = write_outreach(leads, target, "csv", chunk_size=5, total=total,
+                           progress=lambda done, total: seen.append((done, total)))
+    assert stats.leads == total
+    assert seen == [(5, 16), (10, 16), (15, 16), (16, 16)]
+    with open(target, newline="", encoding="utf-8") as f:
+        assert len(list(csv.DictReader(f))) == 16
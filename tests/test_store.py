@@ -0,0 +1,46 @@
+import threading
+
+from primestate.store import LeadStore
+
+
+def lead(lead_id="L1", **fields):
+    return {"Lead ID": lead_id, "Address": "12 Main St, Newark, NJ", "Case Number": "C1",
+            "Homeowner": "Jane Doe", "Status": "Processed", **fields}
+
+
+def test_concurrent_upserts_of_one_lead_serialise(tmp_path):
+    path = str(tmp_path / "leads.sqlite3")
+    stores = [LeadStore(path), LeadStore(path)]   # two handles, as two processes would have
+    start = stores[0].version()
+    rounds, errors = 50, []
+    barrier = threading.Barrier(2)
+
+    def writer(store, field):
+        try:
+            barrier.wait()
+            for i in range(rounds):
+                store.upsert(lead(**{field: f"{field} {i}"}))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=writer, args=(s, f)) for s, f in zip(stores, ("Phone", "Email"))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert stores[0].count() == 1
+    assert stores[1].version() == start + 2 * rounds      # every upsert got its own version
+    rec = stores[0].get("L1")
+    assert (rec["Phone"], rec["Email"]) == (f"Phone {rounds - 1}", f"Email {rounds - 1}")
+    if stores[0].fts:      # the search index holds the lead once, not once per writer
+        assert stores[0].query(text="Jane")[0] == 1
+
+
+def test_upsert_keeps_columns_it_does_not_set(tmp_path):
+    store = LeadStore(str(tmp_path / "leads.sqlite3"))
+    store.upsert(lead(Phone="555-0100", Notes="called"))
+    store.upsert({"Lead ID": "L1", "Status": "Contacted"})
+    rec = store.get("L1")
+    assert (rec["Phone"], rec["Notes"], rec["Status"]) == ("555-0100", "called", "Contacted")
@@ -0,0 +1,65 @@
+import threading
+import time
+
+from primestate.work_queue import WorkQueue
+
+
+def queue(tmp_path, leads=3, lease_seconds=60):
+    q = WorkQueue(str(tmp_path / "leads.sqlite3"), lease_seconds=lease_seconds)
+    q.add_many({"id": f"L{i}", "data": {"case": f"C{i}"}} for i in range(leads))
+    return q
+
+
+def test_two_queues_racing_for_one_lead(tmp_path):
+    first = queue(tmp_path)
+    second = WorkQueue(first.path)
+    barrier, won = threading.Barrier(2), {}
+
+    def grab(q, user):
+        barrier.wait()
+        won[user] = q.claim("L0", user)
+
+    threads = [threading.Thread(target=grab, args=a) for a in ((first, "ann"), (second, "bob"))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(won.values()) == [False, True]
+    winner = next(user for user, ok in won.items() if ok)
+    assert first.holder("L0") == second.holder("L0") == winner
+
+
+def test_claim_renews_and_blocks_others(tmp_path):
+    q = queue(tmp_path)
+    assert q.claim("L0", "ann")
+    until = q._connect().execute("SELECT lease_until FROM work_queue WHERE lead_id = 'L0'").fetchone()[0]
+    time.sleep(0.01)
+    assert q.claim("L0", "ann")                   # renewing your own lease
+    renewed = q._connect().execute("SELECT lease_until FROM work_queue WHERE lead_id = 'L0'").fetchone()[0]
+    assert renewed > until
+    assert not q.claim("L0", "bob")
+    assert q.claim_next("bob") == "L1"
+    assert q.leased(except_user="bob") == {"L0"}
+
+
+def test_expired_leases_are_reaped(tmp_path):
+    q = queue(tmp_path, lease_seconds=0.05)
+    assert q.claim("L0", "ann") and q.claim("L1", "ann")
+    assert q.reap_expired() == 0
+    time.sleep(0.1)
+    assert q.holder("L0") is None
+    q.lease_seconds = 60
+    assert q.claim("L0", "bob")                   # a lapsed lease is anyone's
+    assert q.reap_expired() == 1                  # L1; bob's fresh lease on L0 stays
+    assert q.holder("L0") == "bob" and q.leased() == {"L0"}
+
+
+def test_release_all_frees_only_that_users_leads(tmp_path):
+    q = queue(tmp_path)
+    q.claim("L0", "ann")
+    q.claim("L1", "ann")
+    q.claim("L2", "bob")
+    assert q.release_all("ann") == 2
+    assert q.leased() == {"L2"}
+    assert q.release_all("ann") == 0